@@ -0,0 +1,2 @@
+# Benchmarks de performance do backend.
+# Execute a partir de backend/: python -m benchmarks.<nome_do_modulo>
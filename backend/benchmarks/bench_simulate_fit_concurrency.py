@@ -0,0 +1,105 @@
+"""Latência p50/p99 de /simulate-fit sob requisições concorrentes.
+
+Simula a latência do stats.nba.com com um cliente stub bloqueante e compara
+o caminho atual (pool de threads + asyncio.gather) com o comportamento
+antigo, em que as chamadas bloqueantes rodavam direto no event loop.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_simulate_fit_concurrency --concurrency 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from src.main import app
+from src.api.dependencies import get_fit_simulator
+from src.api.routes import simulation
+from src.domain.services.fit_simulator import FitSimulator
+from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+from src.schemas.analysis import PlayerAdvancedStats, TeamStats
+
+
+class StubNBAClient:
+    """Cliente bloqueante que imita a latência de rede do nba_api."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def data_version(self) -> str:
+        return "bench"
+
+    def get_player_advanced_stats(self, player_id: int) -> PlayerAdvancedStats:
+        time.sleep(self.latency)
+        return PlayerAdvancedStats(
+            player_id=player_id, player_name="Bench Player",
+            fg3a=8.0, fg3_pct=0.41, ast=4.0, reb=5.0, blk=0.5, stl=1.1, min=32.0, position="SG"
+        )
+
+    def get_team_stats(self, team_id: int) -> TeamStats:
+        time.sleep(self.latency)
+        return TeamStats(team_id=team_id, team_name="Bench Team", fg3_pct_rank=25)
+
+
+class InlineAsyncClient:
+    """Reproduz o comportamento anterior: chamadas bloqueantes dentro do event loop."""
+
+    def __init__(self, client: StubNBAClient):
+        self.client = client
+
+    async def get_player_advanced_stats(self, player_id: int):
+        return self.client.get_player_advanced_stats(player_id)
+
+    async def get_team_stats(self, team_id: int):
+        return self.client.get_team_stats(team_id)
+
+
+async def _measure(simulator: FitSimulator, concurrency: int) -> List[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one_request(i: int) -> float:
+            started = time.perf_counter()
+            response = await client.get(f"/api/v1/simulate-fit?player_id={i}&team_id=100")
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+        # Cada modo parte do zero: sem isso o segundo seria servido pelo cache de respostas
+        simulation.response_cache.clear()
+        app.dependency_overrides[get_fit_simulator] = lambda: simulator
+        try:
+            return await asyncio.gather(*(one_request(i) for i in range(concurrency)))
+        finally:
+            app.dependency_overrides.clear()
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    ordered = sorted(latencies)
+    p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+    print(
+        f"{label:<22} p50={statistics.median(ordered) * 1000:8.1f} ms  "
+        f"p99={ordered[p99_index] * 1000:8.1f} ms  max={ordered[-1] * 1000:8.1f} ms"
+    )
+
+
+async def main(concurrency: int, latency: float, workers: int) -> None:
+    stub = StubNBAClient(latency)
+
+    pooled = FitSimulator(stub, async_client=AsyncNBAApiClient(stub, max_workers=workers))
+    inline = FitSimulator(stub, async_client=InlineAsyncClient(stub))
+
+    print(f"{concurrency} requisições concorrentes, latência upstream {latency * 1000:.0f} ms, {workers} workers")
+    _report("event loop bloqueado", await _measure(inline, concurrency))
+    _report("pool + gather", await _measure(pooled, concurrency))
+    pooled.async_client.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Latência simulada por chamada (s)")
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.latency, args.workers))
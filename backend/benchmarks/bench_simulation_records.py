@@ -0,0 +1,114 @@
+"""Custo por simulação: registros internos vs. modelos Pydantic no caminho quente.
+
+Avalia todos os jogadores de uma liga sintética contra um time, como a
+varredura de /teams/{id}/best-fits, em três modos:
+
+- records: o pipeline atual, só dataclasses com __slots__;
+- records+api: o mesmo, convertendo cada resultado com SimulationResponse.from_record
+  (o custo de /simulate-fit, que devolve todo resultado que calcula);
+- pydantic: emula o pipeline anterior, em que cada etapa (stats, análise,
+  necessidades, fricção e resultado) era um BaseModel validado na construção.
+
+Reporta µs por simulação e bytes retidos por resultado (tracemalloc, com os
+resultados mantidos em memória como no cache de memoização).
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_simulation_records --teams 30 --per-team 15 --rounds 5
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+from unittest.mock import Mock
+
+from benchmarks.bench_trade_search import _league
+from src.domain.services.fit_simulator import FitSimulator
+from src.schemas.analysis import PlayerAdvancedStats, PlayerAnalysis, RosterFrictionResult, TeamNeeds
+from src.schemas.simulation import SimulationResponse
+
+
+def _records(simulator: FitSimulator, stats, team_stats):
+    analysis = simulator.archetype_service.analyze_player(stats)
+    return simulator.evaluate(analysis, team_stats)
+
+
+def _records_api(simulator: FitSimulator, stats, team_stats):
+    return SimulationResponse.from_record(_records(simulator, stats, team_stats))
+
+
+def _pydantic(simulator: FitSimulator, stats, team_stats):
+    stats = PlayerAdvancedStats.model_validate(stats, from_attributes=True)
+    analysis = PlayerAnalysis.model_validate(
+        simulator.archetype_service.analyze_player(stats), from_attributes=True
+    )
+    needs = TeamNeeds.model_validate(
+        simulator.gap_service.analyze_team_needs(team_stats), from_attributes=True
+    )
+    friction = RosterFrictionResult.model_validate(
+        simulator.friction_service.analyze_friction(analysis, team_stats), from_attributes=True
+    )
+    fit_score, fit_label, reasons = simulator.calculate_final_verdict(analysis, needs, friction)
+    return SimulationResponse(
+        player_id=analysis.player_id,
+        player_name=analysis.player_name,
+        team_id=team_stats.team_id,
+        team_name=team_stats.team_name,
+        fit_score=fit_score,
+        fit_label=fit_label,
+        estimated_minutes=analysis.estimated_minutes,
+        projected_role=friction.suggested_role,
+        player_archetypes=[a.value for a in analysis.archetypes],
+        team_needs_addressed=[n.value for n in needs.needs],
+        reasons=reasons,
+        warnings=[c.description for c in friction.conflicts],
+        breakdown={"archetype_match": 80, "need_match": 70, "friction_penalty": friction.total_penalty},
+        player_analysis=analysis,
+        team_needs=needs,
+        friction_result=friction
+    )
+
+
+def _measure(label: str, run: Callable, simulator: FitSimulator, player_table, team_stats, rounds: int) -> None:
+    players = list(player_table.all_stats())
+    run(simulator, players[0], team_stats)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for stats in player_table.all_stats():
+            run(simulator, stats, team_stats)
+    elapsed = time.perf_counter() - started
+    simulations = rounds * len(players)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept: List[object] = [run(simulator, stats, team_stats) for stats in player_table.all_stats()]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    print(
+        f"{label:<12} {elapsed / simulations * 1e6:8.1f} µs/simulação  "
+        f"{retained / len(kept):8.0f} bytes retidos/resultado  ({simulations} simulações)"
+    )
+
+
+def main(teams: int, per_team: int, rounds: int, seed: int) -> None:
+    player_table, rank_table = _league(teams, per_team, seed)
+    team_stats = rank_table.all()[0]
+    simulator = FitSimulator(nba_client=Mock(), async_client=Mock())
+    print(f"{teams} times × {per_team} jogadores, time alvo {team_stats.team_name}, {rounds} rodadas")
+
+    _measure("records", _records, simulator, player_table, team_stats, rounds)
+    _measure("records+api", _records_api, simulator, player_table, team_stats, rounds)
+    _measure("pydantic", _pydantic, simulator, player_table, team_stats, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--per-team", type=int, default=15)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.teams, args.per_team, args.rounds, args.seed)
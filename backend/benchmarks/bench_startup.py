@@ -0,0 +1,122 @@
+"""Tempo de inicialização: import da aplicação e primeira resposta de /health.
+
+Duas medições, cada uma num processo Python novo:
+
+- import: `python -X importtime -c "import src.main"`, com o total e os
+  módulos de maior tempo acumulado, e a confirmação de que nba_api, pandas e
+  SQLAlchemy ficaram fora do import (são carregados pelos provedores de
+  src.api.dependencies, no startup em segundo plano ou na primeira requisição);
+- servidor: sobe `uvicorn src.main:app` e mede, a partir do spawn, o tempo até
+  o primeiro 200 de /health e até os serviços estarem prontos (primeiro 200
+  de /api/v1/upstream/stats, que depende do cliente da NBA API).
+
+Nenhuma chamada à NBA API é feita.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_startup --rounds 5 --top 10
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+HEAVY_MODULES = ("nba_api", "pandas", "sqlalchemy")
+TARGET_HEALTH_MS = 300.0
+
+
+def _import_profile() -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    """Tempo total do import (ms), módulos por tempo acumulado e pacotes pesados carregados."""
+    probe = f"import sys, src.main; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, check=True
+    )
+    modules: List[Tuple[str, float]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules.append((name.rstrip(), int(cumulative) / 1000))
+    total = next(ms for name, ms in modules if name.strip() == "src.main")
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return total, sorted(modules, key=lambda m: m[1], reverse=True), loaded
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _status(port: int, path: str) -> Optional[int]:
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", path)
+        status = conn.getresponse().status
+        conn.close()
+        return status
+    except OSError:
+        return None
+
+
+def _wait_for(port: int, path: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        if _status(port, path) == 200:
+            return (time.perf_counter() - started) * 1000
+        time.sleep(0.002)
+    raise TimeoutError(f"{path} não respondeu em {timeout:.0f}s")
+
+
+def _server_round(timeout: float, workdir: str) -> Tuple[float, float]:
+    port = _free_port()
+    env = dict(
+        os.environ, LEAGUE_REFRESH_ENABLED="false", FIT_MATRIX_ON_STARTUP="false",
+        DATABASE_URL=f"sqlite+aiosqlite:///{os.path.join(workdir, 'startup.db')}"
+    )
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        health = _wait_for(port, "/health", started, timeout)
+        ready = _wait_for(port, "/api/v1/upstream/stats", started, timeout)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return health, ready
+
+
+def main(rounds: int, top: int, timeout: float) -> None:
+    totals, loaded = [], []
+    for _ in range(rounds):
+        total, modules, loaded = _import_profile()
+        totals.append(total)
+    print(f"import src.main: mediana {statistics.median(totals):.0f} ms ({rounds} processos)")
+    print(f"pacotes pesados carregados no import: {', '.join(loaded) or 'nenhum'}")
+    print("maiores tempos acumulados (última rodada):")
+    for name, ms in modules[:top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        health, ready = zip(*(_server_round(timeout, workdir) for _ in range(rounds)))
+    print(
+        f"\nuvicorn, do spawn até: /health {statistics.median(health):.0f} ms "
+        f"(meta {TARGET_HEALTH_MS:.0f} ms), serviços prontos {statistics.median(ready):.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    main(args.rounds, args.top, args.timeout)
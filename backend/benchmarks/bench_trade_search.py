@@ -0,0 +1,91 @@
+"""Vazão da busca de trocas (candidatos avaliados por segundo).
+
+Monta uma liga sintética (30 times × 15 jogadores por padrão) e roda a busca
+1-por-1/2-por-1 com um único processo e com o pool, reportando candidatos
+avaliados, podados pelo branch and bound e tempo até o resultado final.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_trade_search --workers 4 --limit 10
+"""
+import argparse
+import os
+import random
+import time
+from unittest.mock import Mock
+
+import pandas as pd
+
+from src.domain.services.fit_simulator import FitSimulator
+from src.domain.services.trade_search_service import TradeSearchService, TradeSearchUpdate, search_trades
+from src.infrastructure.external.league_tables import PlayerStatsTable, TeamRankTable
+
+
+def _league(teams: int, per_team: int, seed: int):
+    rng = random.Random(seed)
+    players = []
+    for t in range(teams):
+        for p in range(per_team):
+            players.append({
+                "PLAYER_ID": t * 100 + p + 1, "PLAYER_NAME": f"P{t}-{p}", "TEAM_ID": 100 + t,
+                "MIN": rng.uniform(8.0, 36.0), "POSITION": rng.choice(["G", "F", "C", "G-F", "F-C"]),
+                "PTS": rng.uniform(3.0, 28.0), "FGA": rng.uniform(3.0, 20.0), "FG_PCT": rng.uniform(0.40, 0.65),
+                "FG3A": rng.uniform(0.1, 9.0), "FG3_PCT": rng.uniform(0.28, 0.44), "AST": rng.uniform(0.5, 10.0),
+                "TOV": rng.uniform(0.5, 3.5), "REB": rng.uniform(2.0, 13.0), "OREB": rng.uniform(0.2, 4.0),
+                "BLK": rng.uniform(0.0, 2.5), "STL": rng.uniform(0.3, 1.8),
+                "USG_PCT": rng.uniform(0.12, 0.33), "AST_PCT": rng.uniform(0.05, 0.45)
+            })
+    players_df = pd.DataFrame(players).assign(FG3M=lambda df: df["FG3A"] * df["FG3_PCT"])
+    teams_df = pd.DataFrame([
+        {"TEAM_ID": 100 + i, "TEAM_NAME": f"Team {i + 1}",
+         "FGA": rng.uniform(85.0, 92.0), "FG3_PCT": rng.uniform(0.33, 0.39), "REB": rng.uniform(41.0, 47.0),
+         "AST": rng.uniform(23.0, 30.0), "PACE": rng.uniform(96.0, 103.0),
+         "OFF_RATING": rng.uniform(108.0, 120.0), "DEF_RATING": rng.uniform(108.0, 120.0)}
+        for i in range(teams)
+    ]).assign(FG3A=35.0, FG3M=lambda df: df["FG3_PCT"] * 35.0)
+    return PlayerStatsTable("bench", players_df), TeamRankTable("bench", teams_df)
+
+
+def _report(label: str, final: TradeSearchUpdate, first_update: float) -> None:
+    print(
+        f"{label:<14} avaliados={final.evaluated:>7}  podados={final.pruned:>7}  "
+        f"{final.candidates_per_second:>9.0f} cand/s  primeira atualização={first_update * 1000:7.1f} ms  "
+        f"total={final.seconds:6.2f} s  melhor={final.candidates[0].combined_fit if final.candidates else '-'}"
+    )
+
+
+def _run(context, workers: int) -> None:
+    started = time.perf_counter()
+    first_update = None
+    final = None
+    for update in search_trades(context, workers):
+        if first_update is None:
+            first_update = time.perf_counter() - started
+        final = update
+    _report(f"{workers} processo(s)", final, first_update)
+
+
+def main(teams: int, per_team: int, limit: int, workers: int, seed: int) -> None:
+    player_table, rank_table = _league(teams, per_team, seed)
+    nba_client = Mock()
+    nba_client.get_roster_composition.return_value = None
+    service = TradeSearchService(FitSimulator(nba_client=nba_client, async_client=Mock()))
+    context = service.build_context(100, player_table, rank_table, limit, min_minutes=15.0, max_minutes_gap=8.0)
+
+    print(
+        f"{teams} times × {per_team} jogadores, {len(context.outgoing_combos)} pacotes de saída, "
+        f"top-{limit}, {os.cpu_count()} CPUs"
+    )
+    _run(context, 1)
+    if workers > 1:
+        _run(context, workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--per-team", type=int, default=15)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.teams, args.per_team, args.limit, args.workers, args.seed)
@@ -1,4 +1,172 @@
-from fastapi import Depends
+"""Provedores de dependência das rotas (usados com FastAPI Depends).
+
+Nenhum serviço é construído no import deste módulo. O cliente da NBA API
+(nba_api, pandas), os repositórios (SQLAlchemy) e os serviços de domínio
+nascem na primeira chamada do seu provedor, e só então seus módulos são
+importados. Assim o processo sobe e responde /health sem pagar por eles.
+
+Cada provedor devolve sempre a mesma instância no processo. Nos testes,
+troque qualquer um com `app.dependency_overrides`.
+"""
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Awaitable, Callable, List, TypeVar
+
+from src.core.config import get_settings
+
+if TYPE_CHECKING:
+    from src.domain.services.fit_matrix_service import FitMatrixStore
+    from src.domain.services.fit_simulator import FitSimulator
+    from src.domain.services.trade_search_service import TradeSearchService
+    from src.domain.services.trade_simulator import TradeSimulator
+    from src.infrastructure.database.fit_matrix_repository import FitMatrixRepository
+    from src.infrastructure.database.history_recorder import SimulationHistoryRecorder
+    from src.infrastructure.database.history_repository import SimulationHistoryRepository
+    from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+    from src.infrastructure.external.nba_api_client import NBAApiClient
+    from src.jobs.refresh_league_data import LeagueDataRefresher
+
+T = TypeVar("T")
+
+# Reentrante: um provedor chama os de que depende enquanto constrói
+_construction_lock = threading.RLock()
+_providers: List[Callable] = []
+
+
+def singleton(factory: Callable[[], T]) -> Callable[[], Awaitable[T]]:
+    """Provedor que constrói na primeira chamada e depois reaproveita a instância.
+
+    O provedor é assíncrono: com a instância pronta, o Depends a devolve sem
+    passar pelo threadpool; a primeira construção (imports incluídos) roda
+    numa thread. Fora das rotas, `provider.get()` devolve a instância de forma
+    síncrona e `provider.peek()` a devolve sem construí-la (None se não existe).
+    `provider.factory()` constrói uma instância avulsa, fora do singleton.
+    """
+    instance: List[T] = []
+
+    def get() -> T:
+        if not instance:
+            with _construction_lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    async def provider() -> T:
+        if instance:
+            return instance[0]
+        return await asyncio.to_thread(get)
+
+    provider.__name__ = provider.__qualname__ = factory.__name__
+    provider.__doc__ = factory.__doc__
+    provider.get = get
+    provider.peek = lambda: instance[0] if instance else None
+    provider.factory = factory
+    _providers.append(provider)
+    return provider
+
+
+def load_services() -> None:
+    """Constrói todos os serviços (e importa seus módulos) de uma vez.
+
+    Chamado pelo startup numa thread, para que a primeira requisição real já
+    os encontre prontos.
+    """
+    for provider in _providers:
+        provider.get()
+
+
+@singleton
+def get_nba_client() -> "NBAApiClient":
+    from src.infrastructure.database.stats_repository import StatsRepository
+    from src.infrastructure.external.league_snapshot import LeagueSnapshotStore
+    from src.infrastructure.external.nba_api_client import NBAApiClient
+    from src.infrastructure.external.recorded_responses import RecordedResponses
+
+    settings = get_settings()
+    # Em record/replay os dados vêm das gravações: o SQLite não deve servir nem guardar nada
+    persist = settings.stats_persistence_enabled and settings.nba_api_mode == "live"
+    return NBAApiClient(
+        stats_repository=StatsRepository() if persist else None,
+        snapshot_store=(
+            LeagueSnapshotStore(settings.league_snapshot_dir, settings.league_snapshot_keep)
+            if settings.league_snapshot_dir else None
+        ),
+        recordings=(
+            RecordedResponses(settings.nba_api_recordings_dir, settings.nba_api_mode)
+            if settings.nba_api_mode != "live" else None
+        )
+    )
+
+
+@singleton
+def get_async_nba_client() -> "AsyncNBAApiClient":
+    from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+
+    return AsyncNBAApiClient(get_nba_client.get())
+
+
+@singleton
+def get_fit_simulator() -> "FitSimulator":
+    from src.domain.services.fit_simulator import FitSimulator
+
+    return FitSimulator(get_nba_client.get(), async_client=get_async_nba_client.get())
+
+
+@singleton
+def get_trade_simulator() -> "TradeSimulator":
+    from src.domain.services.trade_simulator import TradeSimulator
+
+    return TradeSimulator(get_fit_simulator.get())
+
+
+@singleton
+def get_trade_search_service() -> "TradeSearchService":
+    from src.domain.services.trade_search_service import TradeSearchService
+
+    return TradeSearchService(get_fit_simulator.get())
+
+
+@singleton
+def get_fit_matrix_store() -> "FitMatrixStore":
+    from src.domain.services.fit_matrix_service import FitMatrixStore
+
+    return FitMatrixStore(get_settings().fit_matrix_max_age_seconds)
+
+
+@singleton
+def get_fit_matrix_repository() -> "FitMatrixRepository":
+    from src.infrastructure.database.fit_matrix_repository import FitMatrixRepository
+
+    return FitMatrixRepository()
+
+
+@singleton
+def get_history_repository() -> "SimulationHistoryRepository":
+    from src.infrastructure.database.history_repository import SimulationHistoryRepository
+
+    return SimulationHistoryRepository()
+
+
+@singleton
+def get_history_recorder() -> "SimulationHistoryRecorder":
+    from src.infrastructure.database.history_recorder import SimulationHistoryRecorder
+
+    return SimulationHistoryRecorder(get_history_repository.get())
+
+
+@singleton
+def get_league_refresher() -> "LeagueDataRefresher":
+    from src.jobs.precompute_fit_matrix import rebuild_fit_matrix
+    from src.jobs.refresh_league_data import LeagueDataRefresher
+
+    async_client = get_async_nba_client.get()
+
+    async def on_refresh() -> None:
+        # Snapshot trocado: a fit matrix em uso deixou de valer
+        await rebuild_fit_matrix(
+            async_client, get_fit_matrix_store.get(), get_fit_matrix_repository.get(),
+            get_settings().fit_matrix_workers
+        )
+
+    return LeagueDataRefresher(async_client, on_refresh=on_refresh)
 
-def get_query_param(param: str):
-    return param
\ No newline at end of file
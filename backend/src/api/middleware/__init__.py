@@ -0,0 +1,3 @@
+# File: /nba-trade-fit-simulator/nba-trade-fit-simulator/backend/src/api/middleware/__init__.py
+
+# This file is intentionally left blank.
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Latência e concorrência das requisições HTTP, por rota."""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import REGISTRY
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Duração das requisições HTTP", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "Requisições HTTP em andamento", ("method",)
+)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: gauge de requisições em andamento e histograma de duração.
+
+    A rota é o template (`/teams/{team_id}/best-fits`), não o path, para não
+    criar uma série por id.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = [500]
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=method,
+                route=_route_template(scope),
+                status=str(status[0])
+            )
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_regex"):
+        return "unmatched"
+    # Rotas de um router incluído guardam o path sem o prefixo: recupera-o do path real
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[index:]):
+            return path[:index] + route.path
+    return route.path
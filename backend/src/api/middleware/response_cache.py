@@ -0,0 +1,206 @@
+"""Cache de respostas HTTP com ETag, chaveado pela versão dos snapshots de dados.
+
+Respostas 200 das rotas GET configuradas ficam guardadas já serializadas: uma
+repetição devolve os bytes prontos, sem passar pela rota, pelo Pydantic nem
+pelo encoder JSON. A chave inclui a versão dos dados da liga, então um
+refresh invalida tudo de uma vez sem varrer o cache.
+"""
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    content_type: str
+    stored_at: float
+    # Rota que gerou a resposta; restaurada no scope nos hits (métricas por rota)
+    route: Any = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+class ResponseCache:
+    """LRU em memória limitado pelo total de bytes dos corpos guardados."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entry_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry.stored_at >= self.ttl_seconds:
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> bool:
+        """Guarda a resposta; corpos maiores que `max_entry_bytes` não são guardados."""
+        if entry.size > self.max_entry_bytes:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.size_bytes += entry.size
+        while self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _remove(self, key: str) -> None:
+        self.size_bytes -= self._entries.pop(key).size
+
+
+class ResponseCacheMiddleware:
+    """Middleware ASGI: ETag forte, If-None-Match → 304 e Cache-Control.
+
+    Só atua em GETs cujo path casa com um dos `paths` (regex); o resto da
+    aplicação, incluindo as rotas em streaming, passa direto. Enquanto
+    `version` devolver None (dados ainda não carregados), também passa direto.
+    Só respostas 200 sem `Cache-Control: no-store` da rota são guardadas.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        version: Callable[[], Optional[str]],
+        paths: Sequence[str],
+        max_age_seconds: int
+    ):
+        self.app = app
+        self.cache = cache
+        self.version = version
+        self.paths = [re.compile(path) for path in paths]
+        self.cache_control = f"public, max-age={max_age_seconds}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not self._cacheable(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if "no-store" in headers.get("cache-control", ""):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = headers.get("if-none-match")
+        route_key = _route_key(scope)
+        version = self.version()
+        entry = self.cache.get(f"{version}|{route_key}") if version is not None else None
+        if entry is not None:
+            scope["route"] = entry.route
+            await self._send(send, entry, if_none_match, "HIT")
+            return
+
+        start: List[Message] = []
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.append(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        # Versão lida de novo: a própria requisição pode ter carregado um snapshot
+        version = self.version()
+        no_store = "no-store" in Headers(raw=start[0]["headers"]).get("cache-control", "")
+        if start[0]["status"] != 200 or version is None or no_store:
+            await send(start[0])
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        entry = CachedResponse(
+            body=body,
+            etag=_etag(body),
+            content_type=Headers(raw=start[0]["headers"]).get("content-type", "application/json"),
+            stored_at=time.monotonic(),
+            route=scope.get("route")
+        )
+        self.cache.put(f"{version}|{route_key}", entry)
+        await self._send(send, entry, if_none_match, "MISS")
+
+    def _cacheable(self, path: str) -> bool:
+        return any(pattern.match(path) for pattern in self.paths)
+
+    async def _send(self, send: Send, entry: CachedResponse, if_none_match: Optional[str], status: str) -> None:
+        headers = [
+            (b"etag", entry.etag.encode()),
+            (b"cache-control", self.cache_control.encode()),
+            (b"x-cache", status.encode())
+        ]
+        if if_none_match and _etag_matches(if_none_match, entry.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += [
+            (b"content-type", entry.content_type.encode()),
+            (b"content-length", str(entry.size).encode())
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+def _route_key(scope: Scope) -> str:
+    # Mesmos parâmetros em outra ordem são a mesma resposta
+    query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    return f"{scope['path']}?{urlencode(sorted(query))}"
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
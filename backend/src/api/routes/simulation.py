@@ -1,45 +1,263 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+import time
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple, Union
 
-from src.schemas.simulation import SimulationResponse, SimulationRequest
+from src.core.config import get_settings
+from src.core.metrics import timed
+from src.core.process_memory import read_process_memory
+from src.schemas.simulation import (
+    SimulationResponse,
+    SimulationRequest,
+    BatchSimulationRequest,
+    FitSummaryResponse,
+    SimulationHistoryEntry,
+    SimulationHistoryPage,
+    UpstreamStatsResponse,
+    RefreshStatusResponse,
+    LeagueSnapshotEntry,
+    WorkerMemoryResponse,
+    TradeSimulationRequest,
+    TradeSimulationResponse,
+    TradeSearchRequest,
+    TradeSearchResponse,
+    TradeCandidateResponse,
+    ScanProgressResponse,
+    ResponseCacheStatsResponse,
+    MemoCacheStatsResponse
+)
 from src.schemas.player import PlayerSearchResponse
 from src.schemas.team import TeamSearchResponse
-from src.domain.services.fit_simulator import FitSimulator
-from src.infrastructure.external.nba_api_client import NBAApiClient
+from src.schemas.analysis import PlayerArchetype
+from src.api.dependencies import (
+    get_fit_matrix_store,
+    get_fit_simulator,
+    get_history_recorder,
+    get_history_repository,
+    get_league_refresher,
+    get_nba_client,
+    get_trade_search_service,
+    get_trade_simulator
+)
+from src.api.middleware.response_cache import ResponseCache
+from src.domain.entities.analysis import FitRecord, ScanProgress
+
+# Só para anotações: os módulos de serviço (nba_api, pandas, SQLAlchemy) são
+# importados pelos provedores de src.api.dependencies na primeira requisição
+if TYPE_CHECKING:
+    from src.domain.services.fit_matrix_service import FitMatrixStore
+    from src.domain.services.fit_simulator import FitSimulator
+    from src.domain.services.trade_simulator import TradeSimulator
+    from src.domain.services.trade_search_service import TradeSearchService, TradeSearchUpdate
+    from src.infrastructure.database.history_repository import SimulationHistoryRepository
+    from src.infrastructure.database.history_recorder import SimulationHistoryRecorder
+    from src.jobs.refresh_league_data import LeagueDataRefresher
+    from src.infrastructure.external.nba_api_client import NBAApiClient
 
 router = APIRouter()
-nba_client = NBAApiClient()
-fit_simulator = FitSimulator(nba_client)
+settings = get_settings()
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    max_entry_bytes=settings.response_cache_max_entry_bytes,
+    ttl_seconds=settings.response_cache_ttl_seconds
+)
+
+# Rotas GET servidas pelo cache de respostas (regex relativas ao prefixo da API).
+# /simulate-fit fica de fora: cada chamada entra no histórico, e um acerto do
+# cache não chega à rota; a memoização do FitSimulator já a deixa barata
+CACHEABLE_ROUTES = (
+    r"/teams$",
+    r"/teams/\d+/best-fits$",
+    r"/players/search$",
+)
 
 
 @router.get("/simulate-fit", response_model=SimulationResponse)
 async def simulate_fit(
     player_id: int = Query(..., description="ID do jogador na NBA API"),
-    team_id: int = Query(..., description="ID do time alvo")
+    team_id: int = Query(..., description="ID do time alvo"),
+    fit_simulator: "FitSimulator" = Depends(get_fit_simulator),
+    history_recorder: "SimulationHistoryRecorder" = Depends(get_history_recorder)
+):
+    try:
+        result = await fit_simulator.simulate_fit(player_id, team_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao processar simulação: {str(e)}"
+        )
+    await history_recorder.record(result)
+    return _json_response(result)
+
+
+@timed("response_serialization")
+def _json_response(result: FitRecord) -> Response:
+    # Conversão e serialização aqui, e não pelo FastAPI, para que a etapa apareça nas métricas
+    model = SimulationResponse.from_record(result)
+    # Dados ausentes costumam ser falha passageira do upstream: não vão para o cache de respostas
+    headers = {"Cache-Control": "no-store"} if getattr(result, "is_error", False) else None
+    return Response(model.model_dump_json(), media_type="application/json", headers=headers)
+
+
+@router.get("/simulate-fit/summary", response_model=FitSummaryResponse)
+async def simulate_fit_summary(
+    player_id: int = Query(..., description="ID do jogador na NBA API"),
+    team_id: int = Query(..., description="ID do time alvo"),
+    nba_client: "NBAApiClient" = Depends(get_nba_client),
+    fit_simulator: "FitSimulator" = Depends(get_fit_simulator),
+    fit_matrix_store: "FitMatrixStore" = Depends(get_fit_matrix_store)
 ):
+    season = nba_client.current_season
+    entry = fit_matrix_store.lookup(season, player_id, team_id, nba_client.data_version())
+    if entry is not None:
+        return FitSummaryResponse(
+            player_id=player_id, team_id=team_id, season=season, source="matrix",
+            fit_score=entry.fit_score, fit_label=entry.fit_label, projected_role=entry.projected_role
+        )
+
     try:
         result = await fit_simulator.simulate_fit(player_id, team_id)
-        return result
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Erro ao processar simulação: {str(e)}"
         )
+    if getattr(result, "is_error", False):
+        raise HTTPException(status_code=404, detail=" ".join(result.reasons))
+    return FitSummaryResponse(
+        player_id=player_id, team_id=team_id, season=season, source="computed",
+        fit_score=result.fit_score, fit_label=result.fit_label, projected_role=result.projected_role
+    )
+
+
+@router.post("/simulate-fit/batch", response_model=List[SimulationResponse])
+async def simulate_fit_batch(
+    request: BatchSimulationRequest,
+    fit_simulator: "FitSimulator" = Depends(get_fit_simulator)
+):
+    try:
+        results = await fit_simulator.simulate_fit_many(request.player_id, request.team_ids)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao processar simulação em lote: {str(e)}"
+        )
+    return [SimulationResponse.from_record(r) for r in results]
+
+
+@router.post("/simulate-trade", response_model=TradeSimulationResponse)
+async def simulate_trade(
+    request: TradeSimulationRequest,
+    trade_simulator: "TradeSimulator" = Depends(get_trade_simulator)
+):
+    try:
+        return await trade_simulator.simulate_trade(request.moves)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao processar troca: {str(e)}"
+        )
+
+
+@router.post("/trades/search", response_model=TradeSearchResponse)
+async def search_trades(
+    request: TradeSearchRequest,
+    trade_search_service: "TradeSearchService" = Depends(get_trade_search_service)
+):
+    try:
+        final = await trade_search_service.search(request.team_id, **_trade_search_options(request))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao buscar trocas: {str(e)}"
+        )
+    return _trade_search_response(final)
+
+
+@router.post("/trades/search/stream")
+async def stream_trade_search(
+    request: TradeSearchRequest,
+    trade_search_service: "TradeSearchService" = Depends(get_trade_search_service)
+):
+    """NDJSON: uma linha com as melhores trocas até o momento a cada lote concluído."""
+    updates = trade_search_service.search_stream(request.team_id, **_trade_search_options(request))
+    try:
+        first = await updates.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao buscar trocas: {str(e)}"
+        )
+
+    async def lines():
+        try:
+            yield _trade_search_response(first).model_dump_json() + "\n"
+            async for update in updates:
+                yield _trade_search_response(update).model_dump_json() + "\n"
+        finally:
+            # Cliente foi embora: cancela os lotes que ainda não começaram
+            await updates.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _trade_search_options(request: TradeSearchRequest) -> dict:
+    return {
+        "limit": request.limit,
+        "position": request.position,
+        "min_minutes": request.min_minutes,
+        "max_minutes_gap": request.max_minutes_gap,
+        "max_outgoing": request.max_outgoing,
+        "workers": settings.trade_search_workers
+    }
+
+
+def _trade_search_response(update: "TradeSearchUpdate") -> TradeSearchResponse:
+    return TradeSearchResponse(
+        candidates=[
+            TradeCandidateResponse(
+                incoming_player_id=c.incoming_player_id,
+                partner_team_id=c.partner_team_id,
+                outgoing_player_ids=list(c.outgoing_player_ids),
+                target_fit=c.target_fit,
+                partner_fit=c.partner_fit,
+                combined_fit=c.combined_fit
+            )
+            for c in update.candidates
+        ],
+        evaluated=update.evaluated,
+        pruned=update.pruned,
+        completed_chunks=update.completed_chunks,
+        total_chunks=update.total_chunks,
+        candidates_per_second=update.candidates_per_second,
+        done=update.done
+    )
 
 
 @router.get("/players/search", response_model=List[PlayerSearchResponse])
 async def search_players(
-    name: str = Query(..., min_length=2, description="Nome do jogador para busca")
+    name: str = Query(..., min_length=2, description="Nome do jogador para busca"),
+    active_only: bool = Query(False, description="Retorna apenas jogadores em atividade"),
+    limit: int = Query(10, ge=1, le=50, description="Número máximo de resultados"),
+    nba_client: "NBAApiClient" = Depends(get_nba_client)
 ):
     try:
-        players = nba_client.search_player_by_name(name)
+        players = nba_client.search_player_by_name(name, limit=limit, active_only=active_only)
         return [
             PlayerSearchResponse(
                 id=p['id'],
                 full_name=p['full_name'],
                 is_active=p.get('is_active', False)
             )
-            for p in players[:10]  # Limita a 10 resultados
+            for p in players
         ]
     except Exception as e:
         raise HTTPException(
@@ -49,7 +267,7 @@ async def search_players(
 
 
 @router.get("/teams", response_model=List[TeamSearchResponse])
-async def get_all_teams():
+async def get_all_teams(nba_client: "NBAApiClient" = Depends(get_nba_client)):
     try:
         teams = nba_client.get_all_teams()
         return [
@@ -65,4 +283,192 @@ async def get_all_teams():
         raise HTTPException(
             status_code=500,
             detail=f"Erro ao buscar times: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/teams/{team_id}/best-fits", response_model=List[SimulationResponse])
+async def get_best_fits_for_team(
+    team_id: int,
+    limit: int = Query(10, ge=1, le=100, description="Número máximo de jogadores"),
+    position: Optional[str] = Query(None, description="Filtra por posição (G, F, C)"),
+    min_minutes: float = Query(0.0, ge=0, le=48, description="Minutos mínimos por jogo"),
+    archetype: Optional[PlayerArchetype] = Query(None, description="Filtra por arquétipo"),
+    fit_simulator: "FitSimulator" = Depends(get_fit_simulator)
+):
+    try:
+        results = await fit_simulator.rank_players_for_team(
+            team_id, limit=limit, position=position, min_minutes=min_minutes, archetype=archetype
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao ranquear jogadores: {str(e)}"
+        )
+    if results is None:
+        raise HTTPException(status_code=404, detail="Dados do time não encontrados.")
+    return [SimulationResponse.from_record(r) for r in results]
+
+
+@router.get("/teams/{team_id}/best-fits/stream")
+async def stream_best_fits_for_team(
+    request: Request,
+    team_id: int,
+    position: Optional[str] = Query(None, description="Filtra por posição (G, F, C)"),
+    min_minutes: float = Query(0.0, ge=0, le=48, description="Minutos mínimos por jogo"),
+    archetype: Optional[PlayerArchetype] = Query(None, description="Filtra por arquétipo"),
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson ou sse"),
+    fit_simulator: "FitSimulator" = Depends(get_fit_simulator)
+):
+    """Cada jogador avaliado é enviado assim que sai, intercalado com eventos de progresso."""
+    events = fit_simulator.stream_players_for_team(
+        team_id, position=position, min_minutes=min_minutes, archetype=archetype
+    )
+    return await _scan_response(request, events, stream_format)
+
+
+@router.get("/players/{player_id}/fits/stream")
+async def stream_fits_for_player(
+    request: Request,
+    player_id: int,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson ou sse"),
+    fit_simulator: "FitSimulator" = Depends(get_fit_simulator)
+):
+    """Encaixe do jogador em cada time da liga, enviado time a time."""
+    events = fit_simulator.stream_teams_for_player(player_id)
+    return await _scan_response(request, events, stream_format)
+
+
+async def _scan_response(
+    request: Request,
+    events: AsyncIterator[Union[FitRecord, ScanProgress]],
+    stream_format: str
+) -> StreamingResponse:
+    # O primeiro evento sai antes da resposta: time/jogador inexistente ainda vira 404
+    started = time.perf_counter()
+    try:
+        first = await events.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao varrer a liga: {str(e)}"
+        )
+
+    def encode(name: str, event: Union[FitRecord, ScanProgress]) -> str:
+        if isinstance(event, ScanProgress):
+            data = ScanProgressResponse(
+                scanned=event.scanned, total=event.total,
+                elapsed_ms=(time.perf_counter() - started) * 1000
+            )
+        else:
+            data = SimulationResponse.from_record(event)
+        return _encode_event(name, data, stream_format)
+
+    async def body():
+        last = first
+        try:
+            yield encode("progress", first)
+            async for event in events:
+                if isinstance(event, ScanProgress):
+                    # Cliente foi embora: para a varredura em vez de avaliar o resto da liga
+                    if await request.is_disconnected():
+                        return
+                    last = event
+                    yield encode("progress", event)
+                else:
+                    yield encode("result", event)
+            yield encode("done", last)
+        finally:
+            await events.aclose()
+
+    if stream_format == "sse":
+        return StreamingResponse(
+            body(), media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+def _encode_event(name: str, data: BaseModel, stream_format: str) -> str:
+    payload = data.model_dump_json()
+    if stream_format == "sse":
+        return f"event: {name}\ndata: {payload}\n\n"
+    return f'{{"event": "{name}", "data": {payload}}}\n'
+
+
+@router.get("/upstream/stats", response_model=UpstreamStatsResponse)
+async def get_upstream_stats(nba_client: "NBAApiClient" = Depends(get_nba_client)):
+    return UpstreamStatsResponse(**nba_client.upstream_stats())
+
+
+@router.get("/cache/stats", response_model=ResponseCacheStatsResponse)
+async def get_response_cache_stats(nba_client: "NBAApiClient" = Depends(get_nba_client)):
+    return ResponseCacheStatsResponse(**response_cache.stats(), data_version=nba_client.data_version())
+
+
+@router.get("/fit-cache/stats", response_model=List[MemoCacheStatsResponse])
+async def get_fit_cache_stats(fit_simulator: "FitSimulator" = Depends(get_fit_simulator)):
+    return [MemoCacheStatsResponse(**stats) for stats in fit_simulator.cache_stats()]
+
+
+@router.get("/refresh/stats", response_model=List[RefreshStatusResponse])
+async def get_refresh_stats(league_refresher: "LeagueDataRefresher" = Depends(get_league_refresher)):
+    return [
+        RefreshStatusResponse(dataset=name, **vars(status))
+        for name, status in league_refresher.status.items()
+    ]
+
+
+@router.get("/worker/memory", response_model=WorkerMemoryResponse)
+async def get_worker_memory(
+    nba_client: "NBAApiClient" = Depends(get_nba_client),
+    league_refresher: "LeagueDataRefresher" = Depends(get_league_refresher)
+):
+    memory = read_process_memory()
+    return WorkerMemoryResponse(
+        pid=memory["pid"],
+        rss_bytes=memory["rss_bytes"],
+        pss_bytes=memory["pss_bytes"],
+        shared_bytes=memory["shared_clean_bytes"] + memory["shared_dirty_bytes"],
+        private_bytes=memory["private_clean_bytes"] + memory["private_dirty_bytes"],
+        snapshots_adopted=league_refresher.snapshots_adopted,
+        snapshots=[LeagueSnapshotEntry(**entry) for entry in nba_client.snapshot_status()]
+    )
+
+
+@router.get("/history", response_model=SimulationHistoryPage)
+async def get_simulation_history(
+    player_id: Optional[int] = Query(None, description="Filtra por jogador"),
+    team_id: Optional[int] = Query(None, description="Filtra por time"),
+    limit: int = Query(20, ge=1, le=100, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    history_repository: "SimulationHistoryRepository" = Depends(get_history_repository)
+):
+    before = _decode_history_cursor(cursor) if cursor else None
+    try:
+        rows = await history_repository.list_page(
+            limit=limit, player_id=player_id, team_id=team_id, before=before
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao buscar histórico: {str(e)}"
+        )
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = f"{last.created_at.isoformat()}|{last.id}"
+    return SimulationHistoryPage(
+        items=[SimulationHistoryEntry.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, last_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(last_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
@@ -1,5 +1,7 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -15,6 +17,72 @@ class Settings(BaseSettings):
     # API
     api_prefix: str = "/api/v1"
     
+    # NBA API
+    current_season: str = "2024-25"
+    fallback_season: str = "2023-24"
+    stats_cache_ttl_seconds: int = 3600
+    # Após um refresh falho, o snapshot anterior é servido por este tempo antes de nova tentativa
+    stats_cache_retry_seconds: int = 30
+    stats_persistence_enabled: bool = True
+    nba_api_max_workers: int = 8
+    # O token bucket divide pela taxa e nunca enche com burst 0: os dois precisam ser positivos
+    nba_api_rate_per_second: float = Field(4.0, gt=0)
+    nba_api_burst: int = Field(8, gt=0)
+    nba_api_max_retries: int = 3
+    nba_api_backoff_base_seconds: float = 0.5
+    nba_api_backoff_max_seconds: float = 8.0
+    nba_api_breaker_failure_threshold: int = 5
+    nba_api_breaker_reset_seconds: float = 30.0
+    # Últimas respostas válidas servidas durante quedas do upstream (LRU + TTL)
+    nba_api_stale_max_entries: int = 256
+    nba_api_stale_ttl_seconds: int = 86400
+    
+    # Modo offline: live chama a NBA API; record grava as respostas em JSON
+    # no diretório; replay serve só o que foi gravado, sem rede
+    nba_api_mode: str = "live"
+    nba_api_recordings_dir: str = "./nba_api_recordings"
+    
+    # Refresh periódico dos dados da liga (jogadores, times e rosters)
+    league_refresh_enabled: bool = True
+    league_refresh_interval_seconds: int = 1800
+    league_refresh_min_player_rows: int = 300
+    league_refresh_min_team_rows: int = 30
+    
+    # Snapshot colunar em disco compartilhado pelos workers (desligado sem diretório)
+    league_snapshot_dir: Optional[str] = None
+    league_snapshot_keep: int = 2
+    league_snapshot_poll_seconds: float = 5.0
+    
+    # Fit matrix (pré-cálculo jogadores × times)
+    fit_matrix_on_startup: bool = True
+    fit_matrix_max_age_seconds: int = 86400
+    fit_matrix_workers: Optional[int] = None
+    
+    # Memoização do FitSimulator (LRU + TTL, chaveada pela versão dos dados)
+    fit_cache_max_responses: int = 20000
+    fit_cache_max_analyses: int = 2000
+    fit_cache_max_team_needs: int = 256
+    fit_cache_ttl_seconds: int = 3600
+    
+    # Busca de trocas (processos; padrão: todos os cores)
+    trade_search_workers: Optional[int] = None
+    
+    # Métricas Prometheus em /metrics
+    metrics_enabled: bool = True
+    
+    # Cache de respostas HTTP (LRU por bytes, ETag e Cache-Control)
+    response_cache_enabled: bool = True
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+    response_cache_max_entry_bytes: int = 1024 * 1024
+    response_cache_ttl_seconds: int = 300
+    response_cache_max_age_seconds: int = 60
+    
+    # Histórico de simulações (gravação assíncrona em lotes)
+    history_queue_size: int = 1000
+    history_batch_size: int = 100
+    history_flush_interval_seconds: float = 1.0
+    history_enqueue_timeout_seconds: float = 0.05
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,22 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+
+def write_json_atomic(path: str, payload: Dict[str, Any]) -> None:
+    """Grava o JSON num temporário do mesmo diretório e o publica com os.replace.
+
+    Leitores veem o arquivo antigo ou o novo inteiro, nunca um pela metade.
+    """
+    fd, temp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except Exception:
+        if os.path.exists(temp):
+            os.unlink(temp)
+        raise
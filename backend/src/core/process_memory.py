@@ -0,0 +1,43 @@
+"""Memória do processo atual, para comparar workers do uvicorn entre si.
+
+RSS conta cada página mapeada inteira em todo processo que a usa; PSS divide
+as páginas compartilhadas pelo número de processos, então é o número que
+mostra o ganho de mapear o mesmo snapshot em vários workers.
+"""
+import os
+import resource
+import sys
+from typing import Dict
+
+# Campos de /proc/self/smaps_rollup (em kB) -> chave devolvida (em bytes)
+SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+}
+
+
+def read_process_memory() -> Dict[str, int]:
+    """RSS, PSS e páginas compartilhadas/privadas do processo, em bytes.
+
+    Fora do Linux só há o pico de RSS (getrusage); os demais campos ficam 0.
+    """
+    memory = {key: 0 for key in SMAPS_FIELDS.values()}
+    memory["pid"] = os.getpid()
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                key = SMAPS_FIELDS.get(name)
+                if key is not None:
+                    memory[key] = int(value.split()[0]) * 1024
+        return memory
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em kB nos demais
+    memory["rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    return memory
@@ -0,0 +1,119 @@
+"""Registros internos do pipeline de simulação.
+
+Espelham os schemas de `src.schemas.analysis`, mas são dataclasses com
+__slots__: construí-los não valida nem copia nada. Os serviços de domínio
+trabalham só com eles; a conversão para Pydantic acontece uma vez, na
+borda da API (`SimulationResponse.from_record`).
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.schemas.analysis import FitLabel, PlayerArchetype, TeamNeed
+
+
+@dataclass(slots=True)
+class PlayerStatsRecord:
+    player_id: int
+    player_name: str
+    pts: float = 0.0
+    fga: float = 0.0
+    fg_pct: float = 0.0
+    fg3a: float = 0.0
+    fg3_pct: float = 0.0
+    ast: float = 0.0
+    tov: float = 0.0
+    ast_pct: Optional[float] = None
+    usg_pct: Optional[float] = None
+    reb: float = 0.0
+    oreb: float = 0.0
+    oreb_pct: Optional[float] = None
+    blk: float = 0.0
+    stl: float = 0.0
+    dfg_pct: Optional[float] = None
+    deflections: Optional[float] = None
+    per: Optional[float] = None
+    net_rating: Optional[float] = None
+    min: float = 0.0
+    position: str = ""
+
+    @property
+    def ast_to_ratio(self) -> float:
+        if self.tov and self.tov > 0:
+            return self.ast / self.tov
+        return self.ast if self.ast > 0 else 0.0
+
+
+@dataclass(slots=True)
+class PlayerAnalysisRecord:
+    player_id: int
+    player_name: str
+    position: str
+    # PlayerStatsRecord no pipeline; PlayerAdvancedStats também é aceito
+    stats: Any
+    archetypes: List[PlayerArchetype] = field(default_factory=list)
+    archetype_scores: Dict[str, float] = field(default_factory=dict)
+    is_ball_dominant: bool = False
+    is_elite_shooter: bool = False
+    is_defensive_anchor: bool = False
+    per: Optional[float] = None
+    estimated_minutes: float = 0.0
+
+
+@dataclass(slots=True)
+class TeamNeedsRecord:
+    team_id: int
+    team_name: str
+    needs: List[TeamNeed] = field(default_factory=list)
+    needs_priority: Dict[str, int] = field(default_factory=dict)
+    style_alerts: List[str] = field(default_factory=list)
+    # TeamStats do snapshot, referenciado sem cópia
+    team_stats: Any = None
+
+
+@dataclass(slots=True)
+class RosterConflictRecord:
+    conflict_type: str
+    severity: str = "medium"
+    affected_players: List[str] = field(default_factory=list)
+    penalty_points: int = 0
+    description: str = ""
+
+
+@dataclass(slots=True)
+class RosterFrictionRecord:
+    total_penalty: int = 0
+    conflicts: List[RosterConflictRecord] = field(default_factory=list)
+    suggested_role: str = "Rotation"
+    blocking_players: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class FitRecord:
+    """Resultado de uma simulação; vira SimulationResponse só na resposta HTTP."""
+
+    player_id: int
+    player_name: str
+    team_id: int
+    team_name: str
+    fit_score: int
+    fit_label: FitLabel
+    estimated_minutes: float = 0.0
+    projected_role: str = "Rotation"
+    player_archetypes: List[str] = field(default_factory=list)
+    team_needs_addressed: List[str] = field(default_factory=list)
+    reasons: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    breakdown: Dict[str, int] = field(default_factory=dict)
+    player_analysis: Optional[PlayerAnalysisRecord] = None
+    team_needs: Optional[TeamNeedsRecord] = None
+    friction_result: Optional[RosterFrictionRecord] = None
+    # Jogador ou time sem dados (ex.: NBA API fora): não é uma simulação de verdade
+    is_error: bool = False
+
+
+@dataclass
+class ScanProgress:
+    """Progresso de uma varredura da liga: itens já avaliados de um total."""
+
+    scanned: int
+    total: int
@@ -0,0 +1,278 @@
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.entities.analysis import PlayerStatsRecord
+from src.schemas.analysis import FitLabel, TeamStats
+from src.domain.services.fit_simulator import FitSimulator
+from src.domain.services.player_archetype_service import PlayerArchetypeService
+from src.domain.services.team_gap_service import TeamGapService
+from src.domain.services.roster_friction_service import RosterFrictionService
+
+FIT_LABELS: List[FitLabel] = list(FitLabel)
+
+
+@dataclass
+class FitMatrixEntry:
+    fit_score: int
+    fit_label: FitLabel
+    projected_role: str
+
+
+@dataclass
+class FitMatrix:
+    """Matriz jogadores × times com fit_score, fit_label e projected_role codificados em uint8."""
+
+    season: str
+    player_ids: np.ndarray
+    team_ids: np.ndarray
+    scores: np.ndarray
+    label_codes: np.ndarray
+    role_codes: np.ndarray
+    roles: List[str]
+    computed_at: datetime
+    # Impressão digital das tabelas de que a matriz saiu (ver source_fingerprint)
+    source_version: Optional[str] = None
+    _player_index: Dict[int, int] = field(init=False, repr=False)
+    _team_index: Dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._player_index = {int(pid): i for i, pid in enumerate(self.player_ids)}
+        self._team_index = {int(tid): j for j, tid in enumerate(self.team_ids)}
+
+    @property
+    def cells(self) -> int:
+        return int(self.scores.size)
+
+    def lookup(self, player_id: int, team_id: int) -> Optional[FitMatrixEntry]:
+        i = self._player_index.get(player_id)
+        j = self._team_index.get(team_id)
+        if i is None or j is None:
+            return None
+        return FitMatrixEntry(
+            fit_score=int(self.scores[i, j]),
+            fit_label=FIT_LABELS[self.label_codes[i, j]],
+            projected_role=self.roles[self.role_codes[i, j]]
+        )
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return datetime.utcnow() - self.computed_at > timedelta(seconds=max_age_seconds)
+
+    def to_records(self) -> Iterator[Dict[str, Any]]:
+        for i, player_id in enumerate(self.player_ids):
+            for j, team_id in enumerate(self.team_ids):
+                yield {
+                    "season": self.season,
+                    "player_id": int(player_id),
+                    "team_id": int(team_id),
+                    "fit_score": int(self.scores[i, j]),
+                    "fit_label": FIT_LABELS[self.label_codes[i, j]].value,
+                    "projected_role": self.roles[self.role_codes[i, j]],
+                    "computed_at": self.computed_at,
+                    "source_version": self.source_version
+                }
+
+    @classmethod
+    def from_records(cls, season: str, records: Sequence[Dict[str, Any]]) -> Optional["FitMatrix"]:
+        if not records:
+            return None
+        player_ids = np.array(sorted({r["player_id"] for r in records}), dtype=np.int64)
+        team_ids = np.array(sorted({r["team_id"] for r in records}), dtype=np.int64)
+        player_index = {int(pid): i for i, pid in enumerate(player_ids)}
+        team_index = {int(tid): j for j, tid in enumerate(team_ids)}
+        label_index = {label.value: k for k, label in enumerate(FIT_LABELS)}
+        roles: List[str] = []
+        role_index: Dict[str, int] = {}
+
+        shape = (len(player_ids), len(team_ids))
+        scores = np.zeros(shape, dtype=np.uint8)
+        label_codes = np.full(shape, label_index[FitLabel.BAD_FIT.value], dtype=np.uint8)
+        role_codes = np.zeros(shape, dtype=np.uint8)
+        for r in records:
+            i, j = player_index[r["player_id"]], team_index[r["team_id"]]
+            if r["projected_role"] not in role_index:
+                role_index[r["projected_role"]] = len(roles)
+                roles.append(r["projected_role"])
+            scores[i, j] = r["fit_score"]
+            label_codes[i, j] = label_index[r["fit_label"]]
+            role_codes[i, j] = role_index[r["projected_role"]]
+
+        return cls(
+            season=season,
+            player_ids=player_ids,
+            team_ids=team_ids,
+            scores=scores,
+            label_codes=label_codes,
+            role_codes=role_codes,
+            roles=roles,
+            computed_at=min(r["computed_at"] for r in records),
+            # Linhas de versões diferentes (ou sem versão) não formam uma matriz confiável
+            source_version=(
+                records[0].get("source_version")
+                if len({r.get("source_version") for r in records}) == 1 else None
+            )
+        )
+
+
+@dataclass
+class FitMatrixBuildReport:
+    cells: int
+    seconds: float
+    workers: int
+
+    @property
+    def cells_per_second(self) -> float:
+        return self.cells / self.seconds if self.seconds > 0 else float("inf")
+
+
+class FitMatrixService:
+    """Pré-calcula o encaixe de todos os jogadores contra todos os times.
+
+    Usa exatamente as regras do FitSimulator (arquétipos, lacunas, fricção e
+    veredito). Os times são divididos entre processos para usar todos os cores.
+    """
+
+    def build(
+        self,
+        season: str,
+        player_stats: List[PlayerStatsRecord],
+        team_stats: List[TeamStats],
+        workers: Optional[int] = None
+    ) -> Tuple[FitMatrix, FitMatrixBuildReport]:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(team_stats) or 1))
+        started = time.perf_counter()
+
+        chunks = [team_stats[k::workers] for k in range(workers)]
+        if workers == 1:
+            columns = [_score_teams(player_stats, chunks[0])]
+        else:
+            # spawn: seguro mesmo quando chamado a partir de threads do servidor
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                columns = list(pool.map(_score_teams, [player_stats] * workers, chunks))
+
+        ordered_teams = [team for chunk in chunks for team in chunk]
+        scores = np.hstack([c[0] for c in columns])
+        label_codes = np.hstack([c[1] for c in columns])
+        roles: List[str] = []
+        role_codes = np.hstack([_merge_roles(c[2], c[3], roles) for c in columns])
+
+        order = np.argsort([t.team_id for t in ordered_teams], kind="stable")
+        matrix = FitMatrix(
+            season=season,
+            player_ids=np.array([p.player_id for p in player_stats], dtype=np.int64),
+            team_ids=np.array([ordered_teams[k].team_id for k in order], dtype=np.int64),
+            scores=scores[:, order],
+            label_codes=label_codes[:, order],
+            role_codes=role_codes[:, order],
+            roles=roles,
+            computed_at=datetime.utcnow(),
+            source_version=source_fingerprint(player_stats, team_stats)
+        )
+        report = FitMatrixBuildReport(
+            cells=matrix.cells,
+            seconds=time.perf_counter() - started,
+            workers=workers
+        )
+        return matrix, report
+
+
+class FitMatrixStore:
+    """Mantém a matriz vigente em memória e responde lookups enquanto ela estiver fresca.
+
+    A matriz guarda a versão dos dados (NBAApiClient.data_version) de que saiu:
+    depois de uma troca de snapshot ela deixa de responder até ser recalculada.
+    """
+
+    def __init__(self, max_age_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self.matrix: Optional[FitMatrix] = None
+        self.data_version: Optional[str] = None
+
+    def replace(self, matrix: Optional[FitMatrix], data_version: Optional[str] = None) -> None:
+        self.matrix, self.data_version = matrix, data_version
+
+    def is_fresh(self, season: str, data_version: Optional[str] = None) -> bool:
+        matrix = self.matrix
+        return (
+            matrix is not None
+            and matrix.season == season
+            and not matrix.is_stale(self.max_age_seconds)
+            and (data_version is None or data_version == self.data_version)
+        )
+
+    def lookup(
+        self,
+        season: str,
+        player_id: int,
+        team_id: int,
+        data_version: Optional[str] = None
+    ) -> Optional[FitMatrixEntry]:
+        if not self.is_fresh(season, data_version):
+            return None
+        return self.matrix.lookup(player_id, team_id)
+
+
+def source_fingerprint(player_stats: Sequence[PlayerStatsRecord], team_stats: Sequence[TeamStats]) -> str:
+    """Hash estável entre processos das entradas da matriz (jogadores e times).
+
+    A data_version do NBAApiClient é um contador do processo e não sobrevive a um
+    restart; a matriz persistida guarda este hash para saber de que dados saiu.
+    """
+    digest = hashlib.sha256()
+    for stats in sorted(player_stats, key=lambda p: p.player_id):
+        digest.update(repr(stats).encode())
+    for team in sorted(team_stats, key=lambda t: t.team_id):
+        digest.update(team.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def _score_teams(
+    player_stats: List[PlayerStatsRecord],
+    team_stats: List[TeamStats]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    # Executado nos processos do pool: cada worker instancia seus próprios serviços
+    archetype_service = PlayerArchetypeService()
+    gap_service = TeamGapService()
+    friction_service = RosterFrictionService()
+    label_index = {label: k for k, label in enumerate(FIT_LABELS)}
+
+    analyses = [archetype_service.analyze_player(stats) for stats in player_stats]
+    shape = (len(analyses), len(team_stats))
+    scores = np.zeros(shape, dtype=np.uint8)
+    label_codes = np.zeros(shape, dtype=np.uint8)
+    role_codes = np.zeros(shape, dtype=np.uint8)
+    roles: List[str] = []
+    role_index: Dict[str, int] = {}
+
+    for j, team in enumerate(team_stats):
+        team_needs = gap_service.analyze_team_needs(team)
+        for i, analysis in enumerate(analyses):
+            friction = friction_service.analyze_friction(analysis, team)
+            score, label, _ = FitSimulator.calculate_final_verdict(analysis, team_needs, friction)
+            role = friction.suggested_role
+            if role not in role_index:
+                role_index[role] = len(roles)
+                roles.append(role)
+            scores[i, j] = score
+            label_codes[i, j] = label_index[label]
+            role_codes[i, j] = role_index[role]
+
+    return scores, label_codes, role_codes, roles
+
+
+def _merge_roles(codes: np.ndarray, local_roles: List[str], roles: List[str]) -> np.ndarray:
+    # Cada worker numera os papéis localmente; remapeia para a tabela global
+    remap = np.zeros(max(len(local_roles), 1), dtype=np.uint8)
+    for k, role in enumerate(local_roles):
+        if role not in roles:
+            roles.append(role)
+        remap[k] = roles.index(role)
+    return remap[codes]
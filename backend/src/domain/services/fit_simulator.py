@@ -1,38 +1,301 @@
-from typing import Optional, List
+import asyncio
+import heapq
+from typing import Any, AsyncIterator, Dict, Hashable, Optional, List, Sequence, Union
+from src.core.config import get_settings
+from src.core.memo_cache import MemoCache
+from src.core.metrics import timed
 from src.infrastructure.external.nba_api_client import NBAApiClient
-from src.schemas.simulation import SimulationResponse
-from src.schemas.analysis import FitLabel, TradeResult
+from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+from src.domain.entities.analysis import (
+    FitRecord, PlayerAnalysisRecord, PlayerStatsRecord, RosterFrictionRecord, ScanProgress, TeamNeedsRecord
+)
+from src.schemas.analysis import FitLabel, PlayerArchetype, TeamStats
 
 from src.domain.services.player_archetype_service import PlayerArchetypeService
 from src.domain.services.team_gap_service import TeamGapService
 from src.domain.services.roster_friction_service import RosterFrictionService
 
+
 class FitSimulator:
+    """Simula o encaixe de jogadores em times.
+
+    Resultados completos, análises de jogador e necessidades de time ficam
+    memoizados em caches separados, chaveados pela versão dos snapshots da
+    liga (que inclui a temporada): a análise de um jogador serve para os 30
+    times e as necessidades de um time para todos os jogadores.
+
+    Tudo aqui trabalha com os registros de `src.domain.entities.analysis`;
+    as rotas convertem o FitRecord final com SimulationResponse.from_record.
+    """
 
-    def __init__(self, nba_client: Optional[NBAApiClient] = None):
+    def __init__(
+        self,
+        nba_client: Optional[NBAApiClient] = None,
+        async_client: Optional[AsyncNBAApiClient] = None
+    ):
+        settings = get_settings()
         self.nba_client = nba_client or NBAApiClient()
+        self.async_client = async_client or AsyncNBAApiClient(self.nba_client)
         self.archetype_service = PlayerArchetypeService()
         self.gap_service = TeamGapService()
         self.friction_service = RosterFrictionService()
+        ttl = settings.fit_cache_ttl_seconds
+        self._responses: MemoCache[FitRecord] = MemoCache(
+            "simulation_response", settings.fit_cache_max_responses, ttl
+        )
+        self._analyses: MemoCache[PlayerAnalysisRecord] = MemoCache(
+            "player_analysis", settings.fit_cache_max_analyses, ttl
+        )
+        self._team_needs: MemoCache[TeamNeedsRecord] = MemoCache(
+            "team_needs", settings.fit_cache_max_team_needs, ttl
+        )
 
-    async def simulate_fit(self, player_id: int, team_id: int) -> SimulationResponse:
-        player_stats = self.nba_client.get_player_advanced_stats(player_id)
+    async def simulate_fit(self, player_id: int, team_id: int) -> FitRecord:
+        version = self._data_version()
+        key = (version, player_id, team_id)
+        cached = self._responses.get(key)
+        if cached is not None:
+            return cached
+
+        player_stats, team_stats = await asyncio.gather(
+            self.async_client.get_player_advanced_stats(player_id),
+            self.async_client.get_team_stats(team_id)
+        )
         if not player_stats:
             return self._create_error_response(player_id, team_id, "Dados do jogador não encontrados.")
-        team_stats = self.nba_client.get_team_stats(team_id)
         if not team_stats:
             return self._create_error_response(player_id, team_id, "Dados do time não encontrados.")
-        player_analysis = self.archetype_service.analyze_player(player_stats)
+        player_analysis = self._analyze(version, player_stats)
+        # A busca acima já contou o miss: avalia e grava sem consultar o cache de novo
+        return self._evaluate_and_store(key, version, player_analysis, team_stats)
+
+    async def simulate_fit_many(
+        self,
+        player_id: int,
+        team_ids: Optional[Sequence[int]] = None
+    ) -> List[FitRecord]:
+        """Avalia um jogador contra vários times (todos, se team_ids for None).
+
+        Cada fonte de dados é carregada uma vez e a análise de arquétipos do
+        jogador é reutilizada para todos os times. Resultados ordenados por fit_score.
+        """
+        version = self._data_version()
+        player_stats, all_team_stats = await asyncio.gather(
+            self.async_client.get_player_advanced_stats(player_id),
+            self.async_client.get_all_team_stats()
+        )
+        teams_by_id = {t.team_id: t for t in all_team_stats}
+        if team_ids is None:
+            team_ids = list(teams_by_id)
+
+        if not player_stats:
+            return [
+                self._create_error_response(player_id, tid, "Dados do jogador não encontrados.")
+                for tid in team_ids
+            ]
+
+        player_analysis = self._analyze(version, player_stats)
+        results = []
+        for tid in team_ids:
+            team_stats = teams_by_id.get(tid)
+            if team_stats is None:
+                results.append(self._create_error_response(player_id, tid, "Dados do time não encontrados."))
+            else:
+                results.append(self._evaluate_cached(version, player_analysis, team_stats))
+
+        results.sort(key=lambda r: r.fit_score, reverse=True)
+        return results
+
+    async def rank_players_for_team(
+        self,
+        team_id: int,
+        limit: int = 10,
+        position: Optional[str] = None,
+        min_minutes: float = 0.0,
+        archetype: Optional[PlayerArchetype] = None
+    ) -> Optional[List[FitRecord]]:
+        """Ranqueia os jogadores da liga pelo encaixe no time (None se o time não existir).
+
+        As necessidades do time são calculadas uma vez; cada jogador passa apenas
+        por arquétipos, fricção e veredito, e o FitRecord completo só é
+        montado para os `limit` melhores.
+        """
+        version = self._data_version()
+        team_stats, player_table = await asyncio.gather(
+            self.async_client.get_team_stats(team_id),
+            self.async_client.get_player_stats_table()
+        )
+        if not team_stats:
+            return None
+
+        team_needs = self._needs(version, team_stats)
+        position = position.upper() if position else None
+        scored = []
+
+        for stats in player_table.all_stats():
+            player_analysis = self._filtered_analysis(version, stats, position, min_minutes, archetype)
+            if player_analysis is None:
+                continue
+            friction_result = self.friction_service.analyze_friction(player_analysis, team_stats)
+            verdict = self.calculate_final_verdict(player_analysis, team_needs, friction_result)
+            scored.append((verdict[0], len(scored), player_analysis, friction_result, verdict))
+
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+        return [
+            self._build_response(player_analysis, team_stats, team_needs, friction_result, *verdict)
+            for _, _, player_analysis, friction_result, verdict in best
+        ]
+
+    async def stream_players_for_team(
+        self,
+        team_id: int,
+        position: Optional[str] = None,
+        min_minutes: float = 0.0,
+        archetype: Optional[PlayerArchetype] = None,
+        progress_every: int = 25
+    ) -> AsyncIterator[Union[FitRecord, ScanProgress]]:
+        """Varre a liga para um time, emitindo cada resultado assim que é avaliado.
+
+        Intercala ScanProgress a cada `progress_every` jogadores e devolve o
+        controle ao event loop nesses pontos, para que uma varredura
+        abandonada possa ser cancelada. ValueError se o time não existir.
+        """
+        version = self._data_version()
+        team_stats, player_table = await asyncio.gather(
+            self.async_client.get_team_stats(team_id),
+            self.async_client.get_player_stats_table()
+        )
+        if not team_stats:
+            raise ValueError("Dados do time não encontrados.")
+
+        team_needs = self._needs(version, team_stats)
+        position = position.upper() if position else None
+        total = len(player_table)
+        yield ScanProgress(0, total)
+
+        for scanned, stats in enumerate(player_table.all_stats(), start=1):
+            player_analysis = self._filtered_analysis(version, stats, position, min_minutes, archetype)
+            if player_analysis is not None:
+                friction_result = self.friction_service.analyze_friction(player_analysis, team_stats)
+                verdict = self.calculate_final_verdict(player_analysis, team_needs, friction_result)
+                yield self._build_response(player_analysis, team_stats, team_needs, friction_result, *verdict)
+            if scanned % progress_every == 0 or scanned == total:
+                yield ScanProgress(scanned, total)
+                await asyncio.sleep(0)
+
+    async def stream_teams_for_player(
+        self,
+        player_id: int,
+        progress_every: int = 5
+    ) -> AsyncIterator[Union[FitRecord, ScanProgress]]:
+        """Avalia um jogador contra todos os times, emitindo cada resultado assim que é avaliado.
+
+        ValueError se o jogador não existir.
+        """
+        version = self._data_version()
+        player_stats, all_team_stats = await asyncio.gather(
+            self.async_client.get_player_advanced_stats(player_id),
+            self.async_client.get_all_team_stats()
+        )
+        if not player_stats:
+            raise ValueError("Dados do jogador não encontrados.")
+
+        player_analysis = self._analyze(version, player_stats)
+        total = len(all_team_stats)
+        yield ScanProgress(0, total)
+
+        for scanned, team_stats in enumerate(all_team_stats, start=1):
+            yield self._evaluate_cached(version, player_analysis, team_stats)
+            if scanned % progress_every == 0 or scanned == total:
+                yield ScanProgress(scanned, total)
+                await asyncio.sleep(0)
+
+    def _filtered_analysis(
+        self,
+        version: Hashable,
+        stats: PlayerStatsRecord,
+        position: Optional[str],
+        min_minutes: float,
+        archetype: Optional[PlayerArchetype]
+    ) -> Optional[PlayerAnalysisRecord]:
+        if stats.min < min_minutes:
+            return None
+        if position and position not in stats.position:
+            return None
+        player_analysis = self._analyze(version, stats)
+        if archetype and archetype not in player_analysis.archetypes:
+            return None
+        return player_analysis
+
+    def cache_stats(self) -> List[Dict[str, Any]]:
+        return [cache.stats() for cache in (self._responses, self._analyses, self._team_needs)]
+
+    def _data_version(self) -> Hashable:
+        # Lida antes de buscar os dados: se um refresh trocar o snapshot no meio,
+        # o resultado fica sob a versão antiga e nunca é servido como novo
+        return self.nba_client.data_version()
+
+    def _analyze(self, version: Hashable, stats: PlayerStatsRecord) -> PlayerAnalysisRecord:
+        return self._analyses.get_or_compute(
+            (version, stats.player_id), lambda: self.archetype_service.analyze_player(stats)
+        )
+
+    def _needs(self, version: Hashable, team_stats: TeamStats) -> TeamNeedsRecord:
+        # Só para TeamStats vindos do snapshot; times hipotéticos (trocas) usam evaluate()
+        return self._team_needs.get_or_compute(
+            (version, team_stats.team_id), lambda: self.gap_service.analyze_team_needs(team_stats)
+        )
+
+    def _evaluate_cached(
+        self,
+        version: Hashable,
+        player_analysis: PlayerAnalysisRecord,
+        team_stats: TeamStats
+    ) -> FitRecord:
+        key = (version, player_analysis.player_id, team_stats.team_id)
+        result = self._responses.get(key)
+        if result is None:
+            result = self._evaluate_and_store(key, version, player_analysis, team_stats)
+        return result
+
+    def _evaluate_and_store(
+        self,
+        key: Hashable,
+        version: Hashable,
+        player_analysis: PlayerAnalysisRecord,
+        team_stats: TeamStats
+    ) -> FitRecord:
+        team_needs = self._needs(version, team_stats)
+        friction_result = self.friction_service.analyze_friction(player_analysis, team_stats)
+        verdict = self.calculate_final_verdict(player_analysis, team_needs, friction_result)
+        result = self._build_response(player_analysis, team_stats, team_needs, friction_result, *verdict)
+        self._responses.put(key, result)
+        return result
+
+    def evaluate(self, player_analysis: PlayerAnalysisRecord, team_stats: TeamStats) -> FitRecord:
         team_needs = self.gap_service.analyze_team_needs(team_stats)
         friction_result = self.friction_service.analyze_friction(player_analysis, team_stats)
-        fit_score, fit_label, reasons = self._calculate_final_verdict(
+        fit_score, fit_label, reasons = self.calculate_final_verdict(
             player_analysis, team_needs, friction_result
         )
+        return self._build_response(
+            player_analysis, team_stats, team_needs, friction_result, fit_score, fit_label, reasons
+        )
 
-        return SimulationResponse(
-            player_id=player_id,
+    def _build_response(
+        self,
+        player_analysis: PlayerAnalysisRecord,
+        team_stats: TeamStats,
+        team_needs: TeamNeedsRecord,
+        friction_result: RosterFrictionRecord,
+        fit_score: int,
+        fit_label: FitLabel,
+        reasons: List[str]
+    ) -> FitRecord:
+        return FitRecord(
+            player_id=player_analysis.player_id,
             player_name=player_analysis.player_name,
-            team_id=team_id,
+            team_id=team_stats.team_id,
             team_name=team_stats.team_name,
             fit_score=fit_score,
             fit_label=fit_label,
@@ -52,7 +315,9 @@ class FitSimulator:
             friction_result=friction_result
         )
 
-    def _calculate_final_verdict(self, player, needs, friction):
+    @staticmethod
+    @timed("calculate_final_verdict")
+    def calculate_final_verdict(player, needs, friction):
         score = 75 # Base score
         reasons = []
 
@@ -93,7 +358,7 @@ class FitSimulator:
         return score, label, reasons
 
     def _create_error_response(self, pid, tid, msg):
-        return SimulationResponse(
+        return FitRecord(
             player_id=pid, player_name="Unknown", team_id=tid, team_name="Unknown",
-            fit_score=0, fit_label=FitLabel.BAD_FIT, reasons=[msg]
+            fit_score=0, fit_label=FitLabel.BAD_FIT, reasons=[msg], is_error=True
         )
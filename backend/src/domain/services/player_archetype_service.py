@@ -1,11 +1,29 @@
-from typing import List, Dict
-from src.schemas.analysis import PlayerAdvancedStats, PlayerAnalysis, PlayerArchetype
+from typing import List, Dict, Mapping, Any
+
+import numpy as np
+import pandas as pd
+
+from src.core.metrics import timed
+from src.domain.entities.analysis import PlayerAnalysisRecord, PlayerStatsRecord
+from src.schemas.analysis import PlayerArchetype
+
+# Ordem em que analyze_player adiciona os arquétipos à lista
+ARCHETYPE_ORDER = [
+    PlayerArchetype.SNIPER,
+    PlayerArchetype.BALL_DOMINANT,
+    PlayerArchetype.PLAYMAKER,
+    PlayerArchetype.RIM_PROTECTOR,
+    PlayerArchetype.HUSTLE,
+    PlayerArchetype.THREE_AND_D,
+    PlayerArchetype.STRETCH_BIG,
+]
 
 
 class PlayerArchetypeService:
     """Classifica jogadores em arquétipos baseado em estatísticas."""
 
-    def analyze_player(self, stats: PlayerAdvancedStats) -> PlayerAnalysis:
+    @timed("analyze_player")
+    def analyze_player(self, stats: PlayerStatsRecord) -> PlayerAnalysisRecord:
         archetypes = []
         scores = {}
 
@@ -100,7 +118,7 @@ class PlayerArchetypeService:
         is_elite_shooter = sniper_score >= 90
         is_defensive_anchor = rim_prot_score >= 90
 
-        return PlayerAnalysis(
+        return PlayerAnalysisRecord(
             player_id=stats.player_id,
             player_name=stats.player_name,
             position=stats.position,
@@ -113,3 +131,84 @@ class PlayerArchetypeService:
             per=stats.per,
             estimated_minutes=stats.min
         )
+
+    def analyze_league(self, league: Mapping[str, Any]) -> pd.DataFrame:
+        """Versão vetorizada de analyze_player para a liga inteira.
+
+        Recebe a LeagueDashPlayerStats (DataFrame ou dict de arrays, colunas em
+        maiúsculas) e retorna um DataFrame com o score de cada arquétipo (colunas
+        com o valor do enum) e as flags IS_BALL_DOMINANT, IS_ELITE_SHOOTER e
+        IS_DEFENSIVE_ANCHOR. Os thresholds são os mesmos do caminho escalar.
+        """
+        n = len(league['PLAYER_ID'])
+        fg3a = _column(league, 'FG3A', n)
+        fg3_pct = _column(league, 'FG3_PCT', n)
+        usg_pct = _column(league, 'USG_PCT', n, default=np.nan)
+        ast = _column(league, 'AST', n)
+        ast_pct = _column(league, 'AST_PCT', n, default=np.nan)
+        blk = _column(league, 'BLK', n)
+        stl = _column(league, 'STL', n)
+        reb = _column(league, 'REB', n)
+        oreb = _column(league, 'OREB', n)
+        # Posição nula (SQLite, jogador sem CommonPlayerInfo) equivale a vazia: não é pivô/ala
+        position = pd.Series(
+            league['POSITION'] if 'POSITION' in league else np.full(n, "", dtype=object), dtype="string"
+        )
+
+        sniper = np.where(
+            fg3a >= 5.0,
+            np.select([fg3_pct >= 0.40, fg3_pct >= 0.37, fg3_pct >= 0.35], [100, 85, 60], 0),
+            0
+        )
+
+        ball_dom = np.select([usg_pct >= 0.30, usg_pct >= 0.25, usg_pct >= 0.20], [100, 80, 50], 0)
+
+        playmaker = np.select([ast >= 8.0, ast >= 6.0, ast >= 4.0], [100, 85, 60], 0)
+        playmaker = np.where(ast_pct > 0.30, np.maximum(playmaker, 90), playmaker)
+
+        rim_prot = np.select([blk >= 2.0, blk >= 1.5, blk >= 1.0], [100, 85, 60], 0)
+
+        hustle = np.select(
+            [(reb >= 10.0) | (oreb >= 3.0), (reb >= 8.0) | (oreb >= 2.0), reb >= 6.0],
+            [100, 85, 60],
+            0
+        )
+
+        is_good_shooter = (fg3_pct >= 0.36) & (fg3a >= 3.0)
+        is_good_defender = (stl >= 1.0) | (blk >= 0.8)
+        three_d = np.select(
+            [is_good_shooter & is_good_defender, is_good_shooter & ((stl >= 0.8) | (blk >= 0.6))],
+            [90, 75],
+            0
+        )
+
+        is_big = position.str.contains("C|F", na=False).to_numpy(dtype=bool)
+        stretch = np.where(is_big & (fg3_pct >= 0.35) & (fg3a >= 2.0), 90, 0)
+
+        result = pd.DataFrame({
+            'PLAYER_ID': np.asarray(league['PLAYER_ID']),
+            PlayerArchetype.SNIPER.value: sniper,
+            PlayerArchetype.BALL_DOMINANT.value: ball_dom,
+            PlayerArchetype.PLAYMAKER.value: playmaker,
+            PlayerArchetype.RIM_PROTECTOR.value: rim_prot,
+            PlayerArchetype.HUSTLE.value: hustle,
+            PlayerArchetype.THREE_AND_D.value: three_d,
+            PlayerArchetype.STRETCH_BIG.value: stretch,
+            'IS_BALL_DOMINANT': ball_dom >= 80,
+            'IS_ELITE_SHOOTER': sniper >= 90,
+            'IS_DEFENSIVE_ANCHOR': rim_prot >= 90,
+        })
+        if isinstance(league, pd.DataFrame):
+            result.index = league.index
+        return result
+
+
+def archetypes_from_scores(scores: Mapping[str, Any]) -> List[PlayerArchetype]:
+    """Lista de arquétipos (score >= 80) de uma linha de analyze_league, na ordem do caminho escalar."""
+    return [a for a in ARCHETYPE_ORDER if scores[a.value] >= 80]
+
+
+def _column(league: Mapping[str, Any], name: str, n: int, default: float = 0.0) -> np.ndarray:
+    if name not in league:
+        return np.full(n, default, dtype=float)
+    return np.asarray(league[name], dtype=float)
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from src.schemas.analysis import TeamStats
+from src.domain.services.player_archetype_service import PlayerArchetypeService
+
+
+@dataclass(frozen=True)
+class TeamComposition:
+    """Jogadores de perfil marcante no elenco atual de um time."""
+
+    team_id: int
+    ball_dominant_ids: Tuple[int, ...] = ()
+    elite_shooter_ids: Tuple[int, ...] = ()
+    rim_anchor_ids: Tuple[int, ...] = ()
+
+    @property
+    def ball_dominant_count(self) -> int:
+        return len(self.ball_dominant_ids)
+
+    @property
+    def elite_shooter_count(self) -> int:
+        return len(self.elite_shooter_ids)
+
+    @property
+    def rim_anchor_count(self) -> int:
+        return len(self.rim_anchor_ids)
+
+
+class RosterCompositionIndex:
+    """Composição de todos os elencos da liga, pré-calculada.
+
+    As flags de cada jogador (ball dominant, arremessador de elite, protetor
+    de aro) saem de uma única passada vetorizada sobre a tabela da liga; cada
+    time guarda apenas os ids que as possuem. Quando um roster muda, só
+    aquele time é recalculado.
+    """
+
+    def __init__(
+        self,
+        season: str,
+        ball_dominant: FrozenSet[int],
+        elite_shooters: FrozenSet[int],
+        rim_anchors: FrozenSet[int]
+    ):
+        self.season = season
+        self._ball_dominant = ball_dominant
+        self._elite_shooters = elite_shooters
+        self._rim_anchors = rim_anchors
+        self._teams: Dict[int, TeamComposition] = {}
+        self._rosters: Dict[int, FrozenSet[int]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        season: str,
+        league: pd.DataFrame,
+        rosters: Mapping[int, Iterable[int]]
+    ) -> "RosterCompositionIndex":
+        flags = PlayerArchetypeService().analyze_league(league)
+        player_ids = flags['PLAYER_ID'].astype(int)
+        index = cls(
+            season,
+            ball_dominant=frozenset(player_ids[flags['IS_BALL_DOMINANT']]),
+            elite_shooters=frozenset(player_ids[flags['IS_ELITE_SHOOTER']]),
+            rim_anchors=frozenset(player_ids[flags['IS_DEFENSIVE_ANCHOR']])
+        )
+        for team_id, roster in rosters.items():
+            index.update_team(team_id, roster)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    def get(self, team_id: int) -> Optional[TeamComposition]:
+        return self._teams.get(team_id)
+
+    def update_team(self, team_id: int, player_ids: Iterable[int]) -> TeamComposition:
+        """Recalcula apenas um time; retorna a composição atual se o roster não mudou."""
+        roster = frozenset(int(pid) for pid in player_ids)
+        current = self._teams.get(team_id)
+        if current is not None and self._rosters.get(team_id) == roster:
+            return current
+
+        composition = TeamComposition(
+            team_id=team_id,
+            ball_dominant_ids=tuple(sorted(roster & self._ball_dominant)),
+            elite_shooter_ids=tuple(sorted(roster & self._elite_shooters)),
+            rim_anchor_ids=tuple(sorted(roster & self._rim_anchors))
+        )
+        # Cópias novas: leitores em outras threads nunca veem um dict pela metade
+        self._rosters = {**self._rosters, team_id: roster}
+        self._teams = {**self._teams, team_id: composition}
+        return composition
+
+    def apply(self, team_stats: TeamStats) -> TeamStats:
+        """TeamStats com os ball dominant reais do elenco (inalterado se o time não for conhecido).
+
+        Leva os ids junto com a contagem: ao avaliar um jogador contra o próprio
+        time, a fricção o desconta (ver RosterFrictionService).
+        """
+        composition = self._teams.get(team_stats.team_id)
+        if composition is None or composition.ball_dominant_ids == team_stats.ball_dominant_ids:
+            return team_stats
+        return team_stats.model_copy(update={
+            "ball_dominant_count": composition.ball_dominant_count,
+            "ball_dominant_ids": composition.ball_dominant_ids
+        })
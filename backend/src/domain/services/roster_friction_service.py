@@ -1,18 +1,23 @@
 from typing import List
-from src.schemas.analysis import PlayerAnalysis, TeamStats, RosterFrictionResult, RosterConflict
+from src.core.metrics import timed
+from src.domain.entities.analysis import PlayerAnalysisRecord, RosterConflictRecord, RosterFrictionRecord
+from src.schemas.analysis import TeamStats
 
 
 class RosterFrictionService:
     """Identifica conflitos de estilo entre jogador e elenco."""
 
-    def analyze_friction(self, player_analysis: PlayerAnalysis, team_stats: TeamStats) -> RosterFrictionResult:
+    @timed("analyze_friction")
+    def analyze_friction(self, player_analysis: PlayerAnalysisRecord, team_stats: TeamStats) -> RosterFrictionRecord:
         conflicts = []
         total_penalty = 0
         blocking_players = []
 
         if player_analysis.is_ball_dominant:
-            if team_stats.ball_dominant_count >= 2:
-                conflict = RosterConflict(
+            # Já no elenco, o jogador não disputa a bola consigo mesmo
+            others = team_stats.ball_dominant_count - int(player_analysis.player_id in team_stats.ball_dominant_ids)
+            if others >= 2:
+                conflict = RosterConflictRecord(
                     conflict_type="Too Many Cooks",
                     severity="high",
                     penalty_points=30,
@@ -21,8 +26,8 @@ class RosterFrictionService:
                 conflicts.append(conflict)
                 total_penalty += 30
                 blocking_players.append("Existing Stars")
-            elif team_stats.ball_dominant_count == 1:
-                conflict = RosterConflict(
+            elif others == 1:
+                conflict = RosterConflictRecord(
                     conflict_type="Usage Clash",
                     severity="medium",
                     penalty_points=15,
@@ -35,7 +40,7 @@ class RosterFrictionService:
         team_runs_fast = team_stats.pace_rank <= 5
         
         if is_heavy_center and team_runs_fast:
-            conflict = RosterConflict(
+            conflict = RosterConflictRecord(
                 conflict_type="Pace Mismatch",
                 severity="medium",
                 penalty_points=20,
@@ -54,7 +59,7 @@ class RosterFrictionService:
         else:
             suggested_role = "Perfect Fit"
 
-        return RosterFrictionResult(
+        return RosterFrictionRecord(
             total_penalty=total_penalty,
             conflicts=conflicts,
             suggested_role=suggested_role,
@@ -1,11 +1,14 @@
 from typing import List, Dict
-from src.schemas.analysis import TeamStats, TeamNeeds, TeamNeed
+from src.core.metrics import timed
+from src.domain.entities.analysis import TeamNeedsRecord
+from src.schemas.analysis import TeamStats, TeamNeed
 
 
 class TeamGapService:
     """Identifica lacunas e necessidades do time baseado em rankings."""
 
-    def analyze_team_needs(self, team_stats: TeamStats) -> TeamNeeds:
+    @timed("analyze_team_needs")
+    def analyze_team_needs(self, team_stats: TeamStats) -> TeamNeedsRecord:
         needs = []
         priorities = {}
         alerts = []
@@ -42,7 +45,7 @@ class TeamGapService:
 
         sorted_needs = sorted(needs, key=lambda n: priorities.get(n, 0), reverse=True)
 
-        return TeamNeeds(
+        return TeamNeedsRecord(
             team_id=team_stats.team_id,
             team_name=team_stats.team_name,
             needs=sorted_needs,
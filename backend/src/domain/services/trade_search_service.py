@@ -0,0 +1,511 @@
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any, AsyncIterator, Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Tuple
+)
+
+from src.infrastructure.external.league_tables import PlayerStatsTable, TeamRankTable
+from src.domain.entities.analysis import PlayerAnalysisRecord, PlayerStatsRecord, TeamNeedsRecord
+from src.schemas.analysis import PlayerArchetype, TeamNeed, TeamStats
+from src.domain.services.fit_simulator import FitSimulator
+from src.domain.services.player_archetype_service import PlayerArchetypeService
+from src.domain.services.roster_friction_service import RosterFrictionService
+from src.domain.services.team_gap_service import TeamGapService
+from src.domain.services.trade_simulator import LeagueDataError, apply_player_delta
+
+# Base e bônus por necessidade atendida, como em FitSimulator.calculate_final_verdict
+BASE_SCORE = 75
+NEED_BONUS = 15
+MAX_SCORE = 100
+
+# Necessidade -> arquétipos que a atendem no veredito
+NEED_ARCHETYPES: Dict[TeamNeed, FrozenSet[PlayerArchetype]] = {
+    TeamNeed.SHOOTING: frozenset({PlayerArchetype.SNIPER, PlayerArchetype.STRETCH_BIG}),
+    TeamNeed.RIM_PROTECTION: frozenset({PlayerArchetype.RIM_PROTECTOR}),
+    TeamNeed.PLAYMAKING: frozenset({PlayerArchetype.PLAYMAKER}),
+}
+
+
+@dataclass(frozen=True)
+class TradeCandidate:
+    """Troca em que o time alvo recebe um jogador e cede um ou dois ao parceiro."""
+
+    incoming_player_id: int
+    partner_team_id: int
+    outgoing_player_ids: Tuple[int, ...]
+    target_fit: int
+    partner_fit: float
+
+    @property
+    def combined_fit(self) -> float:
+        return self.target_fit + self.partner_fit
+
+
+@dataclass
+class TradeSearchUpdate:
+    """Estado parcial da busca: melhores trocas até agora e progresso."""
+
+    candidates: List[TradeCandidate]
+    evaluated: int
+    pruned: int
+    completed_chunks: int
+    total_chunks: int
+    seconds: float
+    done: bool = False
+
+    @property
+    def candidates_per_second(self) -> float:
+        return self.evaluated / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class TradeSearchContext:
+    """Tudo que um worker precisa para avaliar trocas sem acessar a NBA API."""
+
+    target_team_id: int
+    rank_table: TeamRankTable
+    rows: Dict[int, Dict[str, Any]]
+    stats: Dict[int, PlayerStatsRecord]
+    ball_dominant_counts: Dict[int, int]
+    outgoing_combos: List[Tuple[int, ...]]
+    limit: int
+    position: Optional[str] = None
+    min_minutes: float = 0.0
+    max_minutes_gap: float = 8.0
+
+    def partners(self) -> List[int]:
+        return sorted({
+            int(row['TEAM_ID']) for row in self.rows.values()
+            if int(row['TEAM_ID']) != self.target_team_id
+        })
+
+    def for_partner(self, partner_team_id: int) -> "TradeSearchContext":
+        """Só o que o lote de um parceiro lê: elencos do alvo e do parceiro, não a liga inteira."""
+        teams = (self.target_team_id, partner_team_id)
+        rows = {pid: row for pid, row in self.rows.items() if int(row['TEAM_ID']) in teams}
+        return replace(
+            self,
+            rows=rows,
+            stats={pid: self.stats[pid] for pid in rows},
+            ball_dominant_counts={t: self.ball_dominant_counts.get(t, 0) for t in teams}
+        )
+
+
+@dataclass
+class _ChunkResult:
+    candidates: List[TradeCandidate] = field(default_factory=list)
+    evaluated: int = 0
+    pruned: int = 0
+
+
+class TradeSearchService:
+    """Busca trocas 1-por-1 e 2-por-1 que maximizam o encaixe combinado.
+
+    Para cada jogador da liga que o time alvo poderia receber, testa pacotes de
+    um ou dois jogadores do próprio elenco enviados ao time dele. A pontuação é
+    o fit_score do recebido no alvo mais o fit médio dos cedidos no parceiro.
+
+    Branch and bound: o veredito nunca passa de 75 + 15 por necessidade que os
+    arquétipos do jogador podem atender, então cada candidato tem um teto
+    calculado sem simular nada. Candidatos são visitados em ordem decrescente
+    de teto e a busca para assim que o teto não supera a k-ésima melhor troca.
+    Os times parceiros são divididos entre processos e cada lote concluído
+    gera uma atualização com as melhores trocas encontradas até ali.
+    """
+
+    def __init__(self, fit_simulator: Optional[FitSimulator] = None):
+        self.fit_simulator = fit_simulator or FitSimulator()
+        self.nba_client = self.fit_simulator.nba_client
+        self.async_client = self.fit_simulator.async_client
+        # Pool de processos compartilhado entre as buscas: spawn custa caro demais por requisição
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    async def search_stream(
+        self,
+        target_team_id: int,
+        limit: int = 10,
+        position: Optional[str] = None,
+        min_minutes: float = 15.0,
+        max_minutes_gap: float = 8.0,
+        max_outgoing: int = 2,
+        workers: Optional[int] = None
+    ) -> AsyncIterator[TradeSearchUpdate]:
+        """Atualizações da busca à medida que os lotes terminam.
+
+        ValueError se o time não existir; LeagueDataError se a tabela de
+        jogadores não tiver TEAM_ID. Os lotes são futures acompanhados pelo
+        event loop: se o cliente desistir, os que ainda não começaram são
+        cancelados e o pool segue disponível para as próximas buscas.
+        """
+        player_table, rank_table = await asyncio.gather(
+            self.async_client.get_player_stats_table(),
+            self.async_client.get_team_rank_table()
+        )
+        context = self.build_context(
+            target_team_id, player_table, rank_table, limit,
+            position=position, min_minutes=min_minutes,
+            max_minutes_gap=max_minutes_gap, max_outgoing=max_outgoing
+        )
+        partners = context.partners()
+        progress = _SearchProgress(context.limit, len(partners))
+        if not partners:
+            yield progress.finished()
+            return
+
+        loop = asyncio.get_running_loop()
+        workers = _worker_count(workers, partners)
+        if workers == 1:
+            for partner in partners:
+                result = await loop.run_in_executor(
+                    None, _search_partner, context, partner, progress.threshold()
+                )
+                yield progress.merge(result)
+            return
+
+        pool = self._process_pool(workers)
+        pending: Set["asyncio.Future[_ChunkResult]"] = set()
+        queue = iter(partners)
+        try:
+            while True:
+                # Lotes novos partem do melhor limite conhecido no momento do envio
+                while len(pending) < workers * 2:
+                    partner = next(queue, None)
+                    if partner is None:
+                        break
+                    pending.add(asyncio.wrap_future(pool.submit(
+                        _search_partner, context.for_partner(partner), partner, progress.threshold()
+                    )))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield progress.merge(future.result())
+        except BrokenProcessPool:
+            # Um worker morreu: a próxima busca sobe um pool novo
+            self._discard_pool(pool)
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Encerra o pool de processos sem esperar lotes em andamento."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _process_pool(self, workers: int) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: seguro mesmo quando chamado a partir de threads do servidor
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def search(self, target_team_id: int, **kwargs: Any) -> TradeSearchUpdate:
+        final = None
+        async for update in self.search_stream(target_team_id, **kwargs):
+            final = update
+        return final
+
+    def build_context(
+        self,
+        target_team_id: int,
+        player_table: PlayerStatsTable,
+        rank_table: TeamRankTable,
+        limit: int,
+        position: Optional[str] = None,
+        min_minutes: float = 0.0,
+        max_minutes_gap: float = 8.0,
+        max_outgoing: int = 2
+    ) -> TradeSearchContext:
+        if rank_table.get(target_team_id) is None:
+            raise ValueError(f"Time {target_team_id} não encontrado.")
+
+        df = player_table.df
+        if 'TEAM_ID' not in df.columns or df['TEAM_ID'].isna().any():
+            # Sem o time de cada jogador não há elencos: erro dos dados, não "nenhuma troca"
+            raise LeagueDataError("Tabela de jogadores sem TEAM_ID: elencos não podem ser montados.")
+        # Jogadores sem time da liga (ex.: TEAM_ID 0) ficam de fora
+        rows = {
+            int(row['PLAYER_ID']): row
+            for row in df.to_dict('records')
+            if rank_table.get(int(row['TEAM_ID'])) is not None
+        }
+        roster = sorted(pid for pid, row in rows.items() if int(row['TEAM_ID']) == target_team_id)
+        combos: List[Tuple[int, ...]] = []
+        for size in range(1, max(1, min(max_outgoing, 2)) + 1):
+            combos.extend(itertools.combinations(roster, size))
+
+        counts = {}
+        for team in rank_table.all():
+            composition = self.nba_client.get_roster_composition(team.team_id)
+            counts[team.team_id] = composition.ball_dominant_count if composition is not None else 0
+
+        return TradeSearchContext(
+            target_team_id=target_team_id,
+            rank_table=rank_table,
+            rows=rows,
+            stats={pid: player_table.get_stats(pid) for pid in rows},
+            ball_dominant_counts=counts,
+            outgoing_combos=combos,
+            limit=limit,
+            position=position.upper() if position else None,
+            min_minutes=min_minutes,
+            max_minutes_gap=max_minutes_gap
+        )
+
+
+class _SearchProgress:
+    """Top-k global e contadores, atualizados a cada lote concluído."""
+
+    def __init__(self, limit: int, total_chunks: int):
+        self.limit = limit
+        self.total_chunks = total_chunks
+        self.started = time.perf_counter()
+        self.best: List[Tuple[float, int, TradeCandidate]] = []
+        self.sequence = itertools.count()
+        self.evaluated = self.pruned = self.completed = 0
+
+    def threshold(self) -> float:
+        return self.best[0][0] if len(self.best) >= self.limit else float("-inf")
+
+    def merge(self, result: _ChunkResult) -> TradeSearchUpdate:
+        self.evaluated += result.evaluated
+        self.pruned += result.pruned
+        self.completed += 1
+        for candidate in result.candidates:
+            _push(self.best, (candidate.combined_fit, -next(self.sequence), candidate), self.limit)
+        return TradeSearchUpdate(
+            candidates=_ranked(self.best),
+            evaluated=self.evaluated,
+            pruned=self.pruned,
+            completed_chunks=self.completed,
+            total_chunks=self.total_chunks,
+            seconds=time.perf_counter() - self.started,
+            done=self.completed == self.total_chunks
+        )
+
+    def finished(self) -> TradeSearchUpdate:
+        return TradeSearchUpdate([], 0, 0, 0, 0, time.perf_counter() - self.started, done=True)
+
+
+def search_trades(
+    context: TradeSearchContext,
+    workers: Optional[int] = None,
+    pool: Optional[ProcessPoolExecutor] = None
+) -> Iterator[TradeSearchUpdate]:
+    """Versão síncrona da busca, uma atualização por lote (time parceiro) concluído.
+
+    Sem `pool`, um pool temporário é criado quando houver mais de um worker.
+    """
+    partners = context.partners()
+    progress = _SearchProgress(context.limit, len(partners))
+    if not partners:
+        yield progress.finished()
+        return
+
+    workers = _worker_count(workers, partners)
+    if workers == 1:
+        for partner in partners:
+            yield progress.merge(_search_partner(context, partner, progress.threshold()))
+        return
+
+    owned = pool is None
+    if owned:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: Set["Future[_ChunkResult]"] = set()
+    queue = iter(partners)
+    try:
+        while True:
+            while len(pending) < workers * 2:
+                partner = next(queue, None)
+                if partner is None:
+                    break
+                pending.add(pool.submit(
+                    _search_partner, context.for_partner(partner), partner, progress.threshold()
+                ))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield progress.merge(future.result())
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _worker_count(workers: Optional[int], partners: Sequence[int]) -> int:
+    return max(1, min(workers or os.cpu_count() or 1, len(partners) or 1))
+
+
+def _search_partner(context: TradeSearchContext, partner_team_id: int, threshold: float) -> _ChunkResult:
+    # Executado nos processos do pool: cada worker instancia seus próprios serviços
+    archetype_service = PlayerArchetypeService()
+    gap_service = TeamGapService()
+    friction_service = RosterFrictionService()
+    result = _ChunkResult()
+    rows = context.rows
+    target_id = context.target_team_id
+
+    analyses: Dict[int, PlayerAnalysisRecord] = {}
+
+    def analysis_of(player_id: int) -> PlayerAnalysisRecord:
+        if player_id not in analyses:
+            analyses[player_id] = archetype_service.analyze_player(context.stats[player_id])
+        return analyses[player_id]
+
+    # Alvo depois que cada pacote sai: stats, necessidades e teto de quem chega
+    target_states: Dict[Tuple[int, ...], Tuple[TeamStats, TeamNeedsRecord]] = {}
+    possible_needs: Set[TeamNeed] = set()
+    for combo in context.outgoing_combos:
+        leaving_dominant = sum(1 for pid in combo if analysis_of(pid).is_ball_dominant)
+        stats = _team_without(context, target_id, combo, leaving_dominant)
+        needs = gap_service.analyze_team_needs(stats)
+        target_states[combo] = (stats, needs)
+        possible_needs.update(needs.needs)
+
+    combo_ceilings = sorted(
+        (
+            (sum(_ceiling(analysis_of(pid), NEED_ARCHETYPES) for pid in combo) / len(combo), combo)
+            for combo in context.outgoing_combos
+        ),
+        key=lambda item: -item[0]
+    )
+    best_combo_ceiling = combo_ceilings[0][0] if combo_ceilings else 0
+
+    incoming = []
+    for pid, row in rows.items():
+        if int(row['TEAM_ID']) != partner_team_id:
+            continue
+        if _number(row, 'MIN') < context.min_minutes:
+            continue
+        if context.position and context.position not in (row.get('POSITION') or ""):
+            continue
+        analysis = analysis_of(pid)
+        ceiling = _ceiling(analysis, {n: NEED_ARCHETYPES[n] for n in possible_needs if n in NEED_ARCHETYPES})
+        incoming.append((ceiling, pid))
+    incoming.sort(key=lambda item: -item[0])
+
+    local: List[Tuple[float, int, TradeCandidate]] = []
+    sequence = itertools.count()
+
+    def current_threshold() -> float:
+        local_bound = local[0][0] if len(local) >= context.limit else float("-inf")
+        return max(threshold, local_bound)
+
+    for index, (ceiling_in, pid) in enumerate(incoming):
+        if ceiling_in + best_combo_ceiling <= current_threshold():
+            # Ordenados por teto: nenhum dos restantes pode entrar no top-k
+            result.pruned += (len(incoming) - index) * len(combo_ceilings)
+            break
+
+        analysis_in = analysis_of(pid)
+        minutes_in = _number(rows[pid], 'MIN')
+        partner_state = None
+
+        for rank, (ceiling_out, combo) in enumerate(combo_ceilings):
+            if ceiling_in + ceiling_out <= current_threshold():
+                result.pruned += len(combo_ceilings) - rank
+                break
+            if abs(minutes_in - sum(_number(rows[o], 'MIN') for o in combo)) > context.max_minutes_gap:
+                continue
+
+            target_stats, target_needs = target_states[combo]
+            target_fit = _fit(friction_service, analysis_in, target_stats, target_needs)
+            if partner_state is None:
+                partner_state = _partner_without(context, partner_team_id, pid, analysis_in, gap_service)
+            partner_stats, partner_needs = partner_state
+            partner_fit = sum(
+                _fit(friction_service, analysis_of(o), partner_stats, partner_needs) for o in combo
+            ) / len(combo)
+            result.evaluated += 1
+
+            candidate = TradeCandidate(
+                incoming_player_id=pid,
+                partner_team_id=partner_team_id,
+                outgoing_player_ids=combo,
+                target_fit=target_fit,
+                partner_fit=round(partner_fit, 2)
+            )
+            _push(local, (candidate.combined_fit, -next(sequence), candidate), context.limit)
+
+    result.candidates = [item[2] for item in local]
+    return result
+
+
+def _ceiling(analysis: PlayerAnalysisRecord, need_archetypes: Dict[TeamNeed, FrozenSet[PlayerArchetype]]) -> int:
+    """Maior fit_score possível: cada necessidade atendível soma 15, a fricção só subtrai."""
+    archetypes = set(analysis.archetypes)
+    met = sum(1 for options in need_archetypes.values() if archetypes & options)
+    return min(MAX_SCORE, BASE_SCORE + NEED_BONUS * met)
+
+
+def _fit(
+    friction_service: RosterFrictionService,
+    analysis: PlayerAnalysisRecord,
+    team_stats: TeamStats,
+    team_needs: TeamNeedsRecord
+) -> int:
+    friction = friction_service.analyze_friction(analysis, team_stats)
+    return FitSimulator.calculate_final_verdict(analysis, team_needs, friction)[0]
+
+
+def _team_without(
+    context: TradeSearchContext,
+    team_id: int,
+    player_ids: Sequence[int],
+    leaving_dominant: int
+) -> TeamStats:
+    values = context.rank_table.aggregates(team_id)
+    for pid in player_ids:
+        apply_player_delta(values, context.rows[pid], -1)
+    stats = context.rank_table.rerank({team_id: values})[team_id]
+    count = max(0, context.ball_dominant_counts.get(team_id, 0) - leaving_dominant)
+    return stats.model_copy(update={"ball_dominant_count": count})
+
+
+def _partner_without(
+    context: TradeSearchContext,
+    partner_team_id: int,
+    player_id: int,
+    analysis: PlayerAnalysisRecord,
+    gap_service: TeamGapService
+) -> Tuple[TeamStats, TeamNeedsRecord]:
+    stats = _team_without(context, partner_team_id, [player_id], int(analysis.is_ball_dominant))
+    return stats, gap_service.analyze_team_needs(stats)
+
+
+def _push(heap: List[Tuple[float, int, TradeCandidate]], item: Tuple[float, int, TradeCandidate], limit: int) -> None:
+    if len(heap) < limit:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def _ranked(heap: List[Tuple[float, int, TradeCandidate]]) -> List[TradeCandidate]:
+    return [item[2] for item in sorted(heap, reverse=True)]
+
+
+def _number(row: Dict[str, Any], column: str) -> float:
+    value = row.get(column)
+    return 0.0 if value is None or value != value else float(value)
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.infrastructure.external.league_tables import PlayerStatsTable, TeamRankTable
+from src.domain.entities.analysis import PlayerAnalysisRecord
+from src.schemas.analysis import TeamStats
+from src.schemas.simulation import SimulationResponse, TradeMove, TradeSimulationResponse, TradeTeamImpact
+from src.domain.services.fit_simulator import FitSimulator
+
+
+class LeagueDataError(RuntimeError):
+    """Tabela da liga sem um dado de que a troca depende: erro dos dados, não do pedido."""
+
+
+class TradeSimulator:
+    """Simula trocas com vários jogadores entre dois ou mais times.
+
+    Nada é baixado nem reordenado: os agregados por jogo de cada time envolvido
+    recebem os deltas de quem sai e de quem chega (REB, AST e 3P% via
+    FG3M/FG3A) e os rankings novos saem de TeamRankTable.rerank. PACE e
+    ratings são métricas de time, não somas de jogadores, e ficam como estão.
+    """
+
+    def __init__(self, fit_simulator: Optional[FitSimulator] = None):
+        self.fit_simulator = fit_simulator or FitSimulator()
+        self.nba_client = self.fit_simulator.nba_client
+        self.async_client = self.fit_simulator.async_client
+        self.archetype_service = self.fit_simulator.archetype_service
+        self.gap_service = self.fit_simulator.gap_service
+
+    async def simulate_trade(self, moves: Sequence[TradeMove]) -> TradeSimulationResponse:
+        """Levanta ValueError se a troca for inválida (times/jogadores inexistentes ou inconsistentes).
+
+        LeagueDataError se a tabela da liga não tiver TEAM_ID ou os totais de 3 pontos.
+        """
+        started = time.perf_counter()
+        player_table, rank_table = await asyncio.gather(
+            self.async_client.get_player_stats_table(),
+            self.async_client.get_team_rank_table()
+        )
+        outgoing, incoming = self._group_moves(moves, player_table, rank_table)
+        team_ids = list(dict.fromkeys([m.from_team_id for m in moves] + [m.to_team_id for m in moves]))
+
+        analyses: Dict[int, PlayerAnalysisRecord] = {
+            m.player_id: self.archetype_service.analyze_player(player_table.get_stats(m.player_id))
+            for m in moves
+        }
+        before: Dict[int, TeamStats] = {}
+        after_counts: Dict[int, int] = {}
+        aggregates: Dict[int, Dict[str, float]] = {}
+        for team_id in team_ids:
+            composition = self.nba_client.get_roster_composition(team_id)
+            count = composition.ball_dominant_count if composition is not None else 0
+            before[team_id] = rank_table.get(team_id).model_copy(update={"ball_dominant_count": count})
+
+            leaving = outgoing.get(team_id, [])
+            arriving = incoming.get(team_id, [])
+            if composition is not None:
+                leaving_dominant = sum(1 for pid in leaving if pid in composition.ball_dominant_ids)
+            else:
+                leaving_dominant = sum(1 for pid in leaving if analyses[pid].is_ball_dominant)
+            arriving_dominant = sum(1 for pid in arriving if analyses[pid].is_ball_dominant)
+            after_counts[team_id] = max(0, count - leaving_dominant + arriving_dominant)
+
+            values = rank_table.aggregates(team_id)
+            for pid in leaving:
+                apply_player_delta(values, player_table.get(pid), -1)
+            for pid in arriving:
+                apply_player_delta(values, player_table.get(pid), +1)
+            aggregates[team_id] = values
+
+        after = {
+            team_id: stats.model_copy(update={"ball_dominant_count": after_counts[team_id]})
+            for team_id, stats in rank_table.rerank(aggregates).items()
+        }
+
+        incoming_results = []
+        for move in moves:
+            # O jogador é avaliado contra o time pós-troca sem ele mesmo
+            analysis = analyses[move.player_id]
+            without = dict(aggregates[move.to_team_id])
+            apply_player_delta(without, player_table.get(move.player_id), -1)
+            team_stats = rank_table.rerank({**aggregates, move.to_team_id: without})[move.to_team_id]
+            team_stats = team_stats.model_copy(update={
+                "ball_dominant_count": max(0, after_counts[move.to_team_id] - int(analysis.is_ball_dominant))
+            })
+            incoming_results.append(
+                SimulationResponse.from_record(self.fit_simulator.evaluate(analysis, team_stats))
+            )
+
+        teams = [
+            TradeTeamImpact(
+                team_id=team_id,
+                team_name=before[team_id].team_name,
+                outgoing_player_ids=outgoing.get(team_id, []),
+                incoming_player_ids=incoming.get(team_id, []),
+                stats_before=before[team_id],
+                stats_after=after[team_id],
+                needs_before=[n.value for n in self.gap_service.analyze_team_needs(before[team_id]).needs],
+                needs_after=[n.value for n in self.gap_service.analyze_team_needs(after[team_id]).needs]
+            )
+            for team_id in team_ids
+        ]
+        return TradeSimulationResponse(
+            teams=teams,
+            incoming=incoming_results,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+
+    @staticmethod
+    def _group_moves(
+        moves: Sequence[TradeMove],
+        player_table: PlayerStatsTable,
+        rank_table: TeamRankTable
+    ) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+        outgoing: Dict[int, List[int]] = {}
+        incoming: Dict[int, List[int]] = {}
+        seen = set()
+        for move in moves:
+            if move.player_id in seen:
+                raise ValueError(f"Jogador {move.player_id} aparece mais de uma vez na troca.")
+            seen.add(move.player_id)
+            if move.from_team_id == move.to_team_id:
+                raise ValueError(f"Jogador {move.player_id} não muda de time.")
+            for team_id in (move.from_team_id, move.to_team_id):
+                if rank_table.get(team_id) is None:
+                    raise ValueError(f"Time {team_id} não encontrado.")
+            row = player_table.get(move.player_id)
+            if row is None:
+                raise ValueError(f"Jogador {move.player_id} não encontrado.")
+            current_team = row.get('TEAM_ID')
+            if current_team is None or current_team != current_team:
+                raise LeagueDataError(f"Jogador {move.player_id} sem TEAM_ID na tabela da liga.")
+            if int(current_team) != move.from_team_id:
+                raise ValueError(f"Jogador {move.player_id} não joga no time {move.from_team_id}.")
+            outgoing.setdefault(move.from_team_id, []).append(move.player_id)
+            incoming.setdefault(move.to_team_id, []).append(move.player_id)
+        return outgoing, incoming
+
+
+def apply_player_delta(values: Dict[str, float], row: Dict[str, Any], sign: int) -> None:
+    """Soma (sign=+1) ou remove (sign=-1) a produção por jogo de um jogador dos agregados do time.
+
+    Levanta LeagueDataError se os agregados não tiverem FG3A/FG3M: sem eles o
+    3P% do time ficaria com o valor de antes da troca.
+    """
+    missing = [c for c in ('FG3A', 'FG3M') if values.get(c) is None or values[c] != values[c]]
+    if missing:
+        raise LeagueDataError(f"Agregados do time sem {', '.join(missing)}: 3P% não pode ser recalculado.")
+    for column in ('REB', 'AST'):
+        if column in values:
+            values[column] += sign * _number(row, column)
+    fg3a = _number(row, 'FG3A')
+    fg3m = _number(row, 'FG3M') if 'FG3M' in row else fg3a * _number(row, 'FG3_PCT')
+    values['FG3A'] += sign * fg3a
+    values['FG3M'] += sign * fg3m
+    if values['FG3A'] > 0:
+        values['FG3_PCT'] = values['FG3M'] / values['FG3A']
+
+
+def _number(row: Dict[str, Any], column: str) -> float:
+    value = row.get(column)
+    return 0.0 if value is None or value != value else float(value)
@@ -1,6 +1,9 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import UniqueConstraint, create_engine, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from typing import AsyncGenerator, Dict, FrozenSet, List, Set
 
 from src.core.config import get_settings
 
@@ -19,6 +22,16 @@ engine = create_async_engine(
     future=True
 )
 
+# Engine síncrona para acessos feitos a partir de threads de I/O
+# (ex.: loaders do cache de temporada, que já rodam fora do event loop)
+sync_engine = create_engine(
+    settings.database_url.replace("+aiosqlite", ""),
+    echo=settings.debug,
+    future=True
+)
+
+sync_session_maker = sessionmaker(sync_engine, expire_on_commit=False)
+
 # Session factory assíncrona
 async_session_maker = async_sessionmaker(
     engine,
@@ -42,7 +55,70 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+# Tabelas que são só cópia da NBA API: podem ser esvaziadas e baixadas de novo
+CACHE_TABLES = frozenset({'players', 'teams'})
+
+
 async def init_db() -> None:
-    """Cria todas as tabelas no banco"""
+    """Cria todas as tabelas no banco e atualiza as existentes (ver migrate_schema)"""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(migrate_schema)
+
+
+@dataclass
+class SchemaMigration:
+    """O que migrate_schema mudou: colunas acrescentadas e tabelas de cache recriadas."""
+    added: Dict[str, List[str]] = field(default_factory=dict)
+    rebuilt: List[str] = field(default_factory=list)
+
+
+def migrate_schema(conn) -> SchemaMigration:
+    """Leva ao schema dos models um banco criado por uma versão anterior.
+
+    create_all só cria tabelas inexistentes. Tabelas de cache cujas colunas ou
+    restrições UNIQUE diferem dos models são apagadas e recriadas: o UPSERT
+    depende de UNIQUE(nba_id, season) e SQLite não troca restrições com ALTER
+    TABLE; além disso, linhas antigas ainda dentro do TTL seriam servidas como
+    frescas sem os valores novos. As demais tabelas só ganham as colunas que
+    faltam (ALTER TABLE ADD COLUMN), preservando as linhas.
+    """
+    inspector = inspect(conn)
+    migration = SchemaMigration()
+    # Filhas antes das mães: players referencia teams
+    for table in reversed(Base.metadata.sorted_tables):
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        if table.name in CACHE_TABLES:
+            if missing or _unique_sets(inspector, table.name) != _model_unique_sets(table):
+                table.drop(conn)
+                table.create(conn)
+                migration.rebuilt.append(table.name)
+            continue
+        for column in missing:
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            migration.added.setdefault(table.name, []).append(column.name)
+        for index in table.indexes:
+            if any(column in missing for column in index.columns):
+                index.create(conn, checkfirst=True)
+    return migration
+
+
+def _unique_sets(inspector, table_name: str) -> Set[FrozenSet[str]]:
+    """Conjuntos de colunas com UNIQUE no banco (restrições e índices únicos)."""
+    constraints = inspector.get_unique_constraints(table_name)
+    indexes = [index for index in inspector.get_indexes(table_name) if index.get('unique')]
+    return {frozenset(item['column_names']) for item in constraints + indexes}
+
+
+def _model_unique_sets(table) -> Set[FrozenSet[str]]:
+    sets = {
+        frozenset(column.name for column in constraint.columns)
+        for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+    }
+    sets |= {frozenset(column.name for column in index.columns) for index in table.indexes if index.unique}
+    sets |= {frozenset([column.name]) for column in table.columns if column.unique}
+    return sets
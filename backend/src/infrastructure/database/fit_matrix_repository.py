@@ -0,0 +1,40 @@
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.services.fit_matrix_service import FitMatrix
+from src.infrastructure.database.connection import async_session_maker
+from src.infrastructure.database.models import FitMatrixModel
+
+
+class FitMatrixRepository:
+    """Persiste a matriz de encaixe na tabela fit_matrix, uma temporada por vez."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession] = async_session_maker):
+        self._session_maker = session_maker
+
+    async def save(self, matrix: FitMatrix) -> None:
+        """Substitui a matriz da temporada numa única transação."""
+        async with self._session_maker() as session:
+            async with session.begin():
+                await session.execute(
+                    delete(FitMatrixModel).where(FitMatrixModel.season == matrix.season)
+                )
+                await session.execute(insert(FitMatrixModel), list(matrix.to_records()))
+
+    async def load(self, season: str) -> Optional[FitMatrix]:
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(
+                    FitMatrixModel.player_id,
+                    FitMatrixModel.team_id,
+                    FitMatrixModel.fit_score,
+                    FitMatrixModel.fit_label,
+                    FitMatrixModel.projected_role,
+                    FitMatrixModel.computed_at,
+                    FitMatrixModel.source_version
+                ).where(FitMatrixModel.season == season)
+            )
+            records = [dict(row._mapping) for row in result]
+        return FitMatrix.from_records(season, records)
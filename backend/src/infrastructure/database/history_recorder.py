@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from src.core.config import get_settings
+from src.infrastructure.database.history_repository import SimulationHistoryRepository
+from src.domain.entities.analysis import FitRecord
+from src.schemas.simulation import SimulationResponse
+
+logger = logging.getLogger(__name__)
+
+# Sentinela enfileirada no shutdown: o worker grava o lote atual e encerra
+_STOP = object()
+
+
+class SimulationHistoryRecorder:
+    """Registra simulações no histórico sem que a requisição espere pelo SQLite.
+
+    As simulações entram numa fila em memória; uma task de fundo grava lotes
+    quando atinge `batch_size` itens ou quando `flush_interval` expira. Com a
+    fila cheia, o produtor espera até `enqueue_timeout` e então descarta o item.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[SimulationHistoryRepository] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        enqueue_timeout: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.repository = repository or SimulationHistoryRepository()
+        self.queue_size = queue_size or settings.history_queue_size
+        self.batch_size = batch_size or settings.history_batch_size
+        self.flush_interval = flush_interval or settings.history_flush_interval_seconds
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else settings.history_enqueue_timeout_seconds
+        self.recorded = 0
+        self.dropped = 0
+        self.failed = 0
+        self.skipped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Grava tudo o que está na fila e encerra a task de fundo."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._worker
+        self._worker = None
+
+    async def record(self, result: Union[FitRecord, SimulationResponse]) -> bool:
+        """Enfileira a simulação; retorna False se ela foi descartada.
+
+        Resultados de erro (jogador/time sem dados) não são simulações e ficam de fora.
+        """
+        if not self.running:
+            return False
+        if getattr(result, "is_error", False):
+            self.skipped += 1
+            return False
+        row = _to_row(result)
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(row), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                return False
+        return True
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await self.repository.insert_many(batch)
+            self.recorded += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error("Erro ao gravar %s simulações: %s", len(batch), e)
+
+
+def _to_row(result: Union[FitRecord, SimulationResponse]) -> Dict[str, Any]:
+    return {
+        "player_id": result.player_id,
+        "team_id": result.team_id,
+        "fit_score": result.fit_score,
+        "veredito": result.fit_label.value,
+        "minutagem_estimada": result.estimated_minutes,
+        "explicacao": " | ".join(result.reasons)[:500],
+        "created_at": datetime.utcnow()
+    }
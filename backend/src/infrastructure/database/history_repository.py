@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.database.connection import async_session_maker
+from src.infrastructure.database.models import SimulationHistoryModel
+
+
+class SimulationHistoryRepository:
+    """Acesso à tabela simulation_history."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession] = async_session_maker):
+        self._session_maker = session_maker
+
+    async def insert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Grava o lote com um único INSERT multi-row."""
+        if not rows:
+            return
+        async with self._session_maker() as session:
+            async with session.begin():
+                await session.execute(insert(SimulationHistoryModel).values(rows))
+
+    async def list_page(
+        self,
+        limit: int,
+        player_id: Optional[int] = None,
+        team_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> List[SimulationHistoryModel]:
+        """Página do histórico, mais recentes primeiro (keyset em created_at, id)."""
+        model = SimulationHistoryModel
+        query = select(model)
+        if player_id is not None:
+            query = query.where(model.player_id == player_id)
+        if team_id is not None:
+            query = query.where(model.team_id == team_id)
+        if before is not None:
+            created_at, last_id = before
+            query = query.where(or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < last_id)
+            ))
+        query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+        async with self._session_maker() as session:
+            result = await session.execute(query)
+            return list(result.scalars())
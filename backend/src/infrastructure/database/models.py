@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,15 +6,37 @@ from src.infrastructure.database.connection import Base
 
 
 class PlayerModel(Base):
-    """Model para cache de dados de jogadores"""
+    """Model para cache de dados de jogadores (uma linha por jogador e temporada)"""
     __tablename__ = 'players'
+    __table_args__ = (UniqueConstraint('nba_id', 'season', name='uq_players_nba_id_season'),)
 
     id = Column(Integer, primary_key=True, index=True)
-    nba_id = Column(Integer, unique=True, index=True, nullable=False)
+    nba_id = Column(Integer, index=True, nullable=False)
+    season = Column(String(10), index=True, nullable=False)
     name = Column(String(100), index=True, nullable=False)
     position = Column(String(20))
     per = Column(Float)
     team_id = Column(Integer, ForeignKey('teams.id'), nullable=True)
+    # TEAM_ID da NBA API (team_id acima aponta para a linha interna de teams)
+    nba_team_id = Column(Integer, index=True)
+
+    # Stats por jogo (LeagueDashPlayerStats)
+    min = Column(Float)
+    pts = Column(Float)
+    fga = Column(Float)
+    fg_pct = Column(Float)
+    fg3m = Column(Float)
+    fg3a = Column(Float)
+    fg3_pct = Column(Float)
+    ast = Column(Float)
+    tov = Column(Float)
+    reb = Column(Float)
+    oreb = Column(Float)
+    blk = Column(Float)
+    stl = Column(Float)
+    usg_pct = Column(Float)
+    ast_pct = Column(Float)
+
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relacionamento
@@ -22,16 +44,30 @@ class PlayerModel(Base):
 
 
 class TeamModel(Base):
-    """Model para cache de dados de times"""
+    """Model para cache de dados de times (uma linha por time e temporada)"""
     __tablename__ = 'teams'
+    __table_args__ = (UniqueConstraint('nba_id', 'season', name='uq_teams_nba_id_season'),)
 
     id = Column(Integer, primary_key=True, index=True)
-    nba_id = Column(Integer, unique=True, index=True, nullable=False)
+    nba_id = Column(Integer, index=True, nullable=False)
+    season = Column(String(10), index=True, nullable=False)
     name = Column(String(100), index=True, nullable=False)
     city = Column(String(50))
     abbreviation = Column(String(5))
     conference = Column(String(10))
     division = Column(String(20))
+
+    # Stats por jogo usados nos rankings (LeagueDashTeamStats Base + Advanced)
+    fga = Column(Float)
+    fg3m = Column(Float)
+    fg3a = Column(Float)
+    fg3_pct = Column(Float)
+    reb = Column(Float)
+    ast = Column(Float)
+    pace = Column(Float)
+    off_rating = Column(Float)
+    def_rating = Column(Float)
+
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relacionamento
@@ -41,11 +77,31 @@ class TeamModel(Base):
 class SimulationHistoryModel(Base):
     """Model para histórico de simulações"""
     __tablename__ = 'simulation_history'
+    __table_args__ = (
+        Index('ix_simulation_history_player_team_created', 'player_id', 'team_id', 'created_at'),
+        Index('ix_simulation_history_created', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, nullable=False)
     team_id = Column(Integer, nullable=False)
+    fit_score = Column(Integer)
     veredito = Column(String(50), nullable=False)
     minutagem_estimada = Column(Float)
     explicacao = Column(String(500))
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class FitMatrixModel(Base):
+    """Model para a matriz pré-calculada de encaixe jogador × time"""
+    __tablename__ = 'fit_matrix'
+
+    season = Column(String(10), primary_key=True)
+    player_id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    fit_score = Column(Integer, nullable=False)
+    fit_label = Column(String(30), nullable=False)
+    projected_role = Column(String(40), nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Hash das tabelas da liga usadas no cálculo; matriz de outros dados é recalculada
+    source_version = Column(String(64))
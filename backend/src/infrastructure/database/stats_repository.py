@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple, Type
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.infrastructure.database.connection import Base, sync_session_maker
+from src.infrastructure.database.models import PlayerModel, TeamModel
+
+# Coluna do DataFrame da NBA API -> coluna do model
+PLAYER_COLUMNS: Dict[str, str] = {
+    'PLAYER_ID': 'nba_id',
+    'PLAYER_NAME': 'name',
+    'TEAM_ID': 'nba_team_id',
+    'POSITION': 'position',
+    'MIN': 'min',
+    'PTS': 'pts',
+    'FGA': 'fga',
+    'FG_PCT': 'fg_pct',
+    'FG3M': 'fg3m',
+    'FG3A': 'fg3a',
+    'FG3_PCT': 'fg3_pct',
+    'AST': 'ast',
+    'TOV': 'tov',
+    'REB': 'reb',
+    'OREB': 'oreb',
+    'BLK': 'blk',
+    'STL': 'stl',
+    'USG_PCT': 'usg_pct',
+    'AST_PCT': 'ast_pct',
+}
+
+TEAM_COLUMNS: Dict[str, str] = {
+    'TEAM_ID': 'nba_id',
+    'TEAM_NAME': 'name',
+    'FGA': 'fga',
+    'FG3M': 'fg3m',
+    'FG3A': 'fg3a',
+    'FG3_PCT': 'fg3_pct',
+    'REB': 'reb',
+    'AST': 'ast',
+    'PACE': 'pace',
+    'OFF_RATING': 'off_rating',
+    'DEF_RATING': 'def_rating',
+}
+
+
+class StatsRepository:
+    """Cache persistente (SQLite) das tabelas da liga por temporada.
+
+    Síncrono de propósito: é chamado pelos loaders do SeasonCache, que já
+    rodam no pool de threads do cliente da NBA API.
+    """
+
+    def __init__(self, session_maker: sessionmaker[Session] = sync_session_maker):
+        self._session_maker = session_maker
+
+    def save_player_stats(self, season: str, df: pd.DataFrame) -> None:
+        self._replace(PlayerModel, PLAYER_COLUMNS, season, df)
+
+    def load_player_stats(self, season: str) -> Optional[Tuple[pd.DataFrame, datetime]]:
+        """Retorna (tabela, updated_at mais antigo) ou None se a temporada não estiver salva."""
+        return self._load(PlayerModel, PLAYER_COLUMNS, season)
+
+    def save_team_stats(self, season: str, df: pd.DataFrame) -> None:
+        self._replace(TeamModel, TEAM_COLUMNS, season, df)
+
+    def load_team_stats(self, season: str) -> Optional[Tuple[pd.DataFrame, datetime]]:
+        return self._load(TeamModel, TEAM_COLUMNS, season)
+
+    @staticmethod
+    def is_fresh(updated_at: datetime, max_age_seconds: float) -> bool:
+        return datetime.utcnow() - updated_at <= timedelta(seconds=max_age_seconds)
+
+    def _replace(self, model: Type[Base], columns: Dict[str, str], season: str, df: pd.DataFrame) -> None:
+        """Troca todas as linhas da temporada numa única transação (DELETE + INSERT).
+
+        Quem saiu da tabela nova (ex.: jogador dispensado) sai do banco também;
+        uma linha órfã com updated_at antigo deixaria a temporada sempre expirada.
+        """
+        now = datetime.utcnow()
+        present = [c for c in columns if c in df.columns]
+        rows = [
+            {**{columns[c]: _native(row[c]) for c in present}, 'season': season, 'updated_at': now}
+            for row in df[present].to_dict('records')
+        ]
+        if not rows:
+            return
+
+        with self._session_maker() as session:
+            with session.begin():
+                session.execute(delete(model).where(model.season == season))
+                session.execute(insert(model), rows)
+
+    def _load(
+        self,
+        model: Type[Base],
+        columns: Dict[str, str],
+        season: str
+    ) -> Optional[Tuple[pd.DataFrame, datetime]]:
+        with self._session_maker() as session:
+            oldest = session.execute(
+                select(func.min(model.updated_at)).where(model.season == season)
+            ).scalar()
+            if oldest is None:
+                return None
+            rows = session.execute(
+                select(*[getattr(model, attr) for attr in columns.values()])
+                .where(model.season == season)
+            ).all()
+
+        df = pd.DataFrame(rows, columns=list(columns.keys()))
+        return df, oldest
+
+
+def _native(value):
+    # NaN vira NULL no SQLite
+    return None if isinstance(value, float) and value != value else value
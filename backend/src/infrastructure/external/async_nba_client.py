@@ -0,0 +1,75 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from src.core.config import get_settings
+from src.infrastructure.external.league_tables import PlayerStatsTable, RosterTable, TeamRankTable
+from src.infrastructure.external.nba_api_client import NBAApiClient, PlayerInfo
+from src.domain.entities.analysis import PlayerStatsRecord
+from src.schemas.analysis import TeamStats
+
+T = TypeVar("T")
+
+
+class AsyncNBAApiClient:
+    """Fachada assíncrona do NBAApiClient.
+
+    As chamadas do nba_api são bloqueantes (requests); aqui elas rodam num pool
+    de threads limitado para não travar o event loop do uvicorn.
+    """
+
+    def __init__(self, client: Optional[NBAApiClient] = None, max_workers: Optional[int] = None):
+        self.client = client or NBAApiClient()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or get_settings().nba_api_max_workers,
+            thread_name_prefix="nba-api"
+        )
+
+    async def get_player_advanced_stats(self, player_id: int) -> Optional[PlayerStatsRecord]:
+        return await self._run(self.client.get_player_advanced_stats, player_id)
+
+    async def get_team_stats(self, team_id: int) -> Optional[TeamStats]:
+        return await self._run(self.client.get_team_stats, team_id)
+
+    async def get_all_team_stats(self, background: bool = False) -> List[TeamStats]:
+        if background:
+            return await self._run(self._in_background, self.client.get_all_team_stats)
+        return await self._run(self.client.get_all_team_stats)
+
+    async def get_player_stats_table(self, background: bool = False) -> PlayerStatsTable:
+        if background:
+            return await self._run(self._in_background, self.client.get_player_stats_table)
+        return await self._run(self.client.get_player_stats_table)
+
+    async def get_team_rank_table(self) -> TeamRankTable:
+        return await self._run(self.client.get_team_rank_table)
+
+    async def get_player_info(self, player_id: int) -> Optional[PlayerInfo]:
+        return await self._run(self.client.get_player_info, player_id)
+
+    async def get_team_roster(self, team_id: int) -> List[Dict[str, Any]]:
+        return await self._run(self.client.get_team_roster, team_id)
+
+    async def refresh_player_stats_table(self, min_rows: int) -> PlayerStatsTable:
+        return await self._run(self._in_background, self.client.refresh_player_stats_table, min_rows)
+
+    async def refresh_team_rank_table(self, min_rows: int) -> TeamRankTable:
+        return await self._run(self._in_background, self.client.refresh_team_rank_table, min_rows)
+
+    async def refresh_roster_table(self, min_teams: int) -> RosterTable:
+        return await self._run(self._in_background, self.client.refresh_roster_table, min_teams)
+
+    async def sync_snapshots(self) -> List[str]:
+        return await self._run(self.client.sync_snapshots)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _in_background(self, fn: Callable[..., T], *args: Any) -> T:
+        # Executado na thread do pool: a prioridade vale só para esta chamada
+        with self.client.background():
+            return fn(*args)
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
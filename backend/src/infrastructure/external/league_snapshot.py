@@ -0,0 +1,174 @@
+"""Snapshot colunar da liga em disco, compartilhado entre workers do uvicorn.
+
+Cada dataset (player_stats, team_stats, rosters) de uma temporada é gravado
+uma única vez como um diretório com um .npy por coluna e publicado trocando
+atomicamente (os.replace) o ponteiro `current.json`. Os workers abrem as
+colunas com np.load(mmap_mode='r'): o page cache guarda uma só cópia física
+e cada processo apenas mapeia as páginas. Versões antigas podem ser apagadas
+com segurança, já que o mapeamento de quem ainda as usa continua válido.
+
+Colunas numéricas viram views somente leitura, sem cópia. Texto é gravado
+como unicode de largura fixa (a tabela de strings), com uma máscara de
+nulos, e decodificado por worker.
+"""
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.files import write_json_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos, cada worker baixa o seu
+    fcntl = None
+
+POINTER = "current.json"
+META = "meta.json"
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    dataset: str
+    season: str
+    version: str
+    published_at: float
+    rows: int
+    path: str
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.published_at)
+
+
+class LeagueSnapshotStore:
+    """Publica e abre snapshots colunares em `root/<temporada>/<dataset>/<versão>/`."""
+
+    def __init__(self, root: str, keep: int = 2):
+        self.root = root
+        self.keep = max(1, keep)
+        # Diretório inválido falha na inicialização, não no primeiro download
+        os.makedirs(root, exist_ok=True)
+
+    def publish(self, dataset: str, season: str, df: pd.DataFrame) -> SnapshotInfo:
+        """Grava o DataFrame numa versão nova e a torna a atual.
+
+        O diretório é montado com outro nome e renomeado só quando completo; o
+        ponteiro é trocado por último. Um leitor vê a versão anterior ou a
+        nova, nunca arquivos pela metade.
+        """
+        base = self._dataset_dir(dataset, season)
+        os.makedirs(base, exist_ok=True)
+        version = f"{time.time_ns():020d}-{os.getpid()}"
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=base)
+        try:
+            _write_columns(staging, df)
+            os.rename(staging, os.path.join(base, version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        info = SnapshotInfo(dataset, season, version, time.time(), len(df), os.path.join(base, version))
+        write_json_atomic(os.path.join(base, POINTER), {
+            "version": version, "published_at": info.published_at, "rows": info.rows
+        })
+        self._prune(base, version)
+        return info
+
+    def current(self, dataset: str, season: str) -> Optional[SnapshotInfo]:
+        """Versão apontada por `current.json`, ou None se nada foi publicado."""
+        base = self._dataset_dir(dataset, season)
+        try:
+            with open(os.path.join(base, POINTER), encoding="utf-8") as f:
+                pointer = json.load(f)
+        except FileNotFoundError:
+            return None
+        version = pointer["version"]
+        return SnapshotInfo(
+            dataset, season, version, float(pointer["published_at"]), int(pointer["rows"]),
+            os.path.join(base, version)
+        )
+
+    def load(self, info: SnapshotInfo) -> pd.DataFrame:
+        """DataFrame cujas colunas numéricas são views dos arquivos mapeados."""
+        with open(os.path.join(info.path, META), encoding="utf-8") as f:
+            meta = json.load(f)
+        columns: Dict[str, Any] = {}
+        for column in meta["columns"]:
+            values = np.load(os.path.join(info.path, column["file"]), mmap_mode="r")
+            if column["kind"] == "text":
+                values = values.astype(object)
+                if column.get("mask"):
+                    values[np.load(os.path.join(info.path, column["mask"]))] = None
+            columns[column["name"]] = values
+        return pd.DataFrame(columns, copy=False)
+
+    @contextmanager
+    def lock(self, dataset: str, season: str) -> Iterator[None]:
+        """Trava exclusiva entre processos: um worker baixa, os outros esperam e adotam."""
+        base = self._dataset_dir(dataset, season)
+        os.makedirs(base, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(base, ".lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _dataset_dir(self, dataset: str, season: str) -> str:
+        return os.path.join(self.root, season, dataset)
+
+    def _prune(self, base: str, current: str) -> None:
+        versions = sorted(
+            name for name in os.listdir(base)
+            if not name.startswith(".") and os.path.isdir(os.path.join(base, name))
+        )
+        for name in versions[:-self.keep]:
+            if name != current:
+                shutil.rmtree(os.path.join(base, name), ignore_errors=True)
+
+
+def _write_columns(directory: str, df: pd.DataFrame) -> None:
+    columns: List[Dict[str, Any]] = []
+    for index, name in enumerate(df.columns):
+        series = df[name]
+        entry: Dict[str, Any] = {"name": str(name), "file": f"c{index}.npy"}
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            entry["kind"] = "numeric"
+            values = series.to_numpy()
+        else:
+            entry["kind"] = "text"
+            nulls = series.isna().to_numpy()
+            values = np.array(
+                ["" if null else str(value) for value, null in zip(series.tolist(), nulls)], dtype=str
+            )
+            if nulls.any():
+                entry["mask"] = f"c{index}.mask.npy"
+                np.save(os.path.join(directory, entry["mask"]), nulls)
+        np.save(os.path.join(directory, entry["file"]), np.ascontiguousarray(values))
+        columns.append(entry)
+    write_json_atomic(os.path.join(directory, META), {"columns": columns, "rows": len(df)})
+
+
+def mapped_bytes(df: pd.DataFrame) -> int:
+    """Bytes das colunas do DataFrame que são views de arquivos mapeados."""
+    total = 0
+    for name in df.columns:
+        values = df[name].to_numpy()
+        base = values
+        while base is not None and not isinstance(base, mmap.mmap):
+            base = getattr(base, "base", None)
+        if base is not None:
+            total += values.nbytes
+    return total
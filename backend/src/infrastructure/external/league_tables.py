@@ -0,0 +1,281 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.metrics import timed
+from src.domain.entities.analysis import PlayerStatsRecord
+from src.schemas.analysis import TeamStats
+
+
+class PlayerStatsTable:
+    """Snapshot da LeagueDashPlayerStats de uma temporada, indexado por PLAYER_ID.
+
+    Guarda só as colunas e a posição de cada jogador: quando o DataFrame vem
+    do snapshot mapeado em disco, nada é copiado para o processo. Linhas e
+    registros são montados sob demanda.
+    """
+
+    def __init__(self, season: str, df: pd.DataFrame):
+        self.season = season
+        self.df = df
+        self._columns: Dict[str, np.ndarray] = {column: df[column].to_numpy() for column in df.columns}
+        self._positions: Dict[int, int] = {
+            int(player_id): position for position, player_id in enumerate(df['PLAYER_ID'].tolist())
+        }
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._positions
+
+    def get(self, player_id: int) -> Optional[Dict[str, Any]]:
+        position = self._positions.get(player_id)
+        if position is None:
+            return None
+        return {column: _native(values[position]) for column, values in self._columns.items()}
+
+    @timed("player_stats_lookup")
+    def get_stats(self, player_id: int) -> Optional[PlayerStatsRecord]:
+        position = self._positions.get(player_id)
+        if position is None:
+            return None
+        return _to_record({
+            column: _native(values[position])
+            for column, values in self._columns.items() if column in RECORD_COLUMNS
+        })
+
+    def all_stats(self) -> Iterator[PlayerStatsRecord]:
+        # Uma conversão por coluna (tolist) em vez de um acesso numpy por célula
+        lists = {column: self._columns[column].tolist() for column in RECORD_COLUMNS if column in self._columns}
+        for position in self._positions.values():
+            yield _to_record({column: values[position] for column, values in lists.items()})
+
+
+# Colunas lidas por _to_record
+RECORD_COLUMNS = frozenset({
+    'PLAYER_ID', 'PLAYER_NAME', 'PTS', 'FGA', 'FG_PCT', 'FG3A', 'FG3_PCT', 'AST', 'TOV',
+    'REB', 'OREB', 'BLK', 'STL', 'MIN', 'POSITION', 'USG_PCT', 'AST_PCT'
+})
+
+
+def _to_record(row: Dict[str, Any]) -> PlayerStatsRecord:
+    # Sem validação Pydantic: as conversões explícitas fazem o papel da coerção
+    return PlayerStatsRecord(
+        player_id=int(row['PLAYER_ID']),
+        player_name=str(row['PLAYER_NAME']),
+        pts=float(row['PTS']),
+        fga=float(row['FGA']),
+        fg_pct=float(row['FG_PCT']),
+        fg3a=float(row['FG3A']),
+        fg3_pct=float(row['FG3_PCT']),
+        ast=float(row['AST']),
+        tov=float(row['TOV']),
+        reb=float(row['REB']),
+        oreb=float(row['OREB']),
+        blk=float(row['BLK']),
+        stl=float(row['STL']),
+        min=float(row['MIN']),
+        position=_text(row.get('POSITION')),
+        usg_pct=_optional(row.get('USG_PCT')),
+        ast_pct=_optional(row.get('AST_PCT'))
+    )
+
+
+def _native(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _text(value: Any) -> str:
+    # Posição ausente chega como None ou NaN, conforme a origem do DataFrame
+    return value if isinstance(value, str) else ""
+
+
+def _optional(value: Any) -> Optional[float]:
+    # NaN (jogador ausente da tabela Advanced) vira None, como nos dados sem USG%
+    return None if value is None or value != value else float(value)
+
+
+# Coluna agregada do time -> (campo de ranking no TeamStats, menor é melhor)
+RANKED_COLUMNS: Dict[str, Tuple[str, bool]] = {
+    'FG3_PCT': ('fg3_pct_rank', False),
+    'REB': ('reb_rank', False),
+    'AST': ('ast_rank', False),
+    'PACE': ('pace_rank', False),
+    'DEF_RATING': ('def_rating_rank', True),
+    'OFF_RATING': ('off_rating_rank', False),
+}
+
+# Totais usados para recalcular FG3_PCT quando jogadores entram/saem
+SUPPORT_COLUMNS = ('FG3M', 'FG3A')
+
+
+class TeamRankTable:
+    """Rankings da liga de uma temporada: um TeamStats por time, calculado uma vez por refresh."""
+
+    def __init__(self, season: str, df: pd.DataFrame):
+        self.season = season
+        self.df = df.assign(
+            FG3_PCT_RANK=_rank(df['FG3_PCT']),
+            REB_RANK=_rank(df['REB']),
+            AST_RANK=_rank(df['AST']),
+            PACE_RANK=_rank(df['PACE']),
+            DEF_RATING_RANK=_rank(df['DEF_RATING'], ascending=True),
+            OFF_RATING_RANK=_rank(df['OFF_RATING'])
+        )
+        self._teams: Dict[int, TeamStats] = {
+            int(row['TEAM_ID']): TeamStats(
+                team_id=int(row['TEAM_ID']),
+                team_name=row['TEAM_NAME'],
+                fg3_pct_rank=row['FG3_PCT_RANK'],
+                reb_rank=row['REB_RANK'],
+                ast_rank=row['AST_RANK'],
+                pace_rank=row['PACE_RANK'],
+                def_rating_rank=row['DEF_RATING_RANK'],
+                off_rating_rank=row['OFF_RATING_RANK'],
+                pace=row['PACE'],
+                fg3_pct=row['FG3_PCT'],
+                ball_dominant_count=0
+            )
+            for row in self.df.to_dict('records')
+        }
+        columns = [c for c in (*RANKED_COLUMNS, *SUPPORT_COLUMNS) if c in df.columns]
+        self._aggregates: Dict[int, Dict[str, float]] = {
+            int(row['TEAM_ID']): {c: float(row[c]) for c in columns}
+            for row in df.to_dict('records')
+        }
+        # Valores da liga ordenados por coluna: ranking de um valor novo via busca binária
+        self._sorted: Dict[str, np.ndarray] = {}
+        for column in RANKED_COLUMNS:
+            values = df[column].to_numpy(dtype=float)
+            self._sorted[column] = np.sort(values[~np.isnan(values)])
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    def aggregates(self, team_id: int) -> Optional[Dict[str, float]]:
+        """Agregados por jogo do time (cópia), base para aplicar deltas de trocas."""
+        values = self._aggregates.get(team_id)
+        return dict(values) if values is not None else None
+
+    def rerank(self, updates: Dict[int, Dict[str, float]]) -> Dict[int, TeamStats]:
+        """TeamStats dos times em `updates` como se a liga tivesse esses agregados novos.
+
+        Os demais times mantêm seus valores, então cada ranking sai de uma busca
+        binária nos valores ordenados da liga, corrigida pelos times alterados,
+        sem reordenar a tabela inteira. Mesmo critério de `_rank` (method='min').
+        """
+        result: Dict[int, TeamStats] = {}
+        for team_id, values in updates.items():
+            base = self._teams[team_id]
+            changes: Dict[str, Any] = {}
+            for column, (field, ascending) in RANKED_COLUMNS.items():
+                value = values.get(column)
+                if value is None or value != value:
+                    continue
+                better = self._count_better(column, value, ascending)
+                for other_id, other_values in updates.items():
+                    original = self._aggregates[other_id].get(column)
+                    if original is not None and _is_better(original, value, ascending):
+                        better -= 1
+                    new = other_values.get(column, original)
+                    if other_id != team_id and new is not None and _is_better(new, value, ascending):
+                        better += 1
+                changes[field] = better + 1
+            if 'PACE' in values:
+                changes['pace'] = values['PACE']
+            if 'FG3_PCT' in values:
+                changes['fg3_pct'] = values['FG3_PCT']
+            result[team_id] = base.model_copy(update=changes)
+        return result
+
+    def _count_better(self, column: str, value: float, ascending: bool) -> int:
+        ordered = self._sorted[column]
+        if ascending:
+            return int(np.searchsorted(ordered, value, side='left'))
+        return int(len(ordered) - np.searchsorted(ordered, value, side='right'))
+
+    @timed("team_stats_lookup")
+    def get(self, team_id: int) -> Optional[TeamStats]:
+        return self._teams.get(team_id)
+
+    def all(self) -> List[TeamStats]:
+        return list(self._teams.values())
+
+
+class RosterTable:
+    """Rosters de todos os times de uma temporada (CommonTeamRoster), por TEAM_ID."""
+
+    def __init__(self, season: str, rosters: Dict[int, List[Dict[str, Any]]]):
+        self.season = season
+        self._rosters = rosters
+
+    def __len__(self) -> int:
+        return len(self._rosters)
+
+    def __contains__(self, team_id: int) -> bool:
+        return team_id in self._rosters
+
+    def get(self, team_id: int) -> List[Dict[str, Any]]:
+        return self._rosters.get(team_id, [])
+
+    def player_ids(self) -> Dict[int, List[int]]:
+        return {
+            team_id: [int(row['PLAYER_ID']) for row in roster if 'PLAYER_ID' in row]
+            for team_id, roster in self._rosters.items()
+        }
+
+    @property
+    def player_count(self) -> int:
+        return sum(len(roster) for roster in self._rosters.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Todos os rosters numa tabela só, com o time em ROSTER_TEAM_COLUMN (formato do snapshot)."""
+        rows = [
+            {**row, ROSTER_TEAM_COLUMN: team_id}
+            for team_id, roster in self._rosters.items() for row in roster
+        ]
+        return pd.DataFrame(rows)
+
+    @classmethod
+    def from_frame(cls, season: str, df: pd.DataFrame) -> "RosterTable":
+        rosters: Dict[int, List[Dict[str, Any]]] = {}
+        for row in df.to_dict('records'):
+            team_id = int(row.pop(ROSTER_TEAM_COLUMN))
+            rosters.setdefault(team_id, []).append(row)
+        return cls(season, rosters)
+
+
+# Coluna própria: o TeamID do CommonTeamRoster não é garantido em todas as respostas
+ROSTER_TEAM_COLUMN = '_ROSTER_TEAM_ID'
+
+
+def validate_league_frame(
+    df: pd.DataFrame,
+    min_rows: int,
+    label: str,
+    columns: Optional[Iterable[str]] = None
+) -> None:
+    """Rejeita snapshots incompletos antes que substituam os dados em uso.
+
+    Levanta ValueError se houver menos de `min_rows` linhas ou se alguma das
+    `columns` faltar ou vier inteiramente vazia (resposta truncada ou mudança
+    de schema no upstream).
+    """
+    if len(df) < min_rows:
+        raise ValueError(f"{label}: {len(df)} linhas, mínimo esperado {min_rows}")
+    columns = list(columns) if columns is not None else list(df.columns)
+    missing = [column for column in columns if column not in df.columns]
+    empty = [column for column in columns if column in df.columns and df[column].isna().all()]
+    if missing or empty:
+        raise ValueError(f"{label}: colunas ausentes ou vazias: {', '.join(missing + empty)}")
+
+
+def _is_better(candidate: float, value: float, ascending: bool) -> bool:
+    return candidate < value if ascending else candidate > value
+
+
+def _rank(column: pd.Series, ascending: bool = False) -> pd.Series:
+    # "min" mantém rankings inteiros dentro de 1..30 mesmo com empates
+    return column.rank(ascending=ascending, method='min', na_option='bottom').astype(int)
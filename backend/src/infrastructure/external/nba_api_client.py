@@ -1,14 +1,59 @@
-from typing import Any, Dict, List, Optional
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime
+
+import pandas as pd
 
 from nba_api.stats.static import players, teams
 from nba_api.stats.endpoints import (
     commonplayerinfo,
     leaguedashplayerstats,
     leaguedashteamstats,
-    commonteamroster
+    commonteamroster,
+    playerindex
+)
+from src.core.config import get_settings
+from src.core.memo_cache import MemoCache
+from src.core.metrics import REGISTRY
+from src.infrastructure.database.stats_repository import (
+    PLAYER_COLUMNS,
+    TEAM_COLUMNS,
+    StatsRepository
+)
+from src.infrastructure.external.player_search_index import PlayerSearchIndex
+from src.infrastructure.external.league_snapshot import LeagueSnapshotStore, SnapshotInfo, mapped_bytes
+from src.infrastructure.external.recorded_responses import RecordedResponses
+from src.infrastructure.external.league_tables import (
+    PlayerStatsTable,
+    RosterTable,
+    TeamRankTable,
+    validate_league_frame
+)
+from src.infrastructure.external.season_cache import SeasonCache
+from src.domain.services.roster_composition_service import RosterCompositionIndex, TeamComposition
+from src.infrastructure.external.single_flight import SingleFlight
+from src.infrastructure.external.upstream_scheduler import (
+    CircuitBreaker,
+    Priority,
+    UpstreamScheduler
+)
+from src.domain.entities.analysis import PlayerStatsRecord
+from src.schemas.analysis import TeamStats
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_SECONDS = REGISTRY.histogram(
+    "nba_upstream_request_seconds", "Duração de cada tentativa de chamada à NBA API", ("endpoint",)
+)
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "nba_upstream_errors_total", "Tentativas de chamada à NBA API que falharam", ("endpoint", "error")
+)
+UPSTREAM_STALE = REGISTRY.counter(
+    "nba_upstream_stale_responses_total", "Falhas atendidas com a última resposta válida", ("endpoint",)
 )
-from src.schemas.analysis import PlayerAdvancedStats, TeamStats
 
 
 @dataclass
@@ -23,16 +68,74 @@ class PlayerInfo:
 class NBAApiClient:
     """Cliente para buscar dados da API oficial da NBA."""
     
-    def __init__(self):
-        self.current_season = "2024-25"
+    def __init__(
+        self,
+        cache_ttl_seconds: Optional[int] = None,
+        stats_repository: Optional[StatsRepository] = None,
+        scheduler: Optional[UpstreamScheduler] = None,
+        snapshot_store: Optional[LeagueSnapshotStore] = None,
+        recordings: Optional[RecordedResponses] = None
+    ):
+        settings = get_settings()
+        self.current_season = settings.current_season
+        self.fallback_season = settings.fallback_season
+        self.stats_repository = stats_repository
+        # Snapshot colunar em disco compartilhado entre workers; sem ele cada processo baixa o seu
+        self.snapshot_store = snapshot_store
+        self._snapshot_versions: Dict[Tuple[str, str], str] = {}
+        # Respostas gravadas em JSON: replay serve tudo do disco, record grava o que baixar
+        self.recordings = recordings
+        ttl = cache_ttl_seconds if cache_ttl_seconds is not None else settings.stats_cache_ttl_seconds
+        self._cache_ttl_seconds = ttl
+        retry = settings.stats_cache_retry_seconds
+        self._player_stats_cache: SeasonCache[PlayerStatsTable] = SeasonCache(
+            self._fetch_player_stats_table, ttl, retry
+        )
+        self._team_rank_cache: SeasonCache[TeamRankTable] = SeasonCache(
+            self._fetch_team_rank_table, ttl, retry
+        )
+        # Preenchido pelo refresh em segundo plano; sem ele, rosters são buscados por time
+        self._roster_cache: SeasonCache[RosterTable] = SeasonCache(
+            self._fetch_roster_table, ttl, retry
+        )
+        # Montado a cada troca da tabela de jogadores ou dos rosters; sem ele ball_dominant_count fica 0
+        self._composition: Optional[RosterCompositionIndex] = None
+        self._composition_version = 0
+        self._teams: List[Dict[str, Any]] = teams.get_teams()
+        self._search_index: Optional[PlayerSearchIndex] = None
+        self._single_flight = SingleFlight()
+        self.scheduler = scheduler or UpstreamScheduler(
+            rate_per_second=settings.nba_api_rate_per_second,
+            burst=settings.nba_api_burst,
+            max_retries=settings.nba_api_max_retries,
+            backoff_base_seconds=settings.nba_api_backoff_base_seconds,
+            backoff_max_seconds=settings.nba_api_backoff_max_seconds,
+            breaker=CircuitBreaker(
+                settings.nba_api_breaker_failure_threshold,
+                settings.nba_api_breaker_reset_seconds
+            )
+        )
+        # Última resposta válida por chamada, servida enquanto o upstream estiver fora.
+        # Limitado: chamadas por jogador (CommonPlayerInfo) não acumulam para sempre
+        self._last_good: MemoCache[Any] = MemoCache(
+            "nba_last_good", settings.nba_api_stale_max_entries, settings.nba_api_stale_ttl_seconds
+        )
 
-    def search_player_by_name(self, name: str) -> List[Dict[str, Any]]:
-        all_players = players.get_players()
-        return [p for p in all_players if name.lower() in p['full_name'].lower()]
+    def search_player_by_name(
+        self,
+        name: str,
+        limit: int = 10,
+        active_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        if self._search_index is None:
+            self._search_index = PlayerSearchIndex(players.get_players())
+        return self._search_index.search(name, limit=limit, active_only=active_only)
     
     def get_player_info(self, player_id: int) -> Optional[PlayerInfo]:
         try:
-            info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
+            info = self._request(
+                "CommonPlayerInfo", commonplayerinfo.CommonPlayerInfo, player_id=player_id
+            )
             data = info.get_normalized_dict()
             player_data = data['CommonPlayerInfo'][0]
             
@@ -44,101 +147,459 @@ class NBAApiClient:
                 team_name=player_data.get('TEAM_NAME')
             )
         except Exception as e:
-            print(f"[NBAApiClient] Erro ao buscar jogador {player_id}: {e}")
+            logger.error("Erro ao buscar jogador %s: %s", player_id, e)
             return None
 
-    def get_player_advanced_stats(self, player_id: int) -> Optional[PlayerAdvancedStats]:
+    def get_player_advanced_stats(self, player_id: int) -> Optional[PlayerStatsRecord]:
         try:
-            stats = leaguedashplayerstats.LeagueDashPlayerStats(
-                season=self.current_season,
-                per_mode_detailed="PerGame"
-            )
-            df = stats.get_data_frames()[0]
-            player_row = df[df['PLAYER_ID'] == player_id]
-            
-            if player_row.empty:
-                stats = leaguedashplayerstats.LeagueDashPlayerStats(
-                    season="2023-24",
-                    per_mode_detailed="PerGame"
+            stats = self._player_stats_cache.get(self.current_season).get_stats(player_id)
+            if stats is None:
+                stats = self._player_stats_cache.get(self.fallback_season).get_stats(player_id)
+            return stats
+        except Exception as e:
+            logger.error("Erro ao buscar stats %s: %s", player_id, e)
+            return None
+
+    def get_player_stats_table(self, season: Optional[str] = None) -> PlayerStatsTable:
+        """Snapshot da liga inteira; baixado no máximo uma vez por TTL."""
+        return self._player_stats_cache.get(season or self.current_season)
+
+    def _fetch_player_stats_table(self, season: str) -> PlayerStatsTable:
+        repository = self.stats_repository
+        df = self._through_snapshot("player_stats", season, lambda: self._read_through(
+            season,
+            self._download_player_stats,
+            repository.load_player_stats if repository else None,
+            repository.save_player_stats if repository else None
+        ))
+        # Recarga por TTL também troca as flags dos jogadores
+        self._rebuild_composition(season, df)
+        return PlayerStatsTable(season, df)
+
+    def _download_player_stats(self, season: str) -> pd.DataFrame:
+        stats = self._request(
+            "LeagueDashPlayerStats",
+            leaguedashplayerstats.LeagueDashPlayerStats,
+            season=season,
+            per_mode_detailed="PerGame"
+        )
+        df = stats.get_data_frames()[0]
+        df = self._merge_player_usage(season, df)
+        positions = self._fetch_player_positions(season)
+        return df.assign(POSITION=df['PLAYER_ID'].map(positions).fillna(""))
+
+    def _merge_player_usage(self, season: str, df: pd.DataFrame) -> pd.DataFrame:
+        # USG% e AST% (base de BALL_DOMINANT e PLAYMAKER) só existem na tabela Advanced
+        missing = [c for c in ('USG_PCT', 'AST_PCT') if c not in df.columns]
+        if not missing:
+            return df
+        advanced = self._request(
+            "LeagueDashPlayerStats",
+            leaguedashplayerstats.LeagueDashPlayerStats,
+            season=season,
+            per_mode_detailed="PerGame",
+            measure_type_detailed_defense="Advanced"
+        ).get_data_frames()[0]
+        available = [c for c in missing if c in advanced.columns]
+        return df.merge(advanced[['PLAYER_ID'] + available], on='PLAYER_ID', how='left')
+
+    def _fetch_player_positions(self, season: str) -> Dict[int, str]:
+        # LeagueDashPlayerStats não traz posição; o PlayerIndex traz a liga inteira numa chamada
+        try:
+            index = self._request("PlayerIndex", playerindex.PlayerIndex, season=season)
+            df = index.get_data_frames()[0]
+            return dict(zip(df['PERSON_ID'].astype(int), df['POSITION'].fillna("")))
+        except Exception as e:
+            logger.error("Erro ao buscar posições da temporada %s: %s", season, e)
+            return {}
+
+    def get_team_stats(self, team_id: int) -> Optional[TeamStats]:
+        try:
+            stats = self._team_rank_cache.get(self.current_season).get(team_id)
+            return self._with_composition(stats) if stats is not None else None
+        except Exception as e:
+            logger.error("Erro ao buscar stats do time %s: %s", team_id, e)
+            return None
+
+    def get_all_team_stats(self) -> List[TeamStats]:
+        try:
+            return [
+                self._with_composition(stats)
+                for stats in self._team_rank_cache.get(self.current_season).all()
+            ]
+        except Exception as e:
+            logger.error("Erro ao buscar stats dos times: %s", e)
+            return []
+
+    def get_team_rank_table(self, season: Optional[str] = None) -> TeamRankTable:
+        """Rankings de todos os times; recalculados apenas quando o snapshot expira."""
+        return self._team_rank_cache.get(season or self.current_season)
+
+    def _fetch_team_rank_table(self, season: str) -> TeamRankTable:
+        repository = self.stats_repository
+        df = self._through_snapshot("team_stats", season, lambda: self._read_through(
+            season,
+            self._download_team_stats,
+            repository.load_team_stats if repository else None,
+            repository.save_team_stats if repository else None
+        ))
+        return TeamRankTable(season, df)
+
+    def _download_team_stats(self, season: str) -> pd.DataFrame:
+        base = self._request(
+            "LeagueDashTeamStats",
+            leaguedashteamstats.LeagueDashTeamStats,
+            season=season,
+            per_mode_detailed="PerGame"
+        ).get_data_frames()[0]
+        advanced = self._request(
+            "LeagueDashTeamStats",
+            leaguedashteamstats.LeagueDashTeamStats,
+            season=season,
+            per_mode_detailed="PerGame",
+            measure_type_detailed_defense="Advanced"
+        ).get_data_frames()[0]
+        return base.merge(
+            advanced[['TEAM_ID', 'OFF_RATING', 'DEF_RATING', 'PACE']],
+            on='TEAM_ID',
+            how='left'
+        )
+
+    def refresh_player_stats_table(self, min_rows: int, season: Optional[str] = None) -> PlayerStatsTable:
+        """Baixa a tabela de jogadores de novo, valida e troca o snapshot em cache.
+
+        Se o download ou a validação falharem, o snapshot anterior continua em uso.
+        Com snapshot em disco, uma versão que outro worker acabou de publicar é
+        adotada no lugar do download.
+        """
+        season = season or self.current_season
+
+        def download() -> pd.DataFrame:
+            df = self._download_player_stats(season)
+            validate_league_frame(df, min_rows, f"LeagueDashPlayerStats {season}", PLAYER_COLUMNS)
+            if self.stats_repository is not None:
+                self._persist(self.stats_repository.save_player_stats, season, df)
+            return df
+
+        df = self._through_snapshot("player_stats", season, download, newer_only=True)
+        return self._install_player_stats(season, df)
+
+    def refresh_team_rank_table(self, min_rows: int, season: Optional[str] = None) -> TeamRankTable:
+        season = season or self.current_season
+
+        def download() -> pd.DataFrame:
+            df = self._download_team_stats(season)
+            validate_league_frame(df, min_rows, f"LeagueDashTeamStats {season}", TEAM_COLUMNS)
+            if self.stats_repository is not None:
+                self._persist(self.stats_repository.save_team_stats, season, df)
+            return df
+
+        df = self._through_snapshot("team_stats", season, download, newer_only=True)
+        return self._install_team_stats(season, df)
+
+    def refresh_roster_table(self, min_teams: int, season: Optional[str] = None) -> RosterTable:
+        season = season or self.current_season
+
+        def download() -> RosterTable:
+            table = self._download_roster_table(season)
+            empty = [team['id'] for team in self._teams if not table.get(team['id'])]
+            if len(table) < min_teams or empty:
+                raise ValueError(
+                    f"CommonTeamRoster {season}: {len(table)} rosters, vazios: {empty or 'nenhum'}"
                 )
-                df = stats.get_data_frames()[0]
-                player_row = df[df['PLAYER_ID'] == player_id]
-                
-                if player_row.empty:
-                    return None
+            return table
 
-            row = player_row.iloc[0]
-            
-            return PlayerAdvancedStats(
-                player_id=player_id,
-                player_name=row['PLAYER_NAME'],
-                pts=row['PTS'],
-                fga=row['FGA'],
-                fg_pct=row['FG_PCT'],
-                fg3a=row['FG3A'],
-                fg3_pct=row['FG3_PCT'],
-                ast=row['AST'],
-                tov=row['TOV'],
-                reb=row['REB'],
-                oreb=row['OREB'],
-                blk=row['BLK'],
-                stl=row['STL'],
-                min=row['MIN'],
-                position=""
-            )
-            
+        return self._install_rosters(season, self._shared_roster_table(season, download, newer_only=True))
+
+    def _install_player_stats(self, season: str, df: pd.DataFrame) -> PlayerStatsTable:
+        table = PlayerStatsTable(season, df)
+        self._player_stats_cache.put(season, table)
+        self._rebuild_composition(season, df)
+        return table
+
+    def _rebuild_composition(self, season: str, df: pd.DataFrame) -> None:
+        """Chamado sempre que a tabela de jogadores é trocada (refresh, snapshot ou TTL).
+
+        Flags dos jogadores mudaram: recalcula todos os elencos. Sem rosters em
+        cache ainda não há composição a manter.
+        """
+        rosters = self._roster_cache.peek(season)
+        if rosters is not None:
+            self._composition = RosterCompositionIndex.build(season, df, rosters.player_ids())
+            self._composition_version += 1
+
+    def _install_team_stats(self, season: str, df: pd.DataFrame) -> TeamRankTable:
+        table = TeamRankTable(season, df)
+        self._team_rank_cache.put(season, table)
+        return table
+
+    def _install_rosters(self, season: str, table: RosterTable) -> RosterTable:
+        self._roster_cache.put(season, table)
+        self._update_composition(season, table.player_ids())
+        return table
+
+    def _fetch_roster_table(self, season: str) -> RosterTable:
+        return self._shared_roster_table(season, lambda: self._download_roster_table(season))
+
+    def _shared_roster_table(
+        self,
+        season: str,
+        download: Callable[[], RosterTable],
+        newer_only: bool = False
+    ) -> RosterTable:
+        if self.snapshot_store is None:
+            return download()
+        df = self._through_snapshot("rosters", season, lambda: download().to_frame(), newer_only)
+        return RosterTable.from_frame(season, df)
+
+    def _through_snapshot(
+        self,
+        dataset: str,
+        season: str,
+        produce: Callable[[], pd.DataFrame],
+        newer_only: bool = False
+    ) -> pd.DataFrame:
+        """Obtém um dataset pelo snapshot em disco compartilhado entre os workers.
+
+        Sob a trava do dataset: se já houver uma versão publicada dentro do TTL
+        (com `newer_only`, diferente da que este processo usa), ela é mapeada;
+        senão `produce` roda e o resultado é publicado e mapeado, de modo que só
+        um worker baixa e todos leem as mesmas páginas. Sem snapshot
+        configurado, apenas chama `produce`.
+        """
+        store = self.snapshot_store
+        if store is None:
+            return produce()
+        with store.lock(dataset, season):
+            info = self._current_snapshot(dataset, season)
+            if info is not None and info.age_seconds < self._cache_ttl_seconds and (
+                not newer_only or info.version != self._snapshot_versions.get((dataset, season))
+            ):
+                df = self._map_snapshot(info)
+                if df is not None:
+                    return df
+            df = produce()
+            try:
+                info = store.publish(dataset, season, df)
+            except Exception as e:
+                logger.error("Erro ao publicar snapshot %s %s: %s", dataset, season, e)
+                return df
+            mapped = self._map_snapshot(info)
+            return mapped if mapped is not None else df
+
+    def _current_snapshot(self, dataset: str, season: str) -> Optional[SnapshotInfo]:
+        try:
+            return self.snapshot_store.current(dataset, season)
         except Exception as e:
-            print(f"[NBAApiClient] Erro ao buscar stats {player_id}: {e}")
+            logger.error("Erro ao ler ponteiro do snapshot %s %s: %s", dataset, season, e)
             return None
 
-    def get_team_stats(self, team_id: int) -> Optional[TeamStats]:
+    def _map_snapshot(self, info: SnapshotInfo) -> Optional[pd.DataFrame]:
         try:
-            stats = leaguedashteamstats.LeagueDashTeamStats(
-                season=self.current_season,
-                per_mode_detailed="PerGame"
-            )
-            df = stats.get_data_frames()[0]
-            
-            team_row = df[df['TEAM_ID'] == team_id]
-            if team_row.empty:
-                return None
-
-            df['FG3_PCT_RANK'] = df['FG3_PCT'].rank(ascending=False)
-            df['REB_RANK'] = df['REB'].rank(ascending=False)
-            df['AST_RANK'] = df['AST'].rank(ascending=False)
-            df['PACE_RANK'] = df['FGA'].rank(ascending=False)
-            
-            row = df[df['TEAM_ID'] == team_id].iloc[0]
+            df = self.snapshot_store.load(info)
+        except Exception as e:
+            logger.error("Erro ao mapear snapshot %s %s: %s", info.dataset, info.version, e)
+            return None
+        self._snapshot_versions[(info.dataset, info.season)] = info.version
+        return df
 
-            return TeamStats(
-                team_id=team_id,
-                team_name=row['TEAM_NAME'],
-                fg3_pct_rank=int(row['FG3_PCT_RANK']),
-                reb_rank=int(row['REB_RANK']),
-                ast_rank=int(row['AST_RANK']),
-                pace_rank=int(row['PACE_RANK']),
-                def_rating_rank=15,
-                off_rating_rank=15,
-                pace=0.0,
-                fg3_pct=row['FG3_PCT'],
-                ball_dominant_count=0
+    def sync_snapshots(self) -> List[str]:
+        """Adota as versões publicadas por outros workers desde a última leitura.
+
+        Só lê os ponteiros em disco; nada é baixado. Retorna os datasets trocados.
+        """
+        if self.snapshot_store is None:
+            return []
+        season = self.current_season
+        installers: Dict[str, Callable[[pd.DataFrame], Any]] = {
+            "player_stats": lambda df: self._install_player_stats(season, df),
+            "team_stats": lambda df: self._install_team_stats(season, df),
+            "rosters": lambda df: self._install_rosters(season, RosterTable.from_frame(season, df)),
+        }
+        updated = []
+        for dataset, install in installers.items():
+            info = self._current_snapshot(dataset, season)
+            if info is None or info.version == self._snapshot_versions.get((dataset, season)):
+                continue
+            try:
+                df = self._map_snapshot(info)
+                if df is not None:
+                    install(df)
+                    updated.append(dataset)
+            except Exception as e:
+                logger.error("Erro ao adotar snapshot %s %s: %s", dataset, info.version, e)
+        return updated
+
+    def snapshot_status(self) -> List[Dict[str, Any]]:
+        """Versões do snapshot em disco em uso neste processo e quanto delas está mapeado."""
+        caches = {
+            "player_stats": self._player_stats_cache,
+            "team_stats": self._team_rank_cache,
+            "rosters": self._roster_cache,
+        }
+        status = []
+        for (dataset, season), version in sorted(self._snapshot_versions.items()):
+            df = getattr(caches[dataset].peek(season), "df", None)
+            status.append({
+                "dataset": dataset,
+                "season": season,
+                "version": version,
+                "mapped_bytes": mapped_bytes(df) if df is not None else 0
+            })
+        return status
+
+    def get_roster_composition(self, team_id: int) -> Optional[TeamComposition]:
+        composition = self._composition
+        return composition.get(team_id) if composition is not None else None
+
+    def _update_composition(self, season: str, rosters: Dict[int, List[int]]) -> None:
+        composition = self._composition
+        if composition is not None and composition.season == season:
+            # Mesmas flags de jogadores: só os elencos que mudaram são recalculados
+            for team_id, player_ids in rosters.items():
+                previous = composition.get(team_id)
+                if composition.update_team(team_id, player_ids) is not previous:
+                    self._composition_version += 1
+            return
+        try:
+            league = self._player_stats_cache.get(season).df
+        except Exception as e:
+            logger.error("Erro ao montar composição dos elencos %s: %s", season, e)
+            return
+        self._composition = RosterCompositionIndex.build(season, league, rosters)
+        self._composition_version += 1
+
+    def _with_composition(self, stats: TeamStats) -> TeamStats:
+        composition = self._composition
+        if composition is None or composition.season != self.current_season:
+            return stats
+        return composition.apply(stats)
+
+    def _download_roster_table(self, season: str) -> RosterTable:
+        rosters: Dict[int, List[Dict[str, Any]]] = {}
+        for team in self._teams:
+            roster = self._request(
+                "CommonTeamRoster",
+                commonteamroster.CommonTeamRoster,
+                team_id=team['id'],
+                season=season
             )
+            rosters[team['id']] = roster.get_data_frames()[0].to_dict('records')
+        return RosterTable(season, rosters)
+
+    def _request(self, endpoint: str, factory: Callable[..., Any], **params: Any) -> Any:
+        """Dispara uma chamada à NBA API, coalescendo chamadas idênticas em andamento.
 
+        A chave é (endpoint, temporada, parâmetros): threads concorrentes pedindo
+        exatamente o mesmo recurso compartilham um único download, que passa
+        pelo scheduler (rate limit, retentativas e circuit breaker). Se ele
+        falhar, a última resposta válida da mesma chamada é reaproveitada.
+        """
+        if self.recordings is not None and self.recordings.replaying:
+            # Sem rede: rate limit, retentativas e circuit breaker não se aplicam
+            return self.recordings.replay(endpoint, params)
+        key = (endpoint, params.get('season'), tuple(sorted(params.items())))
+
+        def fetch() -> Any:
+            # Cada tentativa é medida; retentativas do scheduler aparecem como observações separadas
+            started = time.perf_counter()
+            try:
+                if self.recordings is not None:
+                    return self.recordings.record(endpoint, factory, params)
+                return factory(**params)
+            except Exception as e:
+                UPSTREAM_ERRORS.inc(endpoint=endpoint, error=type(e).__name__)
+                raise
+            finally:
+                UPSTREAM_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+
+        try:
+            result = self._single_flight.do(key, lambda: self.scheduler.call(fetch))
         except Exception as e:
-            print(f"[NBAApiClient] Erro ao buscar stats do time {team_id}: {e}")
-            return None
+            last_good = self._last_good.get(key)
+            if last_good is None:
+                raise
+            UPSTREAM_STALE.inc(endpoint=endpoint)
+            logger.warning("%s indisponível (%s), usando última resposta válida", endpoint, e)
+            return last_good
+        self._last_good.put(key, result)
+        return result
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """Chamadas feitas nesta thread dentro do bloco cedem a vez às interativas."""
+        with self.scheduler.priority(Priority.BACKGROUND):
+            yield
+
+    def data_version(self) -> str:
+        """Identifica os snapshots em uso; muda sempre que jogadores, times ou elencos mudam."""
+        return (
+            f"{self.current_season}:{self._player_stats_cache.version}."
+            f"{self._team_rank_cache.version}.{self._roster_cache.version}.{self._composition_version}"
+        )
+
+    def upstream_stats(self) -> Dict[str, Any]:
+        """Contadores de chamadas à NBA API: coalescência, retentativas e estado do circuito."""
+        return {**self._single_flight.stats(), **self.scheduler.stats()}
+
+    def _read_through(
+        self,
+        season: str,
+        download: Callable[[str], pd.DataFrame],
+        load: Optional[Callable[[str], Optional[Tuple[pd.DataFrame, datetime]]]],
+        save: Optional[Callable[[str, pd.DataFrame], None]]
+    ) -> pd.DataFrame:
+        """Lê do SQLite se estiver fresco; senão baixa da NBA API e grava de volta.
+
+        Se a NBA API falhar, dados persistidos expirados ainda são melhores que nada.
+        """
+        stored = None
+        if load is not None:
+            try:
+                stored = load(season)
+            except Exception as e:
+                logger.error("Erro ao ler cache persistido %s: %s", season, e)
+            if stored is not None and StatsRepository.is_fresh(stored[1], self._cache_ttl_seconds):
+                return stored[0]
+
+        try:
+            df = download(season)
+        except Exception as e:
+            if stored is None:
+                raise
+            logger.warning("NBA API indisponível (%s), usando cache persistido de %s", e, season)
+            return stored[0]
+
+        if save is not None:
+            self._persist(save, season, df)
+        return df
+
+    @staticmethod
+    def _persist(save: Callable[[str, pd.DataFrame], None], season: str, df: pd.DataFrame) -> None:
+        try:
+            save(season, df)
+        except Exception as e:
+            logger.error("Erro ao gravar cache persistido %s: %s", season, e)
 
     def get_all_teams(self) -> List[Dict[str, Any]]:
-        return teams.get_teams()
+        # Cópia: a lista interna também alimenta o download dos rosters
+        return list(self._teams)
     
     def get_team_roster(self, team_id: int) -> List[Dict[str, Any]]:
+        rosters = self._roster_cache.peek(self.current_season)
+        if rosters is not None and team_id in rosters:
+            return rosters.get(team_id)
         try:
-            roster = commonteamroster.CommonTeamRoster(
+            roster = self._request(
+                "CommonTeamRoster",
+                commonteamroster.CommonTeamRoster,
                 team_id=team_id,
                 season=self.current_season
             )
             df = roster.get_data_frames()[0]
+            if self._composition is not None and 'PLAYER_ID' in df.columns:
+                self._update_composition(self.current_season, {team_id: df['PLAYER_ID'].tolist()})
             return df.to_dict('records')
         except Exception as e:
-            print(f"[NBAApiClient] Erro ao buscar roster {team_id}: {e}")
+            logger.error("Erro ao buscar roster %s: %s", team_id, e)
             return []
\ No newline at end of file
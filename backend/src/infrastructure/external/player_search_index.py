@@ -0,0 +1,96 @@
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+NGRAM_SIZE = 3
+
+# Faixas de relevância: nome começa com o termo > algum sobrenome começa com o termo > substring
+_TIER_FULL_PREFIX = 0
+_TIER_TOKEN_PREFIX = 1
+_TIER_SUBSTRING = 2
+
+
+def normalize_name(name: str) -> str:
+    """Minúsculas, sem acentos e sem pontuação ("Nikola Jokić" -> "nikola jokic")."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    cleaned = "".join(c if c.isalnum() else " " for c in folded)
+    return " ".join(cleaned.split())
+
+
+class PlayerSearchIndex:
+    """Índice de busca por nome de jogador construído uma única vez.
+
+    Os jogadores são ordenados (ativos primeiro, depois por nome) e cada
+    bigrama/trigrama aponta para a lista ordenada de jogadores que o contém.
+    Uma busca percorre apenas a lista do n-grama mais raro do termo e para
+    assim que os k melhores resultados estão garantidos.
+    """
+
+    def __init__(self, players: List[Dict[str, Any]]):
+        self._players = sorted(
+            players,
+            key=lambda p: (not p.get('is_active', False), normalize_name(p['full_name']))
+        )
+        self._names = [normalize_name(p['full_name']) for p in self._players]
+        self._active = [bool(p.get('is_active', False)) for p in self._players]
+        self._postings: Dict[str, List[int]] = {}
+
+        for ordinal, name in enumerate(self._names):
+            grams = set()
+            for size in (2, NGRAM_SIZE):
+                grams.update(name[i:i + size] for i in range(len(name) - size + 1))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(ordinal)
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def search(self, query: str, limit: int = 10, active_only: bool = False) -> List[Dict[str, Any]]:
+        term = normalize_name(query)
+        if not term or limit <= 0:
+            return []
+
+        candidates = self._candidates(term)
+        buckets: List[List[int]] = [[], [], []]
+
+        for ordinal in candidates:
+            if active_only and not self._active[ordinal]:
+                # Inativos vêm depois de todos os ativos na ordenação
+                break
+            name = self._names[ordinal]
+            position = name.find(term)
+            if position < 0:
+                continue
+
+            tier = self._tier(name, term, position)
+            if len(buckets[tier]) < limit:
+                buckets[tier].append(ordinal)
+            if len(buckets[_TIER_FULL_PREFIX]) >= limit:
+                break
+
+        ranked = buckets[_TIER_FULL_PREFIX] + buckets[_TIER_TOKEN_PREFIX] + buckets[_TIER_SUBSTRING]
+        return [self._players[ordinal] for ordinal in ranked[:limit]]
+
+    def _candidates(self, term: str) -> Any:
+        if len(term) < 2:
+            return range(len(self._names))
+
+        size = min(len(term), NGRAM_SIZE)
+        rarest: Optional[List[int]] = None
+        for i in range(len(term) - size + 1):
+            posting = self._postings.get(term[i:i + size])
+            if posting is None:
+                return ()
+            if rarest is None or len(posting) < len(rarest):
+                rarest = posting
+        return rarest or ()
+
+    @staticmethod
+    def _tier(name: str, term: str, position: int) -> int:
+        if position == 0:
+            return _TIER_FULL_PREFIX
+        if name[position - 1] == " ":
+            return _TIER_TOKEN_PREFIX
+        if name.find(" " + term) >= 0:
+            return _TIER_TOKEN_PREFIX
+        return _TIER_SUBSTRING
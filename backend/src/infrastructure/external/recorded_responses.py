@@ -0,0 +1,145 @@
+"""Respostas da NBA API gravadas em JSON, para rodar sem acesso ao stats.nba.com.
+
+Cada endpoint (LeagueDashPlayerStats, LeagueDashTeamStats, CommonTeamRoster,
+CommonPlayerInfo, PlayerIndex) tem um arquivo `<Endpoint>.json` no diretório
+de gravações. O arquivo mapeia os parâmetros da chamada ao JSON bruto da
+resposta (`get_dict()` do nba_api).
+
+- record: chamadas ainda não gravadas vão à NBA API uma vez e a resposta fica
+  em memória até `flush()`, que regrava cada arquivo alterado uma única vez;
+  as já gravadas são servidas do disco;
+- replay: tudo vem do disco e uma chamada não gravada é um erro, nunca rede.
+
+Os arquivos são lidos sob demanda, uma única vez cada, no primeiro acesso ao
+endpoint. Assim benchmarks e testes de carga medem o nosso código, não a rede.
+"""
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import pandas as pd
+
+from src.core.files import write_json_atomic
+
+MODES = ("record", "replay")
+
+
+class RecordingNotFound(LookupError):
+    """Chamada sem resposta gravada (modo replay)."""
+
+
+class RecordedResponse:
+    """Resposta gravada com a mesma interface de leitura dos endpoints do nba_api."""
+
+    def __init__(self, payload: Dict[str, Any]):
+        self._payload = payload
+
+    def get_dict(self) -> Dict[str, Any]:
+        return self._payload
+
+    def get_data_frames(self) -> List[pd.DataFrame]:
+        return [
+            pd.DataFrame(result["rowSet"], columns=result["headers"]) if result.get("headers") else pd.DataFrame()
+            for result in self._result_sets()
+        ]
+
+    def get_normalized_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            result["name"]: [dict(zip(result["headers"], row)) for row in result["rowSet"]]
+            for result in self._result_sets()
+        }
+
+    def _result_sets(self) -> List[Dict[str, Any]]:
+        results = self._payload.get("resultSets", self._payload.get("resultSet", []))
+        return [results] if isinstance(results, dict) else results
+
+
+class RecordedResponses:
+    """Diretório de respostas gravadas, em modo record ou replay."""
+
+    def __init__(self, directory: str, mode: str = "replay"):
+        if mode not in MODES:
+            raise ValueError(f"Modo de gravação inválido: {mode} (use {' ou '.join(MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self._endpoints: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Endpoints com respostas novas ainda não gravadas em disco
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+        self.files_loaded = 0
+        self.recorded = 0
+        if mode == "record":
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def replay(self, endpoint: str, params: Dict[str, Any]) -> RecordedResponse:
+        """Resposta gravada da chamada; RecordingNotFound se ela nunca foi gravada."""
+        payload = self._lookup(endpoint, params)
+        if payload is None:
+            raise RecordingNotFound(
+                f"Sem resposta gravada para {endpoint}({request_key(params)}) em {self.directory}"
+            )
+        return RecordedResponse(payload)
+
+    def record(self, endpoint: str, factory: Callable[..., Any], params: Dict[str, Any]) -> Any:
+        """Serve a gravação existente ou chama a NBA API e guarda a resposta até o flush."""
+        payload = self._lookup(endpoint, params)
+        if payload is not None:
+            return RecordedResponse(payload)
+        response = factory(**params)
+        with self._lock:
+            self._endpoints[endpoint][request_key(params)] = response.get_dict()
+            self._dirty.add(endpoint)
+            self.recorded += 1
+        return response
+
+    def flush(self) -> List[str]:
+        """Grava em disco os endpoints com respostas novas; devolve quais foram gravados.
+
+        Um arquivo por endpoint, reescrito uma vez por flush: gravar a cada
+        resposta custaria reescrever (e dar fsync em) um JSON que só cresce.
+        """
+        with self._lock:
+            written = sorted(self._dirty)
+            for endpoint in written:
+                write_json_atomic(self._path(endpoint), self._endpoints[endpoint])
+            self._dirty.clear()
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "files_loaded": self.files_loaded,
+                "responses": sum(len(r) for r in self._endpoints.values()),
+                "recorded": self.recorded,
+                "pending_files": len(self._dirty)
+            }
+
+    def _lookup(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            recordings = self._endpoints.get(endpoint)
+            if recordings is None:
+                recordings = self._endpoints[endpoint] = self._load(endpoint)
+            return recordings.get(request_key(params))
+
+    def _load(self, endpoint: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._path(endpoint), encoding="utf-8") as f:
+                recordings = json.load(f)
+        except FileNotFoundError:
+            return {}
+        self.files_loaded += 1
+        return recordings
+
+    def _path(self, endpoint: str) -> str:
+        return os.path.join(self.directory, f"{endpoint}.json")
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """Chave estável dos parâmetros: `per_mode_detailed=PerGame&season=2024-25`."""
+    return "&".join(f"{name}={value}" for name, value in sorted(params.items()))
@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SeasonCache(Generic[T]):
+    """Cache em memória de dados por temporada, com TTL e refresh single-flight."""
+
+    def __init__(self, loader: Callable[[str], T], ttl_seconds: float, retry_seconds: float = 30.0):
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        # Depois de um refresh falho, o snapshot anterior vale por mais este tempo
+        self._retry_seconds = min(retry_seconds, ttl_seconds)
+        self._entries: Dict[str, Tuple[T, float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # Incrementada a cada snapshot trocado; identifica os dados servidos
+        self.version = 0
+
+    def get(self, season: str) -> T:
+        """Retorna o snapshot da temporada, carregando-o se ausente ou expirado.
+
+        Apenas uma thread por temporada executa o loader; as demais aguardam e
+        reutilizam o resultado. Se o refresh falhar, o último snapshot válido
+        continua sendo servido e o loader só é tentado de novo após
+        `retry_seconds`: com o upstream fora, as requisições não fazem fila
+        atrás de uma chamada lenta que vai falhar.
+        """
+        entry = self._entries.get(season)
+        if entry is not None and not self._is_expired(entry):
+            return entry[0]
+
+        with self._lock_for(season):
+            entry = self._entries.get(season)
+            if entry is not None and not self._is_expired(entry):
+                return entry[0]
+
+            try:
+                value = self._loader(season)
+            except Exception as e:
+                if entry is None:
+                    raise
+                logger.warning("Refresh da temporada %s falhou, usando snapshot anterior: %s", season, e)
+                # Mesmo snapshot (versão inalterada), expirando daqui a retry_seconds
+                self._entries[season] = (entry[0], time.monotonic() - self._ttl_seconds + self._retry_seconds)
+                return entry[0]
+
+            self._entries[season] = (value, time.monotonic())
+            self.version += 1
+            return value
+
+    def put(self, season: str, value: T) -> None:
+        """Substitui o snapshot da temporada de uma vez; leitores veem o antigo ou o novo."""
+        self._entries[season] = (value, time.monotonic())
+        self.version += 1
+
+    def peek(self, season: str) -> Optional[T]:
+        """Retorna o snapshot em cache sem disparar carregamento."""
+        entry = self._entries.get(season)
+        return entry[0] if entry is not None else None
+
+    def invalidate(self, season: Optional[str] = None) -> None:
+        if season is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(season, None)
+        self.version += 1
+
+    def _is_expired(self, entry: Tuple[T, float]) -> bool:
+        return time.monotonic() - entry[1] >= self._ttl_seconds
+
+    def _lock_for(self, season: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(season)
+            if lock is None:
+                lock = self._locks[season] = threading.Lock()
+            return lock
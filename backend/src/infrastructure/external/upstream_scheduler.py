@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Falhas que indicam upstream sobrecarregado ou fora do ar. O stats.nba.com
+# responde ao throttling com timeout ou com corpo vazio/HTML (JSON inválido).
+TRANSIENT_ERRORS: Tuple[type, ...] = (OSError, json.JSONDecodeError)
+
+
+class Priority(IntEnum):
+    """Menor valor = atendido primeiro."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class CircuitOpenError(Exception):
+    """O circuito está aberto: a NBA API não é chamada até o próximo teste."""
+
+
+class CircuitBreaker:
+    """Abre após `failure_threshold` falhas seguidas e testa de novo após `reset_timeout`.
+
+    Aberto, recusa chamadas imediatamente. Passado o `reset_timeout`, deixa
+    uma única chamada de teste passar (meio-aberto): sucesso fecha o
+    circuito, falha o reabre.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+class UpstreamScheduler:
+    """Ritmo, prioridade e retentativas das chamadas à NBA API.
+
+    - Token bucket compartilhado por todos os endpoints (`rate_per_second`,
+      rajadas de até `burst`).
+    - Quem espera por um token fica numa fila de prioridade: requisições
+      interativas passam na frente dos refreshes em segundo plano.
+    - Falhas transitórias são repetidas com backoff exponencial com jitter.
+    - Um circuit breaker corta as chamadas quando o upstream está fora do ar,
+      para que o cliente sirva o último snapshot válido sem esperar timeouts.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        max_retries: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        breaker: CircuitBreaker,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = breaker
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+
+    @contextmanager
+    def priority(self, level: Priority) -> Iterator[None]:
+        """Define a prioridade das chamadas feitas por esta thread dentro do bloco."""
+        previous = getattr(self._local, "priority", Priority.INTERACTIVE)
+        self._local.priority = level
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def call(self, fn: Callable[[], T], priority: Optional[Priority] = None) -> T:
+        if priority is None:
+            priority = getattr(self._local, "priority", Priority.INTERACTIVE)
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise CircuitOpenError("NBA API indisponível (circuito aberto)")
+
+        attempt = 0
+        while True:
+            self._acquire(priority)
+            self.calls += 1
+            try:
+                result = fn()
+            except TRANSIENT_ERRORS:
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    self.breaker.record_failure()
+                    raise
+                self.retries += 1
+                self._sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except Exception:
+                # O upstream respondeu; o erro é da requisição, não da saúde da API
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "circuit_state": self.breaker.state
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt))
+        # Jitter: espalha as retentativas de threads que falharam juntas
+        return random.uniform(delay / 2, delay)
+
+    def _acquire(self, priority: Priority) -> None:
+        with self._cond:
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                self._refill()
+                at_head = self._waiters[0] == ticket
+                if at_head and self._tokens >= 1:
+                    heapq.heappop(self._waiters)
+                    self._tokens -= 1
+                    self._cond.notify_all()
+                    return
+                # Só o primeiro da fila espera pelo próximo token; os demais esperam a vez
+                self._cond.wait((1 - self._tokens) / self.rate_per_second if at_head else None)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+        self._refilled_at = now
@@ -0,0 +1,120 @@
+"""Pré-cálculo da matriz de encaixe (todos os jogadores × 30 times).
+
+Uso (a partir de backend/):
+    python -m src.jobs.precompute_fit_matrix --workers 8
+"""
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from src.core.config import get_settings
+from src.domain.services.fit_matrix_service import (
+    FitMatrixBuildReport,
+    FitMatrixService,
+    FitMatrixStore,
+    source_fingerprint
+)
+from src.infrastructure.database.connection import init_db
+from src.infrastructure.database.fit_matrix_repository import FitMatrixRepository
+from src.infrastructure.database.stats_repository import StatsRepository
+from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+from src.infrastructure.external.nba_api_client import NBAApiClient
+
+logger = logging.getLogger(__name__)
+
+
+async def precompute_fit_matrix(
+    async_client: AsyncNBAApiClient,
+    store: FitMatrixStore,
+    repository: FitMatrixRepository,
+    workers: Optional[int] = None
+) -> FitMatrixBuildReport:
+    season = async_client.client.current_season
+    player_table, team_stats = await asyncio.gather(
+        async_client.get_player_stats_table(background=True),
+        async_client.get_all_team_stats(background=True)
+    )
+    if not team_stats:
+        raise RuntimeError("Stats dos times indisponíveis")
+    # Lida depois do carregamento: a versão das tabelas usadas no cálculo
+    data_version = async_client.client.data_version()
+
+    loop = asyncio.get_running_loop()
+    matrix, report = await loop.run_in_executor(
+        None, FitMatrixService().build, season, list(player_table.all_stats()), team_stats, workers
+    )
+    await repository.save(matrix)
+    store.replace(matrix, data_version)
+    return report
+
+
+async def rebuild_fit_matrix(
+    async_client: AsyncNBAApiClient,
+    store: FitMatrixStore,
+    repository: FitMatrixRepository,
+    workers: Optional[int] = None
+) -> None:
+    """Recalcula a matriz em uso depois de uma troca de snapshot (nada a fazer se não houver uma)."""
+    if store.matrix is None or store.is_fresh(store.matrix.season, async_client.client.data_version()):
+        return
+    report = await precompute_fit_matrix(async_client, store, repository, workers)
+    logger.info("Matriz recalculada após atualização dos dados: %s células em %.2fs", report.cells, report.seconds)
+
+
+async def warm_fit_matrix(
+    async_client: AsyncNBAApiClient,
+    store: FitMatrixStore,
+    repository: FitMatrixRepository,
+    workers: Optional[int] = None
+) -> None:
+    """Carrega a matriz do SQLite; recalcula se ausente, expirada ou de outros dados da liga."""
+    season = async_client.client.current_season
+    try:
+        player_table, team_stats = await asyncio.gather(
+            async_client.get_player_stats_table(background=True),
+            async_client.get_all_team_stats(background=True)
+        )
+        data_version = async_client.client.data_version()
+        loaded = await repository.load(season)
+        # A matriz do banco só vale para as tabelas em uso agora se saiu exatamente delas
+        if loaded is not None and loaded.source_version == source_fingerprint(
+            list(player_table.all_stats()), team_stats
+        ):
+            store.replace(loaded, data_version)
+            if store.is_fresh(season):
+                logger.info("Matriz %s carregada do banco (%s células)", season, store.matrix.cells)
+                return
+        report = await precompute_fit_matrix(async_client, store, repository, workers)
+        logger.info(
+            "Matriz %s recalculada: %s células em %.2fs (%.0f células/s, %s workers)",
+            season, report.cells, report.seconds, report.cells_per_second, report.workers
+        )
+    except Exception as e:
+        logger.error("Erro ao preparar matriz %s: %s", season, e)
+
+
+async def _main(workers: Optional[int]) -> None:
+    await init_db()
+    settings = get_settings()
+    async_client = AsyncNBAApiClient(NBAApiClient(stats_repository=StatsRepository()))
+    try:
+        report = await precompute_fit_matrix(
+            async_client,
+            FitMatrixStore(settings.fit_matrix_max_age_seconds),
+            FitMatrixRepository(),
+            workers
+        )
+    finally:
+        async_client.shutdown()
+    print(f"Células calculadas: {report.cells}")
+    print(f"Tempo:              {report.seconds:.2f}s")
+    print(f"Workers:            {report.workers}")
+    print(f"Throughput:         {report.cells_per_second:,.0f} células/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pré-calcula a matriz de encaixe jogadores × times")
+    parser.add_argument("--workers", type=int, default=None, help="Processos (padrão: todos os cores)")
+    args = parser.parse_args()
+    asyncio.run(_main(args.workers))
@@ -0,0 +1,60 @@
+"""Grava uma vez as respostas da NBA API usadas pelo simulador, para o modo replay.
+
+Para a temporada atual e a de fallback, baixa as estatísticas de jogadores e
+de times e os rosters de todos os times. Com --player-info, baixa também o
+CommonPlayerInfo de cada jogador da temporada atual. Chamadas já gravadas não
+voltam à rede, então rodar de novo só completa o que falta.
+
+Uso (a partir de backend/):
+    python -m src.jobs.record_nba_api --dir ./nba_api_recordings --player-info
+
+Depois, sem rede: NBA_API_MODE=replay NBA_API_RECORDINGS_DIR=./nba_api_recordings
+"""
+import argparse
+from typing import Any, Dict, Sequence
+
+from src.core.config import get_settings
+from src.infrastructure.external.nba_api_client import NBAApiClient
+from src.infrastructure.external.recorded_responses import RecordedResponses
+
+
+def record_league(client: NBAApiClient, seasons: Sequence[str], player_info: bool = False) -> Dict[str, Any]:
+    """Passa por todas as chamadas do simulador com o cliente em modo record.
+
+    As respostas vão para o disco uma vez, no fim (mesmo se o job for interrompido).
+    """
+    try:
+        for season in seasons:
+            for dataset, load in (
+                ("jogadores", lambda: client.get_player_stats_table(season)),
+                ("times", lambda: client.get_team_rank_table(season)),
+                ("rosters", lambda: client.refresh_roster_table(len(client.get_all_teams()), season=season)),
+            ):
+                try:
+                    load()
+                    print(f"[RecordNBAApi] {dataset} {season} gravados")
+                except Exception as e:
+                    print(f"[RecordNBAApi] Erro ao gravar {dataset} {season}: {e}")
+        if player_info:
+            for stats in client.get_player_stats_table(seasons[0]).all_stats():
+                client.get_player_info(stats.player_id)
+    finally:
+        written = client.recordings.flush()
+        print(f"[RecordNBAApi] {len(written)} arquivos gravados em {client.recordings.directory}")
+    return client.recordings.stats()
+
+
+def _main(directory: str, player_info: bool) -> None:
+    settings = get_settings()
+    # Sem SQLite nem snapshot: tudo precisa passar pela NBA API para ser gravado
+    client = NBAApiClient(recordings=RecordedResponses(directory, mode="record"))
+    stats = record_league(client, [settings.current_season, settings.fallback_season], player_info)
+    print(f"Respostas no diretório: {stats['responses']} ({stats['recorded']} novas)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grava respostas da NBA API para o modo offline")
+    parser.add_argument("--dir", default=get_settings().nba_api_recordings_dir, help="Diretório das gravações")
+    parser.add_argument("--player-info", action="store_true", help="Grava também o CommonPlayerInfo de cada jogador")
+    args = parser.parse_args()
+    _main(args.dir, args.player_info)
@@ -0,0 +1,151 @@
+"""Refresh periódico dos dados da liga em segundo plano.
+
+Iniciado pelo lifespan da aplicação. Cada ciclo baixa jogadores, times e
+rosters fora do event loop, valida o snapshot novo e só então o troca pelo
+atual, de modo que as requisições nunca esperam por um download nem veem
+dados pela metade.
+
+Com o snapshot em disco (LEAGUE_SNAPSHOT_DIR), um segundo laço lê a cada
+`poll_seconds` os ponteiros publicados pelos outros workers e adota as
+versões novas sem baixar nada.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.core.config import get_settings
+from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshStatus:
+    last_success_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    size: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+class LeagueDataRefresher:
+    """Recarrega os snapshots da temporada atual a cada `interval_seconds`."""
+
+    DATASETS = ("player_stats", "team_stats", "rosters")
+
+    def __init__(
+        self,
+        async_client: AsyncNBAApiClient,
+        interval_seconds: Optional[float] = None,
+        min_player_rows: Optional[int] = None,
+        min_team_rows: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        on_refresh: Optional[Callable[[], Awaitable[None]]] = None
+    ):
+        settings = get_settings()
+        self.async_client = async_client
+        self.interval_seconds = interval_seconds or settings.league_refresh_interval_seconds
+        self.min_player_rows = min_player_rows if min_player_rows is not None else settings.league_refresh_min_player_rows
+        self.min_team_rows = min_team_rows if min_team_rows is not None else settings.league_refresh_min_team_rows
+        self.poll_seconds = poll_seconds if poll_seconds is not None else (
+            settings.league_snapshot_poll_seconds if settings.league_snapshot_dir else 0
+        )
+        # Chamado depois de cada ciclo que trocou dados (ex.: recalcular a fit matrix)
+        self.on_refresh = on_refresh
+        self.status: Dict[str, RefreshStatus] = {name: RefreshStatus() for name in self.DATASETS}
+        self.snapshots_adopted = 0
+        self._task: Optional[asyncio.Task] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._loop())
+        if self.poll_seconds > 0:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        for task in (self._task, self._watch_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._watch_task = None
+
+    async def refresh_once(self) -> None:
+        client = self.async_client
+        await self._refresh(
+            "player_stats", lambda: client.refresh_player_stats_table(self.min_player_rows)
+        )
+        await self._refresh(
+            "team_stats", lambda: client.refresh_team_rank_table(self.min_team_rows)
+        )
+        await self._refresh(
+            "rosters", lambda: client.refresh_roster_table(self.min_team_rows)
+        )
+
+    async def _loop(self) -> None:
+        # Jogadores e times já carregam sob demanda (ou no warm da fit matrix); os
+        # rosters, que alimentam a composição dos elencos, só chegam por aqui
+        version = self._data_version()
+        await self._refresh(
+            "rosters", lambda: self.async_client.refresh_roster_table(self.min_team_rows)
+        )
+        await self._notify_if_changed(version)
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            version = self._data_version()
+            await self.refresh_once()
+            await self._notify_if_changed(version)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                updated = await self.async_client.sync_snapshots()
+            except Exception as e:
+                logger.error("Erro ao ler snapshots publicados: %s", e)
+                continue
+            self.snapshots_adopted += len(updated)
+            if updated:
+                await self._notify_if_changed(None)
+
+    def _data_version(self) -> str:
+        return self.async_client.client.data_version()
+
+    async def _notify_if_changed(self, previous: Optional[str]) -> None:
+        if self.on_refresh is None or previous == self._data_version():
+            return
+        try:
+            await self.on_refresh()
+        except Exception as e:
+            logger.error("Erro ao reagir à atualização dos dados: %s", e)
+
+    async def _refresh(self, name: str, load: Callable[[], Awaitable[object]]) -> None:
+        status = self.status[name]
+        started = time.perf_counter()
+        try:
+            snapshot = await load()
+        except Exception as e:
+            status.failures += 1
+            status.last_error = str(e)
+            logger.error("Erro ao atualizar %s, mantendo snapshot anterior: %s", name, e)
+            return
+
+        status.last_duration_seconds = time.perf_counter() - started
+        status.last_success_at = datetime.utcnow()
+        status.size = len(snapshot)
+        status.last_error = None
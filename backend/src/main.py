@@ -1,23 +1,88 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import get_settings
+from src.core.metrics import REGISTRY
+from src.core.process_memory import read_process_memory
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.response_cache import ResponseCacheMiddleware
+from src.api import dependencies
 from src.api.routes import simulation
-from src.infrastructure.database.connection import init_db
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Diagnósticos dos serviços e jobs (módulos src.*); o uvicorn só configura os loggers dele
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:     [%(name)s] %(message)s")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia o ciclo de vida da aplicação"""
-    # Startup
+    # Startup: o schema vem antes de qualquer requisição (SQLite local, rápido);
+    # os serviços sobem em segundo plano, então /health responde antes de
+    # nba_api e pandas terminarem de importar
+    from src.infrastructure.database.connection import init_db
+
     await init_db()
+    startup = asyncio.create_task(_start_services())
     print(f"🏀 {settings.app_name} iniciado!")
     yield
     # Shutdown
     print("👋 Encerrando aplicação...")
+    startup.cancel()
+    await asyncio.gather(startup, return_exceptions=True)
+    league_refresher = dependencies.get_league_refresher.peek()
+    if league_refresher is not None:
+        await league_refresher.stop()
+    history_recorder = dependencies.get_history_recorder.peek()
+    if history_recorder is not None:
+        await history_recorder.stop()
+    trade_search_service = dependencies.get_trade_search_service.peek()
+    if trade_search_service is not None:
+        trade_search_service.shutdown()
+    async_nba_client = dependencies.get_async_nba_client.peek()
+    if async_nba_client is not None:
+        async_nba_client.shutdown()
+    nba_client = dependencies.get_nba_client.peek()
+    if nba_client is not None and nba_client.recordings is not None:
+        # Modo record: respostas baixadas pelo servidor só vão ao disco aqui
+        nba_client.recordings.flush()
+
+
+async def _start_services() -> None:
+    """Constrói os serviços numa thread e inicia as tarefas de fundo."""
+    try:
+        await asyncio.to_thread(dependencies.load_services)
+        dependencies.get_history_recorder.get().start()
+        if settings.league_refresh_enabled:
+            dependencies.get_league_refresher.get().start()
+        if settings.fit_matrix_on_startup:
+            from src.jobs.precompute_fit_matrix import warm_fit_matrix
+
+            await warm_fit_matrix(
+                dependencies.get_async_nba_client.get(),
+                dependencies.get_fit_matrix_store.get(),
+                dependencies.get_fit_matrix_repository.get(),
+                settings.fit_matrix_workers
+            )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("Erro ao iniciar serviços: %s", e)
+
+
+def _data_version() -> Optional[str]:
+    # Roda no event loop a cada requisição cacheável: nunca constrói o cliente aqui.
+    # Antes do startup terminar não há versão, e o cache é ignorado.
+    nba_client = dependencies.get_nba_client.peek()
+    return nba_client.data_version() if nba_client is not None else None
 
 
 app = FastAPI(
@@ -27,6 +92,16 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Cache de respostas: registrado antes do CORS para ficar por dentro dele
+if settings.response_cache_enabled:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=simulation.response_cache,
+        version=_data_version,
+        paths=[f"^{settings.api_prefix}{route}" for route in simulation.CACHEABLE_ROUTES],
+        max_age_seconds=settings.response_cache_max_age_seconds
+    )
+
 # Configurar CORS para o frontend Angular
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +114,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métricas por último: é o middleware mais externo e mede também os hits de cache
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Registrar rotas
 app.include_router(
     simulation.router,
@@ -60,4 +139,69 @@ async def root():
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Endpoint de saúde da API"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        """Métricas no formato texto do Prometheus"""
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+def _collect_runtime_metrics():
+    """Lê os contadores já mantidos pelos caches e pelo cliente da NBA API."""
+    # Serviços ainda não construídos ficam de fora: a coleta não força o import deles
+    nba_client = dependencies.get_nba_client.peek()
+    if nba_client is not None:
+        yield from _upstream_metrics(nba_client.upstream_stats())
+
+    # Cada worker do uvicorn é um processo: o pid separa as séries de cada um
+    memory = read_process_memory()
+    worker = {"pid": str(memory["pid"])}
+    yield ("process_resident_memory_bytes", "gauge", "RSS do worker", worker, memory["rss_bytes"])
+    yield (
+        "process_proportional_memory_bytes", "gauge",
+        "PSS do worker (páginas compartilhadas divididas entre os processos)", worker, memory["pss_bytes"]
+    )
+    snapshots = nba_client.snapshot_status() if nba_client is not None else []
+    for entry in snapshots:
+        yield (
+            "league_snapshot_mapped_bytes", "gauge", "Bytes do snapshot da liga mapeados do disco",
+            {"dataset": entry["dataset"], "season": entry["season"]}, entry["mapped_bytes"]
+        )
+
+    caches = [dict(simulation.response_cache.stats(), name="http_response")]
+    fit_simulator = dependencies.get_fit_simulator.peek()
+    if fit_simulator is not None:
+        caches += fit_simulator.cache_stats()
+    for stats in caches:
+        labels = {"cache": stats["name"]}
+        lookups = stats["hits"] + stats["misses"]
+        yield ("cache_hits_total", "counter", "Consultas atendidas pelo cache", labels, stats["hits"])
+        yield ("cache_misses_total", "counter", "Consultas não atendidas pelo cache", labels, stats["misses"])
+        yield ("cache_evictions_total", "counter", "Itens removidos por falta de espaço", labels, stats["evictions"])
+        yield (
+            "cache_hit_ratio", "gauge", "Fração de consultas atendidas pelo cache", labels,
+            stats["hits"] / lookups if lookups else 0.0
+        )
+
+
+def _upstream_metrics(upstream: dict):
+    for name, documentation in (
+        ("calls", "Chamadas à NBA API (inclui retentativas)"),
+        ("retries", "Retentativas após falhas transitórias"),
+        ("failures", "Chamadas que falharam após todas as retentativas"),
+        ("short_circuited", "Chamadas recusadas com o circuito aberto"),
+        ("coalesced", "Chamadas atendidas por um download idêntico em andamento"),
+    ):
+        yield (f"nba_upstream_{name}_total", "counter", documentation, {}, upstream[name])
+    yield ("nba_upstream_in_flight", "gauge", "Downloads da NBA API em andamento", {}, upstream["in_flight"])
+    yield (
+        "nba_upstream_circuit_open", "gauge", "1 se o circuit breaker não estiver fechado", {},
+        int(upstream["circuit_state"] != "closed")
+    )
+
+
+if settings.metrics_enabled:
+    REGISTRY.register_collector(_collect_runtime_metrics)
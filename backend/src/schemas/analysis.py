@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from pydantic import BaseModel, Field
 
 
@@ -92,6 +92,8 @@ class TeamStats(BaseModel):
     pace: float = 100.0
     fg3_pct: float = 0.35
     ball_dominant_count: int = 0
+    # Quem são os ball dominant do elenco: o jogador avaliado não conta contra o próprio time
+    ball_dominant_ids: Tuple[int, ...] = Field(default=(), exclude=True)
 
 
 class TeamNeeds(BaseModel):
@@ -1,6 +1,7 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
-from src.schemas.analysis import TradeResult, FitLabel
+from typing import Any, List, Optional
+from src.schemas.analysis import TradeResult, FitLabel, TeamStats
 
 # Manter FitVerdict para compatibilidade ou migrar para FitLabel
 # Vamos usar FitLabel como o novo padrão
@@ -10,7 +11,184 @@ class SimulationRequest(BaseModel):
     player_id: int = Field(..., description="ID do jogador na NBA API")
     team_id: int = Field(..., description="ID do time alvo")
 
+
+class BatchSimulationRequest(BaseModel):
+    """Request para simular um jogador contra vários times"""
+    player_id: int = Field(..., description="ID do jogador na NBA API")
+    team_ids: Optional[List[int]] = Field(
+        default=None,
+        description="IDs dos times alvo; omitido = todos os times da liga"
+    )
+
+class TradeMove(BaseModel):
+    """Um jogador saindo de um time para outro"""
+    player_id: int = Field(..., description="ID do jogador na NBA API")
+    from_team_id: int = Field(..., description="Time atual do jogador")
+    to_team_id: int = Field(..., description="Time de destino")
+
+
+class TradeSimulationRequest(BaseModel):
+    """Request para simular uma troca envolvendo dois ou mais times"""
+    moves: List[TradeMove] = Field(..., min_length=1, description="Movimentações da troca")
+
 # SimulationResponse agora é um alias ou extensão de TradeResult
 class SimulationResponse(TradeResult):
     """Response com resultado da simulação de encaixe (Estendido)"""
-    pass
+
+    @classmethod
+    def from_record(cls, record: Any) -> "SimulationResponse":
+        """Converte um FitRecord do domínio, validando a árvore inteira uma única vez."""
+        if isinstance(record, cls):
+            return record
+        return cls.model_validate(record, from_attributes=True)
+
+
+class TradeTeamImpact(BaseModel):
+    """Perfil de um time antes e depois da troca"""
+    team_id: int
+    team_name: str
+    outgoing_player_ids: List[int] = Field(default_factory=list)
+    incoming_player_ids: List[int] = Field(default_factory=list)
+    stats_before: TeamStats
+    stats_after: TeamStats
+    needs_before: List[str] = Field(default_factory=list)
+    needs_after: List[str] = Field(default_factory=list)
+
+
+class TradeSimulationResponse(BaseModel):
+    """Resultado da troca: impacto em cada time e encaixe de cada jogador recebido"""
+    teams: List[TradeTeamImpact]
+    incoming: List[SimulationResponse]
+    elapsed_ms: float
+
+
+class ResponseCacheStatsResponse(BaseModel):
+    """Ocupação e eficácia do cache de respostas HTTP"""
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    data_version: str
+
+
+class MemoCacheStatsResponse(BaseModel):
+    """Ocupação e eficácia de um cache de memoização do FitSimulator"""
+    name: str
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class ScanProgressResponse(BaseModel):
+    """Evento de progresso das varreduras da liga em streaming"""
+    scanned: int
+    total: int
+    elapsed_ms: float
+
+
+class TradeSearchRequest(BaseModel):
+    """Request para buscar trocas que melhorem o encaixe de um time"""
+    team_id: int = Field(..., description="Time que recebe o jogador")
+    limit: int = Field(10, ge=1, le=50, description="Número de trocas retornadas")
+    position: Optional[str] = Field(None, description="Posição do jogador recebido (G, F, C)")
+    min_minutes: float = Field(15.0, ge=0, le=48, description="Minutagem mínima do jogador recebido")
+    max_minutes_gap: float = Field(8.0, ge=0, le=48, description="Diferença máxima de minutos entre quem sai e quem chega")
+    max_outgoing: int = Field(2, ge=1, le=2, description="1 = só trocas 1-por-1; 2 = inclui 2-por-1")
+
+
+class TradeCandidateResponse(BaseModel):
+    incoming_player_id: int
+    partner_team_id: int
+    outgoing_player_ids: List[int]
+    target_fit: int
+    partner_fit: float
+    combined_fit: float
+
+
+class TradeSearchResponse(BaseModel):
+    """Melhores trocas encontradas até o momento e progresso da busca"""
+    candidates: List[TradeCandidateResponse]
+    evaluated: int
+    pruned: int
+    completed_chunks: int
+    total_chunks: int
+    candidates_per_second: float
+    done: bool
+
+
+class FitSummaryResponse(BaseModel):
+    """Resumo do encaixe servido pela matriz pré-calculada"""
+    player_id: int
+    team_id: int
+    season: str
+    fit_score: int = Field(..., ge=0, le=100)
+    fit_label: FitLabel
+    projected_role: str
+    source: str = Field(..., description="'matrix' (pré-calculado) ou 'computed' (recalculado)")
+
+
+class SimulationHistoryEntry(BaseModel):
+    """Simulação registrada no histórico"""
+    id: int
+    player_id: int
+    team_id: int
+    fit_score: Optional[int] = None
+    fit_label: str = Field(..., validation_alias="veredito")
+    estimated_minutes: Optional[float] = Field(default=None, validation_alias="minutagem_estimada")
+    explanation: Optional[str] = Field(default=None, validation_alias="explicacao")
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SimulationHistoryPage(BaseModel):
+    """Página do histórico; passe next_cursor como cursor para a próxima página"""
+    items: List[SimulationHistoryEntry] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+class UpstreamStatsResponse(BaseModel):
+    """Contadores das chamadas à NBA API"""
+    issued: int = Field(..., description="Downloads efetivamente disparados")
+    coalesced: int = Field(..., description="Chamadas que reaproveitaram um download em andamento")
+    in_flight: int = Field(..., description="Downloads em andamento agora")
+    calls: int = Field(..., description="Requisições HTTP feitas, incluindo retentativas")
+    retries: int = Field(..., description="Retentativas após falhas transitórias")
+    failures: int = Field(..., description="Chamadas que falharam após todas as retentativas")
+    short_circuited: int = Field(..., description="Chamadas recusadas com o circuito aberto")
+    circuit_state: str = Field(..., description="closed, open ou half_open")
+
+
+class RefreshStatusResponse(BaseModel):
+    """Estado do refresh em segundo plano de um conjunto de dados da liga"""
+    dataset: str
+    last_success_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    size: int = Field(0, description="Linhas (jogadores/times) ou rosters do último snapshot")
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+class LeagueSnapshotEntry(BaseModel):
+    """Versão do snapshot em disco mapeada por este worker"""
+    dataset: str
+    season: str
+    version: str
+    mapped_bytes: int = Field(..., description="Bytes das colunas servidos direto do arquivo mapeado")
+
+
+class WorkerMemoryResponse(BaseModel):
+    """Memória do worker que atendeu a requisição e snapshots que ele usa"""
+    pid: int
+    rss_bytes: int
+    pss_bytes: int = Field(..., description="RSS com as páginas compartilhadas divididas entre os processos")
+    shared_bytes: int
+    private_bytes: int
+    snapshots_adopted: int = Field(..., description="Versões publicadas por outros workers e adotadas")
+    snapshots: List[LeagueSnapshotEntry]
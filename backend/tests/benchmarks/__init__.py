@@ -0,0 +1,3 @@
+# /nba-trade-fit-simulator/nba-trade-fit-simulator/backend/tests/benchmarks/__init__.py
+
+# This file is intentionally left blank.
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""Benchmarks com baseline em JSON: uma regressão de desempenho falha o pytest.
+
+Cada benchmark mede o menor tempo por chamada entre várias rodadas (o mínimo
+é o número menos sensível ao ruído da máquina) e o compara com a entrada de
+mesmo nome em `baselines.json`. Passar de baseline × (1 + tolerância) em
+três tentativas seguidas falha o teste.
+
+Antes de cada tentativa, uma carga de referência fixa (Python puro) é medida.
+Se a máquina estiver mais lenta do que quando a baseline foi gravada, o
+limite cresce na mesma proporção: um momento de CPU disputada (ou uma máquina
+mais lenta) não vira falsa regressão.
+
+    pytest tests/benchmarks                    # compara com as baselines
+    pytest tests/benchmarks --bench-save       # regrava as baselines nesta máquina
+    pytest -m "not benchmark"                  # só os testes de correção
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import pytest
+
+from src.domain.entities.analysis import PlayerStatsRecord
+from src.domain.services.fit_simulator import FitSimulator
+from src.schemas.analysis import PlayerAdvancedStats, TeamStats
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_TOLERANCE = 0.5
+ROUNDS = 7
+# Acima do limite, mede de novo: uma regressão real persiste, um pico de ruído não
+ATTEMPTS = 3
+# Cada rodada repete a chamada até somar ao menos isto, para o timer não dominar
+MIN_ROUND_SECONDS = 0.01
+
+_measured: Dict[str, Dict[str, float]] = {}
+
+
+class Benchmark:
+    """Mede uma função (ou corrotina) e compara com a baseline do teste."""
+
+    def __init__(self, name: str, baseline: Optional[Dict[str, float]], tolerance: float, save: bool):
+        self.name = name
+        # {"seconds": tempo por chamada, "reference": carga de referência medida junto}
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.save = save
+        self.seconds: Optional[float] = None
+        self.reference: Optional[float] = None
+        self.limit: Optional[float] = None
+
+    def __call__(self, fn: Callable[..., Any], *args: Any) -> float:
+        number = 1
+        while self._round(fn, args, number) < MIN_ROUND_SECONDS:
+            number *= 2
+        best = float("inf")
+        for _ in range(ATTEMPTS):
+            self._scale_limit()
+            best = min([best] + [self._round(fn, args, number) / number for _ in range(ROUNDS)])
+            if not self._regressed(best):
+                break
+        return self._check(best)
+
+    async def run_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> float:
+        number = 1
+        while await self._round_async(fn, args, number) < MIN_ROUND_SECONDS:
+            number *= 2
+        best = float("inf")
+        for _ in range(ATTEMPTS):
+            self._scale_limit()
+            for _ in range(ROUNDS):
+                best = min(best, await self._round_async(fn, args, number) / number)
+            if not self._regressed(best):
+                break
+        return self._check(best)
+
+    @staticmethod
+    def _round(fn: Callable[..., Any], args: tuple, number: int) -> float:
+        # Como no timeit: sem coletas do GC no meio da medição
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                fn(*args)
+            return time.perf_counter() - started
+        finally:
+            gc.enable()
+
+    @staticmethod
+    async def _round_async(fn: Callable[..., Awaitable[Any]], args: tuple, number: int) -> float:
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                await fn(*args)
+            return time.perf_counter() - started
+        finally:
+            gc.enable()
+
+    def _scale_limit(self) -> None:
+        self.reference = reference_seconds()
+        if self.baseline is not None:
+            # Só afrouxa: um instante rápido da máquina não aperta o limite
+            speed = max(1.0, self.reference / self.baseline["reference"])
+            self.limit = max(self.limit or 0.0, self.baseline["seconds"] * speed * (1 + self.tolerance))
+
+    def _regressed(self, seconds: float) -> bool:
+        if self.save or self.limit is None:
+            return False
+        return seconds > self.limit
+
+    def _check(self, seconds: float) -> float:
+        self.seconds = seconds
+        _measured[self.name] = {"seconds": seconds, "reference": self.reference}
+        if self._regressed(seconds):
+            pytest.fail(
+                f"Regressão em {self.name}: {seconds * 1e6:.1f} µs por chamada, baseline "
+                f"{self.baseline['seconds'] * 1e6:.1f} µs, limite nesta máquina {self.limit * 1e6:.1f} µs "
+                f"(+{self.tolerance:.0%}, {ATTEMPTS} tentativas). "
+                f"Se a mudança é esperada, regrave com --bench-save.",
+                pytrace=False
+            )
+        return seconds
+
+
+def reference_seconds() -> float:
+    """Mediana do tempo de uma carga fixa de Python puro: a régua da velocidade da máquina."""
+    def workload() -> int:
+        table: Dict[int, int] = {}
+        for i in range(2000):
+            table[i % 97] = table.get(i % 97, 0) + i * 3
+        return sum(table.values())
+
+    return statistics.median(Benchmark._round(workload, (), 1) for _ in range(ROUNDS))
+
+
+@pytest.fixture(scope="session")
+def bench_baselines(request) -> Dict[str, Any]:
+    try:
+        with open(BASELINES_PATH, encoding="utf-8") as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        stored = {"tolerance": DEFAULT_TOLERANCE, "benchmarks": {}}
+    yield stored
+    if request.config.getoption("--bench-save") and _measured:
+        stored = dict(
+            stored,
+            python=platform.python_version(),
+            machine=platform.machine(),
+            benchmarks=dict(sorted({**stored.get("benchmarks", {}), **_measured}.items()))
+        )
+        with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture
+def benchmark(request, bench_baselines) -> Benchmark:
+    """Benchmark chamado pelo nome do teste (sem o prefixo test_)."""
+    name = request.node.name.removeprefix("test_")
+    tolerance = request.config.getoption("--bench-tolerance")
+    return Benchmark(
+        name,
+        bench_baselines.get("benchmarks", {}).get(name),
+        tolerance if tolerance is not None else bench_baselines.get("tolerance", DEFAULT_TOLERANCE),
+        request.config.getoption("--bench-save")
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _measured:
+        return
+    terminalreporter.section("benchmarks (µs por chamada)")
+    for name, measured in sorted(_measured.items()):
+        terminalreporter.write_line(f"{name:<40} {measured['seconds'] * 1e6:10.2f}")
+
+
+class StubNBAClient:
+    """Cliente sem rede: sempre os mesmos dados; `bump()` troca a versão e invalida a memoização."""
+
+    def __init__(self, player_stats: PlayerStatsRecord, team_stats: TeamStats):
+        self.player_stats = player_stats
+        self.team_stats = team_stats
+        self.version = 0
+
+    def bump(self) -> None:
+        self.version += 1
+
+    def data_version(self) -> str:
+        return f"bench:{self.version}"
+
+    def get_player_advanced_stats(self, player_id: int) -> PlayerStatsRecord:
+        return self.player_stats
+
+    def get_team_stats(self, team_id: int) -> TeamStats:
+        return self.team_stats
+
+
+class InlineAsyncClient:
+    """Sem threadpool: mede o pipeline de pontuação, não o agendamento de threads."""
+
+    def __init__(self, client: StubNBAClient):
+        self.client = client
+
+    async def get_player_advanced_stats(self, player_id: int) -> PlayerStatsRecord:
+        return self.client.get_player_advanced_stats(player_id)
+
+    async def get_team_stats(self, team_id: int) -> TeamStats:
+        return self.client.get_team_stats(team_id)
+
+
+def as_record(stats: PlayerAdvancedStats) -> PlayerStatsRecord:
+    """Fixture Pydantic -> registro do pipeline (o que o NBAApiClient devolve)."""
+    return PlayerStatsRecord(**stats.model_dump())
+
+
+@pytest.fixture
+def player_records(
+    sniper_stats, ball_dominant_stats, rim_protector_stats, three_and_d_stats,
+    stretch_big_stats, playmaker_stats, hustle_player_stats
+):
+    return [as_record(s) for s in (
+        sniper_stats, ball_dominant_stats, rim_protector_stats, three_and_d_stats,
+        stretch_big_stats, playmaker_stats, hustle_player_stats
+    )]
+
+
+@pytest.fixture
+def teams(team_needs_shooting, team_needs_defense, team_with_multiple_stars, fast_paced_team, balanced_team):
+    return [team_needs_shooting, team_needs_defense, team_with_multiple_stars, fast_paced_team, balanced_team]
+
+
+@pytest.fixture
+def stub_client(sniper_stats, team_needs_shooting) -> StubNBAClient:
+    return StubNBAClient(as_record(sniper_stats), team_needs_shooting)
+
+
+@pytest.fixture
+def bench_simulator(stub_client) -> FitSimulator:
+    return FitSimulator(nba_client=stub_client, async_client=InlineAsyncClient(stub_client))
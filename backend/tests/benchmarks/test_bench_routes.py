@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.main import app
+from src.api.dependencies import get_fit_simulator, get_nba_client
+from src.api.routes import simulation
+
+pytestmark = pytest.mark.benchmark
+
+TEAMS = [{"id": 100, "full_name": "Bench Team", "abbreviation": "BEN", "city": "Bench"}]
+
+
+@pytest.fixture
+async def api(bench_simulator, stub_client):
+    """Cliente ASGI em processo, com o simulador e o cliente da NBA API trocados pelos stubs"""
+    stub_client.get_all_teams = lambda: TEAMS
+
+    async def simulator():
+        return bench_simulator
+
+    async def nba_client():
+        return stub_client
+
+    app.dependency_overrides[get_fit_simulator] = simulator
+    app.dependency_overrides[get_nba_client] = nba_client
+    # A versão do cache de respostas vem do cliente já construído (peek), não do Depends
+    with patch.object(get_nba_client, "peek", return_value=stub_client):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+    app.dependency_overrides.clear()
+
+
+class TestRoutes:
+    """Tempo por requisição das rotas, do middleware à serialização"""
+
+    async def test_route_health(self, benchmark, api):
+        async def run():
+            assert (await api.get("/health")).status_code == 200
+
+        await benchmark.run_async(run)
+
+    async def test_route_simulate_fit(self, benchmark, api, stub_client):
+        """Sem cache de respostas nem memoização: a rota pontua a cada requisição"""
+        async def run():
+            stub_client.bump()
+            simulation.response_cache.clear()
+            assert (await api.get("/api/v1/simulate-fit?player_id=1&team_id=100")).status_code == 200
+
+        await benchmark.run_async(run)
+
+    async def test_route_simulate_fit_memoized(self, benchmark, api):
+        """Fora do cache de respostas (cada chamada vai ao histórico); a memoização responde"""
+        async def run():
+            assert (await api.get("/api/v1/simulate-fit?player_id=1&team_id=100")).status_code == 200
+
+        await benchmark.run_async(run)
+
+    async def test_route_teams(self, benchmark, api):
+        async def run():
+            simulation.response_cache.clear()
+            assert (await api.get("/api/v1/teams")).status_code == 200
+
+        await benchmark.run_async(run)
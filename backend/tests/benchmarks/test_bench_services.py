@@ -0,0 +1,50 @@
+import pytest
+
+from src.domain.services.player_archetype_service import PlayerArchetypeService
+from src.domain.services.roster_friction_service import RosterFrictionService
+from src.domain.services.team_gap_service import TeamGapService
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestScoringPipeline:
+    """Tempo por chamada de cada etapa da pontuação e do simulate_fit completo"""
+
+    def test_analyze_player(self, benchmark, player_records):
+        service = PlayerArchetypeService()
+
+        def run():
+            for stats in player_records:
+                service.analyze_player(stats)
+
+        benchmark(run)
+
+    def test_analyze_team_needs(self, benchmark, teams):
+        service = TeamGapService()
+
+        def run():
+            for team in teams:
+                service.analyze_team_needs(team)
+
+        benchmark(run)
+
+    def test_analyze_friction(self, benchmark, player_records, teams):
+        service = RosterFrictionService()
+        analyses = [PlayerArchetypeService().analyze_player(stats) for stats in player_records]
+
+        def run():
+            for analysis in analyses:
+                for team in teams:
+                    service.analyze_friction(analysis, team)
+
+        benchmark(run)
+
+    async def test_simulate_fit(self, benchmark, bench_simulator, stub_client):
+        """Sem memoização: cada chamada vê uma versão nova dos dados e pontua do zero"""
+        async def run():
+            stub_client.bump()
+            result = await bench_simulator.simulate_fit(1, 100)
+            assert result.fit_score > 0
+
+        await benchmark.run_async(run)
+
@@ -1,5 +1,7 @@
 import pytest
 from typing import List
+from unittest.mock import Mock
+from src.core.config import get_settings
 from src.schemas.analysis import (
     PlayerAdvancedStats,
     PlayerAnalysis,
@@ -13,6 +15,51 @@ from src.schemas.analysis import (
 )
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "Benchmarks com baseline (tests/benchmarks)")
+    group.addoption(
+        "--bench-save", action="store_true",
+        help="Regrava tests/benchmarks/baselines.json com os tempos desta execução"
+    )
+    group.addoption(
+        "--bench-tolerance", type=float, default=None,
+        help="Fração acima da baseline que ainda passa (padrão: a gravada no arquivo)"
+    )
+
+
+@pytest.fixture(autouse=True)
+def fast_upstream(monkeypatch):
+    """NBA API sem rate limit nem espera entre retentativas nos testes"""
+    monkeypatch.setattr(get_settings(), "nba_api_backoff_base_seconds", 0.0)
+    monkeypatch.setattr(get_settings(), "nba_api_rate_per_second", 10_000.0)
+
+
+@pytest.fixture(autouse=True)
+def empty_response_cache():
+    """Cada teste começa sem respostas HTTP em cache (as rotas são mockadas por teste)"""
+    from src.api.routes import simulation
+
+    cache = simulation.response_cache
+    cache.clear()
+    cache.hits = cache.misses = cache.evictions = 0
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def override_dependency():
+    """Troca um provedor de src.api.dependencies durante o teste (Mock por padrão)"""
+    from src.main import app
+
+    def override(provider, value=None):
+        value = Mock() if value is None else value
+        app.dependency_overrides[provider] = lambda: value
+        return value
+
+    yield override
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture
 def sniper_stats() -> PlayerAdvancedStats:
     return PlayerAdvancedStats(
@@ -216,4 +263,38 @@ def balanced_team() -> TeamStats:
         off_rating_rank=9,
         fg3_pct=0.37,
         ball_dominant_count=1
-    )
\ No newline at end of file
+    )
+
+@pytest.fixture
+def league_player_stats_df():
+    import pandas as pd
+
+    return pd.DataFrame([
+        {"PLAYER_ID": 1, "PLAYER_NAME": "Klay Thompson", "TEAM_ID": 100, "MIN": 32.0, "POSITION": "G",
+         "PTS": 20.0, "FGA": 16.0, "FG_PCT": 0.44, "FG3M": 3.36, "FG3A": 8.0, "FG3_PCT": 0.42,
+         "AST": 2.0, "TOV": 1.5, "REB": 3.5, "OREB": 0.5, "BLK": 0.3, "STL": 0.8,
+         "USG_PCT": 0.22, "AST_PCT": 0.10},
+        {"PLAYER_ID": 3, "PLAYER_NAME": "Rudy Gobert", "TEAM_ID": 101, "MIN": 30.0, "POSITION": "C",
+         "PTS": 12.0, "FGA": 8.0, "FG_PCT": 0.65, "FG3M": 0.0, "FG3A": 0.1, "FG3_PCT": 0.0,
+         "AST": 1.2, "TOV": 1.4, "REB": 12.5, "OREB": 3.5, "BLK": 2.3, "STL": 0.6,
+         "USG_PCT": 0.15, "AST_PCT": 0.08},
+        {"PLAYER_ID": 6, "PLAYER_NAME": "Chris Paul", "TEAM_ID": 102, "MIN": 24.0, "POSITION": "G",
+         "PTS": 12.0, "FGA": 10.0, "FG_PCT": 0.45, "FG3M": 1.11, "FG3A": 3.0, "FG3_PCT": 0.37,
+         "AST": 10.5, "TOV": 2.0, "REB": 4.0, "OREB": 0.4, "BLK": 0.1, "STL": 1.5,
+         "USG_PCT": 0.21, "AST_PCT": 0.45},
+    ])
+
+
+@pytest.fixture
+def league_team_stats_df():
+    import pandas as pd
+
+    # Time i tem o i-ésimo melhor 3P%, rebotes, assistências, pace e ratings
+    return pd.DataFrame([
+        {"TEAM_ID": 100 + i, "TEAM_NAME": f"Team {i + 1}",
+         "FGA": 90.0 - i * 0.2, "FG3M": 14.0 - i * 0.07, "FG3A": 35.0,
+         "FG3_PCT": 0.40 - i * 0.002, "REB": 48.0 - i * 0.2,
+         "AST": 30.0 - i * 0.2, "PACE": 104.0 - i * 0.2,
+         "OFF_RATING": 120.0 - i * 0.3, "DEF_RATING": 108.0 + i * 0.3}
+        for i in range(30)
+    ])
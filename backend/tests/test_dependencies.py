@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.core.config import get_settings
+from src.api.dependencies import get_fit_simulator, get_nba_client, singleton
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyStartup:
+    """Importar a aplicação não constrói serviços nem importa dependências pesadas"""
+
+    def test_import_skips_heavy_modules(self):
+        probe = (
+            "import sys, src.main; "
+            "print(','.join(m for m in ('nba_api', 'pandas', 'sqlalchemy') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    async def test_schema_ready_before_first_request(self):
+        """init_db termina antes do yield do lifespan; só os serviços ficam em segundo plano"""
+        from src import main
+
+        events = []
+        with patch("src.infrastructure.database.connection.init_db", AsyncMock(
+            side_effect=lambda: events.append("init_db")
+        )), patch.object(main, "_start_services", AsyncMock(side_effect=lambda: events.append("services"))):
+            async with main.lifespan(main.app):
+                events.append("serving")
+
+        assert events[0] == "init_db" and events.index("init_db") < events.index("serving")
+
+
+class TestProviders:
+    """Testes para os provedores singleton de src.api.dependencies"""
+
+    async def test_builds_once(self):
+        built = []
+
+        @singleton
+        def get_service():
+            built.append(object())
+            return built[-1]
+
+        assert get_service.peek() is None
+        first = await get_service()
+        assert await get_service() is first
+        assert get_service.get() is first
+        assert get_service.peek() is first
+        assert len(built) == 1
+
+    def test_services_share_the_client(self):
+        assert get_fit_simulator.get().nba_client is get_nba_client.get()
+
+    @pytest.mark.parametrize("mode, persisted", [("live", True), ("record", False), ("replay", False)])
+    def test_stats_persistence_only_when_live(self, mode, persisted, tmp_path, monkeypatch):
+        """Gravações são a fonte dos dados offline: o SQLite não entra fora do modo live"""
+        monkeypatch.setattr(get_settings(), "nba_api_mode", mode)
+        monkeypatch.setattr(get_settings(), "nba_api_recordings_dir", str(tmp_path))
+        monkeypatch.setattr(get_settings(), "stats_persistence_enabled", True)
+
+        client = get_nba_client.factory()
+
+        assert (client.stats_repository is not None) == persisted
+        assert (client.recordings is None) == persisted
@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domain.services.fit_matrix_service import FitMatrix, FitMatrixService, FitMatrixStore
+from src.domain.services.fit_simulator import FitSimulator
+from src.infrastructure.database.connection import Base
+from src.infrastructure.database.fit_matrix_repository import FitMatrixRepository
+from src.infrastructure.external.league_tables import PlayerStatsTable
+from src.jobs.precompute_fit_matrix import rebuild_fit_matrix, warm_fit_matrix
+from src.schemas.analysis import FitLabel, TeamStats
+
+
+@pytest.fixture
+def league_players(league_player_stats_df):
+    return list(PlayerStatsTable("2024-25", league_player_stats_df).all_stats())
+
+
+@pytest.fixture
+def league_teams():
+    return [
+        TeamStats(team_id=102, team_name="Crowded", ball_dominant_count=2, pace_rank=3),
+        TeamStats(team_id=100, team_name="Needs Shooting", fg3_pct_rank=28),
+        TeamStats(team_id=101, team_name="Needs Defense", def_rating_rank=27, ast_rank=25),
+    ]
+
+
+class TestFitMatrixService:
+    """Testes para o pré-cálculo da matriz jogadores × times"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.service = FitMatrixService()
+
+    @pytest.mark.asyncio
+    async def test_matrix_matches_fit_simulator(self, league_players, league_teams):
+        """Cada célula tem o mesmo score, label e papel do FitSimulator"""
+        matrix, report = self.service.build("2024-25", league_players, league_teams, workers=1)
+
+        client = Mock()
+        client.get_player_advanced_stats.side_effect = {p.player_id: p for p in league_players}.get
+        client.get_team_stats.side_effect = {t.team_id: t for t in league_teams}.get
+        simulator = FitSimulator(nba_client=client)
+
+        assert report.cells == len(league_players) * len(league_teams)
+        for player in league_players:
+            for team in league_teams:
+                expected = await simulator.simulate_fit(player.player_id, team.team_id)
+                entry = matrix.lookup(player.player_id, team.team_id)
+                assert entry.fit_score == expected.fit_score
+                assert entry.fit_label == expected.fit_label
+                assert entry.projected_role == expected.projected_role
+
+    def test_process_pool_matches_single_worker(self, league_players, league_teams):
+        """Dividir os times entre processos não altera o resultado"""
+        single, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+        pooled, report = self.service.build("2024-25", league_players, league_teams, workers=2)
+
+        assert report.workers == 2
+        assert list(pooled.team_ids) == [100, 101, 102]
+        for player in league_players:
+            for team in league_teams:
+                assert pooled.lookup(player.player_id, team.team_id) == single.lookup(
+                    player.player_id, team.team_id
+                )
+
+    def test_unknown_pair_returns_none(self, league_players, league_teams):
+        """Par fora da matriz retorna None"""
+        matrix, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+
+        assert matrix.lookup(999, 100) is None
+        assert matrix.lookup(1, 999) is None
+
+    def test_records_round_trip(self, league_players, league_teams):
+        """Conversão para linhas da tabela e de volta preserva a matriz"""
+        matrix, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+
+        restored = FitMatrix.from_records("2024-25", list(matrix.to_records()))
+
+        assert np.array_equal(restored.scores, matrix.scores)
+        assert restored.lookup(3, 101) == matrix.lookup(3, 101)
+
+    def test_store_ignores_stale_or_other_season(self, league_players, league_teams):
+        """Store só responde com matriz fresca da temporada pedida"""
+        matrix, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+        store = FitMatrixStore(max_age_seconds=60)
+        store.replace(matrix)
+
+        assert store.lookup("2024-25", 1, 100) is not None
+        assert store.lookup("2023-24", 1, 100) is None
+
+        matrix.computed_at = datetime.utcnow() - timedelta(seconds=120)
+        assert store.lookup("2024-25", 1, 100) is None
+
+    def test_store_ignores_matrix_from_other_data_version(self, league_players, league_teams):
+        """Depois de uma troca de snapshot a matriz antiga não responde"""
+        matrix, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+        store = FitMatrixStore(max_age_seconds=60)
+        store.replace(matrix, "2024-25:1.1.0.0")
+
+        assert store.lookup("2024-25", 1, 100, "2024-25:1.1.0.0") is not None
+        assert store.lookup("2024-25", 1, 100, "2024-25:2.1.0.0") is None
+
+    @pytest.mark.asyncio
+    async def test_rebuild_only_after_data_changes(self, league_players, league_teams):
+        matrix, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+        store = FitMatrixStore(max_age_seconds=60)
+        store.replace(matrix, "v1")
+        async_client = Mock(client=Mock(current_season="2024-25", data_version=Mock(return_value="v1")))
+        async_client.get_player_stats_table = AsyncMock(return_value=Mock(all_stats=lambda: iter(league_players)))
+        async_client.get_all_team_stats = AsyncMock(return_value=league_teams)
+        repository = AsyncMock()
+
+        await rebuild_fit_matrix(async_client, store, repository, workers=1)
+        repository.save.assert_not_awaited()
+
+        async_client.client.data_version.return_value = "v2"
+        await rebuild_fit_matrix(async_client, store, repository, workers=1)
+        repository.save.assert_awaited_once()
+        assert store.lookup("2024-25", 1, 100, "v2") is not None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("same_data", [True, False])
+    async def test_warm_rejects_matrix_from_other_league_data(self, league_players, league_teams, same_data):
+        """Matriz persistida só é servida se saiu das tabelas carregadas agora; senão é recalculada"""
+        persisted, _ = self.service.build("2024-25", league_players, league_teams, workers=1)
+        current_teams = league_teams if same_data else [
+            t.model_copy(update={"fg3_pct_rank": 1}) for t in league_teams
+        ]
+        async_client = Mock(client=Mock(current_season="2024-25", data_version=Mock(return_value="v1")))
+        async_client.get_player_stats_table = AsyncMock(return_value=Mock(all_stats=lambda: iter(league_players)))
+        async_client.get_all_team_stats = AsyncMock(return_value=current_teams)
+        repository = AsyncMock()
+        repository.load.return_value = FitMatrix.from_records("2024-25", list(persisted.to_records()))
+        store = FitMatrixStore(max_age_seconds=60)
+
+        await warm_fit_matrix(async_client, store, repository, workers=1)
+
+        assert (repository.save.await_count == 0) == same_data
+        assert store.is_fresh("2024-25", "v1")
+        assert store.matrix.source_version != persisted.source_version or same_data
+
+
+class TestFitMatrixRepository:
+    """Testes de persistência da matriz no SQLite"""
+
+    @pytest.mark.asyncio
+    async def test_save_and_load(self, tmp_path, league_players, league_teams):
+        """Matriz salva é recarregada idêntica; novo save substitui a temporada"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        repository = FitMatrixRepository(async_sessionmaker(engine, expire_on_commit=False))
+        matrix, _ = FitMatrixService().build("2024-25", league_players, league_teams, workers=1)
+
+        await repository.save(matrix)
+        await repository.save(matrix)
+        loaded = await repository.load("2024-25")
+
+        assert loaded.cells == matrix.cells
+        assert np.array_equal(loaded.scores, matrix.scores)
+        assert loaded.lookup(1, 100).fit_label == matrix.lookup(1, 100).fit_label
+        assert loaded.source_version == matrix.source_version is not None
+        assert await repository.load("2023-24") is None
+        await engine.dispose()
@@ -1,11 +1,18 @@
+import asyncio
+import time
 import pytest
+from dataclasses import asdict
 from unittest.mock import Mock, patch
-from src.domain.services.fit_simulator import FitSimulator
+from src.domain.entities.analysis import FitRecord, PlayerAnalysisRecord, PlayerStatsRecord
+from src.domain.services.fit_simulator import FitSimulator, ScanProgress
+from src.infrastructure.external.league_tables import PlayerStatsTable
 from src.schemas.analysis import (
     PlayerAdvancedStats,
+    PlayerArchetype,
     TeamStats,
     FitLabel
 )
+from src.schemas.simulation import SimulationResponse
 
 
 class TestFitSimulator:
@@ -248,3 +255,374 @@ class TestFitSimulator:
             # Aqui estamos validando que a lógica existe
             result = await self.simulator.simulate_fit(1, 100)
             assert result.fit_label is not None
+
+    @pytest.mark.asyncio
+    async def test_player_and_team_fetched_concurrently(self):
+        """Buscas de jogador e time rodam em paralelo fora do event loop"""
+        def slow_player(_):
+            time.sleep(0.2)
+            return self._mock_player_stats()
+
+        def slow_team(_):
+            time.sleep(0.2)
+            return self._mock_team_stats()
+
+        self.mock_nba_client.get_player_advanced_stats.side_effect = slow_player
+        self.mock_nba_client.get_team_stats.side_effect = slow_team
+
+        started = time.perf_counter()
+        result = await self.simulator.simulate_fit(1, 100)
+        elapsed = time.perf_counter() - started
+
+        assert result.player_name == "Test Player"
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_blocking_fetch_does_not_freeze_event_loop(self):
+        """Outras corrotinas continuam executando durante a busca bloqueante"""
+        def slow_player(_):
+            time.sleep(0.2)
+            return self._mock_player_stats()
+
+        self.mock_nba_client.get_player_advanced_stats.side_effect = slow_player
+        self.mock_nba_client.get_team_stats.return_value = self._mock_team_stats()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        await self.simulator.simulate_fit(1, 100)
+        ticker_task.cancel()
+
+        assert ticks >= 10
+
+
+class TestSimulateFitMany:
+    """Testes para a simulação de um jogador contra vários times"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_nba_client = Mock()
+        self.simulator = FitSimulator(nba_client=self.mock_nba_client)
+        self.mock_nba_client.get_player_advanced_stats.return_value = PlayerAdvancedStats(
+            player_id=1, player_name="Sniper", fg3a=8.0, fg3_pct=0.42, min=30.0, position="SG"
+        )
+        self.mock_nba_client.get_all_team_stats.return_value = [
+            TeamStats(team_id=100, team_name="Balanced", fg3_pct_rank=10),
+            TeamStats(team_id=101, team_name="Needs Shooting", fg3_pct_rank=28),
+            TeamStats(team_id=102, team_name="Crowded", ball_dominant_count=2),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_all_teams_sorted_by_fit_score(self):
+        """Sem team_ids avalia todos os times, do melhor para o pior encaixe"""
+        results = await self.simulator.simulate_fit_many(1)
+
+        assert len(results) == 3
+        assert results[0].team_id == 101
+        scores = [r.fit_score for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_data_loaded_once(self):
+        """Jogador e tabela de times são carregados uma única vez"""
+        await self.simulator.simulate_fit_many(1)
+
+        self.mock_nba_client.get_player_advanced_stats.assert_called_once_with(1)
+        self.mock_nba_client.get_all_team_stats.assert_called_once()
+        self.mock_nba_client.get_team_stats.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_matches_single_simulation(self):
+        """Resultado em lote é idêntico ao da simulação individual"""
+        self.mock_nba_client.get_team_stats.return_value = self.mock_nba_client.get_all_team_stats.return_value[1]
+
+        single = await self.simulator.simulate_fit(1, 101)
+        batch = await self.simulator.simulate_fit_many(1, [101])
+
+        assert batch[0] == single
+
+    @pytest.mark.asyncio
+    async def test_unknown_team_returns_error_entry(self):
+        """Time inexistente gera resposta de erro sem afetar os demais"""
+        results = await self.simulator.simulate_fit_many(1, [100, 999])
+
+        errors = [r for r in results if r.team_id == 999]
+        assert len(errors) == 1
+        assert errors[0].fit_label == FitLabel.BAD_FIT
+
+    @pytest.mark.asyncio
+    async def test_missing_player_returns_error_for_each_team(self):
+        """Jogador não encontrado gera resposta de erro por time"""
+        self.mock_nba_client.get_player_advanced_stats.return_value = None
+
+        results = await self.simulator.simulate_fit_many(999, [100, 101])
+
+        assert [r.fit_score for r in results] == [0, 0]
+
+
+class TestRankPlayersForTeam:
+    """Testes para o ranking reverso: melhores jogadores da liga para um time"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, league_player_stats_df):
+        self.mock_nba_client = Mock()
+        self.simulator = FitSimulator(nba_client=self.mock_nba_client)
+        self.mock_nba_client.get_player_stats_table.return_value = PlayerStatsTable(
+            "2024-25", league_player_stats_df
+        )
+        self.mock_nba_client.get_team_stats.return_value = TeamStats(
+            team_id=100, team_name="Needs Shooting", fg3_pct_rank=28
+        )
+
+    @pytest.mark.asyncio
+    async def test_players_ranked_by_fit_score(self):
+        """Sniper é o melhor encaixe para time que precisa de arremesso"""
+        results = await self.simulator.rank_players_for_team(100)
+
+        assert results[0].player_name == "Klay Thompson"
+        scores = [r.fit_score for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_team_needs_computed_once(self):
+        """Necessidades do time são analisadas uma única vez para a liga inteira"""
+        with patch.object(
+            self.simulator.gap_service, "analyze_team_needs",
+            wraps=self.simulator.gap_service.analyze_team_needs
+        ) as spy:
+            await self.simulator.rank_players_for_team(100)
+
+        spy.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_matches_single_simulation(self):
+        """Score do ranking é idêntico ao da simulação individual"""
+        self.mock_nba_client.get_player_advanced_stats.side_effect = (
+            self.mock_nba_client.get_player_stats_table.return_value.get_stats
+        )
+
+        ranked = await self.simulator.rank_players_for_team(100)
+
+        for result in ranked:
+            single = await self.simulator.simulate_fit(result.player_id, 100)
+            assert single == result
+
+    @pytest.mark.asyncio
+    async def test_filters_and_limit(self):
+        """Filtros de posição, minutos, arquétipo e limite são aplicados"""
+        centers = await self.simulator.rank_players_for_team(100, position="c")
+        starters = await self.simulator.rank_players_for_team(100, min_minutes=28.0)
+        playmakers = await self.simulator.rank_players_for_team(100, archetype=PlayerArchetype.PLAYMAKER)
+        top_one = await self.simulator.rank_players_for_team(100, limit=1)
+
+        assert [r.player_name for r in centers] == ["Rudy Gobert"]
+        assert {r.player_name for r in starters} == {"Klay Thompson", "Rudy Gobert"}
+        assert [r.player_name for r in playmakers] == ["Chris Paul"]
+        assert len(top_one) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_team_returns_none(self):
+        """Time inexistente retorna None"""
+        self.mock_nba_client.get_team_stats.return_value = None
+
+        assert await self.simulator.rank_players_for_team(999) is None
+
+
+class TestStreamingScans:
+    """Testes para as varreduras da liga em streaming"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, league_player_stats_df):
+        self.mock_nba_client = Mock()
+        self.simulator = FitSimulator(nba_client=self.mock_nba_client)
+        self.mock_nba_client.get_player_stats_table.return_value = PlayerStatsTable(
+            "2024-25", league_player_stats_df
+        )
+        self.mock_nba_client.get_team_stats.return_value = TeamStats(
+            team_id=100, team_name="Needs Shooting", fg3_pct_rank=28
+        )
+        self.mock_nba_client.get_player_advanced_stats.side_effect = (
+            self.mock_nba_client.get_player_stats_table.return_value.get_stats
+        )
+        self.mock_nba_client.get_all_team_stats.return_value = [
+            TeamStats(team_id=100 + i, team_name=f"Team {i}", fg3_pct_rank=1 + i * 4) for i in range(8)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_players_stream_matches_ranking(self):
+        """Os resultados emitidos são os mesmos do ranking, com progresso intercalado"""
+        events = [e async for e in self.simulator.stream_players_for_team(100, progress_every=2)]
+        ranked = await self.simulator.rank_players_for_team(100)
+
+        results = [e for e in events if not isinstance(e, ScanProgress)]
+        progress = [(e.scanned, e.total) for e in events if isinstance(e, ScanProgress)]
+        assert sorted(results, key=lambda r: r.player_id) == sorted(ranked, key=lambda r: r.player_id)
+        assert progress == [(0, 3), (2, 3), (3, 3)]
+
+    @pytest.mark.asyncio
+    async def test_players_stream_applies_filters(self):
+        events = [e async for e in self.simulator.stream_players_for_team(100, position="c")]
+        assert [e.player_name for e in events if not isinstance(e, ScanProgress)] == ["Rudy Gobert"]
+
+    @pytest.mark.asyncio
+    async def test_teams_stream_covers_league(self):
+        events = [e async for e in self.simulator.stream_teams_for_player(1, progress_every=5)]
+        results = [e for e in events if not isinstance(e, ScanProgress)]
+        assert [r.team_id for r in results] == list(range(100, 108))
+        assert [e.scanned for e in events if isinstance(e, ScanProgress)] == [0, 5, 8]
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_stops_scan(self):
+        """Fechar o gerador interrompe a varredura: o resto da liga não é avaliado"""
+        friction_service = self.simulator.friction_service
+        with patch.object(friction_service, "analyze_friction", wraps=friction_service.analyze_friction) as spy:
+            events = self.simulator.stream_teams_for_player(1, progress_every=1)
+            await events.__anext__()
+            await events.__anext__()
+            await events.aclose()
+
+        assert spy.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_ids_raise(self):
+        self.mock_nba_client.get_team_stats.return_value = None
+        self.mock_nba_client.get_player_advanced_stats.side_effect = None
+        self.mock_nba_client.get_player_advanced_stats.return_value = None
+
+        with pytest.raises(ValueError):
+            await self.simulator.stream_players_for_team(999).__anext__()
+        with pytest.raises(ValueError):
+            await self.simulator.stream_teams_for_player(999).__anext__()
+
+
+class TestFitSimulatorMemoization:
+    """Testes para a memoização de resultados, análises e necessidades"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, league_player_stats_df):
+        self.mock_nba_client = Mock()
+        self.mock_nba_client.data_version.return_value = "v1"
+        self.simulator = FitSimulator(nba_client=self.mock_nba_client)
+        table = PlayerStatsTable("2024-25", league_player_stats_df)
+        self.mock_nba_client.get_player_stats_table.return_value = table
+        self.mock_nba_client.get_player_advanced_stats.side_effect = table.get_stats
+        self.mock_nba_client.get_team_stats.side_effect = lambda team_id: TeamStats(
+            team_id=team_id, team_name=f"Team {team_id}", fg3_pct_rank=28
+        )
+        self.mock_nba_client.get_all_team_stats.return_value = [
+            TeamStats(team_id=100 + i, team_name=f"Team {i}", fg3_pct_rank=1 + i) for i in range(30)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repeat_simulation_served_from_cache(self):
+        first = await self.simulator.simulate_fit(1, 100)
+        second = await self.simulator.simulate_fit(1, 100)
+
+        assert second is first
+        assert self.mock_nba_client.get_player_advanced_stats.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_intermediates_reused_across_teams_and_players(self):
+        """Análise do jogador serve para os 30 times; necessidades do time para todos os jogadores"""
+        service = self.simulator.archetype_service
+        with patch.object(service, "analyze_player", wraps=service.analyze_player) as spy:
+            await self.simulator.simulate_fit_many(1)
+            await self.simulator.rank_players_for_team(100)
+            await self.simulator.rank_players_for_team(101)
+
+        assert spy.call_count == 3
+
+        gap_service = self.simulator.gap_service
+        with patch.object(gap_service, "analyze_team_needs", wraps=gap_service.analyze_team_needs) as spy:
+            await self.simulator.simulate_fit(3, 100)
+            await self.simulator.simulate_fit(6, 100)
+        spy.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_new_data_version_invalidates(self):
+        first = await self.simulator.simulate_fit(1, 100)
+        self.mock_nba_client.data_version.return_value = "v2"
+        second = await self.simulator.simulate_fit(1, 100)
+
+        assert second is not first
+        assert second == first
+        assert self.mock_nba_client.get_player_advanced_stats.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_error_responses_not_cached(self):
+        self.mock_nba_client.get_player_advanced_stats.side_effect = None
+        self.mock_nba_client.get_player_advanced_stats.return_value = None
+        await self.simulator.simulate_fit(1, 100)
+        await self.simulator.simulate_fit(1, 100)
+
+        assert self.mock_nba_client.get_player_advanced_stats.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stats_exposed(self):
+        await self.simulator.simulate_fit(1, 100)
+        await self.simulator.simulate_fit(1, 100)
+
+        stats = {s["name"]: s for s in self.simulator.cache_stats()}
+        assert set(stats) == {"simulation_response", "player_analysis", "team_needs"}
+        assert stats["simulation_response"]["hits"] == 1
+        assert stats["player_analysis"]["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_each_simulation_counts_one_lookup(self):
+        """Uma simulação calculada conta um único miss; a repetida, um único hit"""
+        await self.simulator.simulate_fit(1, 100)
+        await self.simulator.simulate_fit(1, 100)
+        await self.simulator.simulate_fit(3, 100)
+        await self.simulator.simulate_fit_many(1, [100, 101])
+
+        responses = {s["name"]: s for s in self.simulator.cache_stats()}["simulation_response"]
+        assert (responses["hits"], responses["misses"], responses["size"]) == (2, 3, 3)
+
+
+class TestFitRecords:
+    """Registros internos do pipeline e a conversão na borda da API"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, league_player_stats_df):
+        self.mock_nba_client = Mock()
+        self.mock_nba_client.data_version.return_value = "v1"
+        self.simulator = FitSimulator(nba_client=self.mock_nba_client)
+        self.table = PlayerStatsTable("2024-25", league_player_stats_df)
+        self.mock_nba_client.get_player_stats_table.return_value = self.table
+        self.mock_nba_client.get_player_advanced_stats.side_effect = self.table.get_stats
+        self.mock_nba_client.get_team_stats.return_value = TeamStats(
+            team_id=100, team_name="Needs Shooting", fg3_pct_rank=28
+        )
+
+    def test_table_yields_slotted_records(self):
+        stats = next(self.table.all_stats())
+
+        assert isinstance(stats, PlayerStatsRecord)
+        assert not hasattr(stats, "__dict__")
+        assert type(stats.pts) is float and type(stats.player_id) is int
+
+    @pytest.mark.asyncio
+    async def test_simulation_returns_records(self):
+        result = await self.simulator.simulate_fit(1, 100)
+
+        assert isinstance(result, FitRecord)
+        assert isinstance(result.player_analysis, PlayerAnalysisRecord)
+        assert isinstance(result.player_analysis.stats, PlayerStatsRecord)
+
+    @pytest.mark.asyncio
+    async def test_from_record_matches_full_validation(self):
+        """A conversão produz o mesmo JSON que o pipeline Pydantic produzia"""
+        result = await self.simulator.simulate_fit(1, 100)
+        response = SimulationResponse.from_record(result)
+
+        assert isinstance(response, SimulationResponse)
+        assert response.player_analysis.stats.player_name == result.player_name
+        assert set(response.player_analysis.archetype_scores) <= {a.value for a in PlayerArchetype}
+        assert response.model_dump() == SimulationResponse(**asdict(result)).model_dump()
+        assert SimulationResponse.from_record(response) is response
@@ -0,0 +1,172 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domain.entities.analysis import FitRecord
+from src.infrastructure.database.connection import Base
+from src.infrastructure.database.history_recorder import SimulationHistoryRecorder
+from src.infrastructure.database.history_repository import SimulationHistoryRepository
+from src.schemas.analysis import FitLabel
+from src.schemas.simulation import SimulationResponse
+
+
+def _result(player_id=1, team_id=100, fit_score=80):
+    return SimulationResponse(
+        player_id=player_id,
+        player_name="Test Player",
+        team_id=team_id,
+        team_name="Test Team",
+        fit_score=fit_score,
+        fit_label=FitLabel.STARTER,
+        estimated_minutes=30.0,
+        reasons=["Bom encaixe", "Preenche lacuna"]
+    )
+
+
+@pytest.fixture
+async def repository(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'history.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield SimulationHistoryRepository(async_sessionmaker(engine, expire_on_commit=False))
+    await engine.dispose()
+
+
+class TestSimulationHistoryRecorder:
+    """Testes para a gravação assíncrona do histórico"""
+
+    async def test_batches_inserts(self):
+        """Simulações enfileiradas são gravadas em lotes de batch_size"""
+        repository = AsyncMock()
+        recorder = SimulationHistoryRecorder(repository, batch_size=3, flush_interval=5.0)
+        recorder.start()
+
+        for i in range(6):
+            assert await recorder.record(_result(player_id=i))
+        await recorder.stop()
+
+        sizes = [len(call.args[0]) for call in repository.insert_many.await_args_list]
+        assert sizes == [3, 3]
+        assert recorder.recorded == 6
+
+    async def test_flushes_partial_batch_on_interval(self):
+        """Um lote incompleto é gravado quando o flush_interval expira"""
+        repository = AsyncMock()
+        recorder = SimulationHistoryRecorder(repository, batch_size=100, flush_interval=0.01)
+        recorder.start()
+
+        await recorder.record(_result())
+        await asyncio.sleep(0.1)
+
+        assert repository.insert_many.await_count == 1
+        await recorder.stop()
+
+    async def test_stop_flushes_pending_items(self):
+        """Encerrar o recorder grava o que ainda está na fila"""
+        repository = AsyncMock()
+        recorder = SimulationHistoryRecorder(repository, batch_size=100, flush_interval=60.0)
+        recorder.start()
+
+        await recorder.record(_result())
+        await recorder.record(_result())
+        await recorder.stop()
+
+        assert recorder.recorded == 2
+        assert not recorder.running
+
+    async def test_drops_when_queue_full(self):
+        """Com a fila cheia o item é descartado após enqueue_timeout"""
+        gate = asyncio.Event()
+
+        async def slow_insert(rows):
+            await gate.wait()
+
+        repository = AsyncMock()
+        repository.insert_many.side_effect = slow_insert
+        recorder = SimulationHistoryRecorder(
+            repository, queue_size=1, batch_size=1, flush_interval=0.01, enqueue_timeout=0.01
+        )
+        recorder.start()
+
+        assert await recorder.record(_result())
+        await asyncio.sleep(0.02)  # worker pega o primeiro item e bloqueia no insert
+        assert await recorder.record(_result())
+        assert not await recorder.record(_result())
+        assert recorder.dropped == 1
+
+        gate.set()
+        await recorder.stop()
+        assert recorder.recorded == 2
+
+    async def test_error_results_not_recorded(self):
+        """Jogador/time sem dados não entra no histórico como se fosse uma simulação"""
+        repository = AsyncMock()
+        recorder = SimulationHistoryRecorder(repository, batch_size=10, flush_interval=0.01)
+        recorder.start()
+        error = FitRecord(
+            player_id=1, player_name="Unknown", team_id=100, team_name="Unknown", fit_score=0,
+            fit_label=FitLabel.BAD_FIT, reasons=["Dados do jogador não encontrados."], is_error=True
+        )
+
+        assert not await recorder.record(error)
+        assert await recorder.record(_result())
+        await recorder.stop()
+
+        rows = [row for call in repository.insert_many.await_args_list for row in call.args[0]]
+        assert len(rows) == 1 and rows[0]["fit_score"] == 80
+        assert (recorder.recorded, recorder.skipped) == (1, 1)
+
+    async def test_record_without_start_is_noop(self):
+        """Sem a task de fundo nada é enfileirado"""
+        recorder = SimulationHistoryRecorder(AsyncMock())
+        assert not await recorder.record(_result())
+
+    async def test_writes_rows_to_database(self, repository):
+        """Linhas gravadas preservam score, veredito e motivos"""
+        recorder = SimulationHistoryRecorder(repository, batch_size=10, flush_interval=0.01)
+        recorder.start()
+        await recorder.record(_result(fit_score=77))
+        await recorder.stop()
+
+        rows = await repository.list_page(limit=10)
+        assert len(rows) == 1
+        assert rows[0].fit_score == 77
+        assert rows[0].veredito == FitLabel.STARTER.value
+        assert rows[0].explicacao == "Bom encaixe | Preenche lacuna"
+
+
+class TestSimulationHistoryRepository:
+    """Testes para a paginação do histórico"""
+
+    async def test_keyset_pagination(self, repository):
+        """Páginas seguem created_at desc sem repetir nem pular linhas"""
+        base = datetime(2024, 1, 1)
+        await repository.insert_many([
+            {"player_id": 1, "team_id": 100 + i % 2, "veredito": "Starter",
+             "created_at": base + timedelta(minutes=i // 2)}
+            for i in range(7)
+        ])
+
+        seen = []
+        before = None
+        while True:
+            page = await repository.list_page(limit=3, before=before)
+            seen.extend(row.id for row in page)
+            if len(page) < 3:
+                break
+            before = (page[-1].created_at, page[-1].id)
+
+        assert sorted(seen) == list(range(1, 8))
+        assert len(seen) == len(set(seen))
+
+    async def test_filters_by_team(self, repository):
+        """Filtro por time considera apenas as simulações daquele time"""
+        await repository.insert_many([
+            {"player_id": 1, "team_id": 100, "veredito": "Starter", "created_at": datetime(2024, 1, 1)},
+            {"player_id": 1, "team_id": 101, "veredito": "Starter", "created_at": datetime(2024, 1, 2)},
+        ])
+
+        rows = await repository.list_page(limit=10, team_id=101)
+        assert [row.team_id for row in rows] == [101]
@@ -0,0 +1,197 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.infrastructure.external.async_nba_client import AsyncNBAApiClient
+from src.infrastructure.external.league_tables import validate_league_frame
+from src.infrastructure.external.nba_api_client import NBAApiClient
+from src.jobs.refresh_league_data import LeagueDataRefresher
+
+
+def _endpoint_returning(df):
+    endpoint = Mock()
+    endpoint.get_data_frames.return_value = [df]
+    return endpoint
+
+
+@pytest.fixture
+def endpoints(league_player_stats_df, league_team_stats_df):
+    positions = pd.DataFrame({"PERSON_ID": [1, 3, 6], "POSITION": ["G", "C", "G"]})
+    base = league_team_stats_df.drop(columns=["OFF_RATING", "DEF_RATING", "PACE"])
+    advanced = league_team_stats_df[["TEAM_ID", "OFF_RATING", "DEF_RATING", "PACE"]]
+    module = "src.infrastructure.external.nba_api_client"
+    with patch(f"{module}.leaguedashplayerstats") as players, \
+            patch(f"{module}.leaguedashteamstats") as teams, \
+            patch(f"{module}.commonteamroster") as rosters, \
+            patch(f"{module}.playerindex") as index:
+        players.LeagueDashPlayerStats.return_value = _endpoint_returning(league_player_stats_df)
+        teams.LeagueDashTeamStats.side_effect = lambda **kw: _endpoint_returning(
+            advanced if kw.get("measure_type_detailed_defense") == "Advanced" else base
+        )
+        rosters.CommonTeamRoster.side_effect = lambda team_id, season: _endpoint_returning(
+            pd.DataFrame({"TeamID": [team_id], "PLAYER_ID": [team_id * 10]})
+        )
+        index.PlayerIndex.return_value = _endpoint_returning(positions)
+        yield Mock(players=players, teams=teams, rosters=rosters)
+
+
+@pytest.fixture
+async def refresher():
+    async_client = AsyncNBAApiClient(NBAApiClient(), max_workers=2)
+    yield LeagueDataRefresher(async_client, interval_seconds=60, min_player_rows=3, min_team_rows=30)
+    async_client.shutdown()
+
+
+class TestLeagueDataRefresher:
+    """Testes para o refresh em segundo plano com troca atômica"""
+
+    async def test_refresh_swaps_player_snapshot(self, endpoints, refresher, league_player_stats_df):
+        """Após o refresh os leitores recebem a tabela nova"""
+        client = refresher.async_client.client
+        assert client.get_player_advanced_stats(1).pts == 20.0
+
+        updated = league_player_stats_df.assign(PTS=[25.0, 12.0, 12.0])
+        endpoints.players.LeagueDashPlayerStats.return_value = _endpoint_returning(updated)
+        await refresher.refresh_once()
+
+        assert client.get_player_advanced_stats(1).pts == 25.0
+        status = refresher.status["player_stats"]
+        assert status.size == 3
+        assert status.last_success_at is not None
+        assert status.last_duration_seconds >= 0
+
+    async def test_invalid_snapshot_keeps_previous(self, endpoints, refresher, league_player_stats_df):
+        """Snapshot com coluna toda vazia é rejeitado e o anterior continua em uso"""
+        client = refresher.async_client.client
+        client.get_player_advanced_stats(1)
+
+        broken = league_player_stats_df.assign(PTS=np.nan)
+        endpoints.players.LeagueDashPlayerStats.return_value = _endpoint_returning(broken)
+        await refresher.refresh_once()
+
+        assert client.get_player_advanced_stats(1).pts == 20.0
+        status = refresher.status["player_stats"]
+        assert status.failures == 1
+        assert "PTS" in status.last_error
+
+    async def test_team_and_roster_snapshots(self, endpoints, refresher):
+        """Rankings e rosters de todos os times entram no cache"""
+        await refresher.refresh_once()
+        client = refresher.async_client.client
+        team_id = client.get_all_teams()[0]["id"]
+        calls = endpoints.rosters.CommonTeamRoster.call_count
+
+        assert refresher.status["team_stats"].size == 30
+        assert refresher.status["rosters"].size == 30
+        assert client.get_team_roster(team_id) == [{"TeamID": team_id, "PLAYER_ID": team_id * 10}]
+        assert endpoints.rosters.CommonTeamRoster.call_count == calls
+
+    async def test_loop_runs_on_interval(self, refresher):
+        """A task do lifespan dispara refresh a cada intervalo"""
+        refresher.interval_seconds = 0.01
+        refresher.refresh_once = Mock(side_effect=lambda: asyncio.sleep(0))
+        refresher.async_client.refresh_roster_table = AsyncMock(return_value=[])
+
+        refresher.start()
+        await asyncio.sleep(0.05)
+        await refresher.stop()
+
+        assert refresher.refresh_once.call_count >= 2
+        refresher.async_client.refresh_roster_table.assert_awaited_once()
+        assert not refresher.running
+
+    async def test_data_swap_triggers_on_refresh(self, endpoints, refresher):
+        """Ciclo que troca dados avisa (ex.: fit matrix); ciclo sem troca não"""
+        refresher.on_refresh = AsyncMock()
+        refresher.interval_seconds = 60
+
+        refresher.start()
+        for _ in range(200):
+            if refresher.on_refresh.await_count:
+                break
+            await asyncio.sleep(0.01)
+        await refresher.stop()
+        refresher.on_refresh.assert_awaited_once()
+
+        refresher.on_refresh.reset_mock()
+        refresher.async_client.refresh_roster_table = AsyncMock(return_value=[])
+        refresher.start()
+        await asyncio.sleep(0.05)
+        await refresher.stop()
+        refresher.on_refresh.assert_not_awaited()
+
+    async def test_watch_adopts_published_snapshots(self, refresher):
+        """Com snapshot em disco, versões de outros workers são adotadas entre refreshes"""
+        refresher.poll_seconds = 0.01
+        refresher.async_client.refresh_roster_table = AsyncMock(return_value=[])
+        refresher.async_client.sync_snapshots = AsyncMock(side_effect=[["player_stats"], []] + [[]] * 100)
+
+        refresher.start()
+        await asyncio.sleep(0.05)
+        await refresher.stop()
+
+        assert refresher.async_client.sync_snapshots.await_count >= 2
+        assert refresher.snapshots_adopted == 1
+
+
+class TestValidateLeagueFrame:
+    """Testes para a validação dos snapshots"""
+
+    def test_rejects_too_few_rows(self, league_player_stats_df):
+        with pytest.raises(ValueError, match="mínimo"):
+            validate_league_frame(league_player_stats_df, 10, "players")
+
+    def test_rejects_missing_column(self, league_player_stats_df):
+        with pytest.raises(ValueError, match="REB"):
+            validate_league_frame(league_player_stats_df.drop(columns=["REB"]), 1, "players", ["REB"])
+
+    def test_accepts_partial_nan(self, league_player_stats_df):
+        df = league_player_stats_df.copy()
+        df.loc[0, "FG3_PCT"] = np.nan
+        validate_league_frame(df, 3, "players")
+
+
+class TestRosterComposition:
+    """Testes para ball_dominant_count vindo dos rosters em cache"""
+
+    async def test_team_stats_count_ball_dominant_players(self, endpoints, refresher, league_player_stats_df):
+        """Após o refresh dos rosters, TeamStats traz a contagem real"""
+        client = refresher.async_client.client
+        # Mesmos ids da league_team_stats_df
+        client._teams = [{"id": 100 + i, "full_name": f"Team {i + 1}"} for i in range(30)]
+        team_id, other = 100, 101
+        league = pd.concat([
+            league_player_stats_df,
+            league_player_stats_df.assign(PLAYER_ID=[team_id * 10, 901, 902], USG_PCT=[0.31, 0.1, 0.1])
+        ])
+        endpoints.players.LeagueDashPlayerStats.return_value = _endpoint_returning(league)
+
+        await refresher.refresh_once()
+
+        composition = client.get_roster_composition(team_id)
+        assert composition.ball_dominant_ids == (team_id * 10,)
+        counts = {t.team_id: t.ball_dominant_count for t in client.get_all_team_stats()}
+        assert counts[team_id] == 1 and counts[other] == 0
+
+    async def test_ttl_reload_rebuilds_composition(self, endpoints, league_player_stats_df):
+        """Tabela de jogadores recarregada por TTL (sem refresh) também atualiza os elencos"""
+        client = NBAApiClient(cache_ttl_seconds=3600)
+        client._teams = [{"id": 100 + i, "full_name": f"Team {i + 1}"} for i in range(30)]
+        team_id = 100
+        star = league_player_stats_df.assign(PLAYER_ID=[team_id * 10, 901, 902], USG_PCT=[0.31, 0.1, 0.1])
+        endpoints.players.LeagueDashPlayerStats.return_value = _endpoint_returning(
+            pd.concat([league_player_stats_df, star])
+        )
+        client.refresh_roster_table(min_teams=30)
+        assert client.get_roster_composition(team_id).ball_dominant_count == 1
+
+        # O astro perde o volume de jogo; o snapshot expira e é recarregado sob demanda
+        endpoints.players.LeagueDashPlayerStats.return_value = _endpoint_returning(
+            pd.concat([league_player_stats_df, star.assign(USG_PCT=0.1)])
+        )
+        client._player_stats_cache._ttl_seconds = 0
+        client.get_player_stats_table()
+
+        assert client.get_roster_composition(team_id).ball_dominant_count == 0
@@ -0,0 +1,144 @@
+import os
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+
+from src.main import app
+from src.infrastructure.external.league_snapshot import LeagueSnapshotStore, mapped_bytes
+from src.infrastructure.external.league_tables import PlayerStatsTable, RosterTable
+from src.infrastructure.external.nba_api_client import NBAApiClient
+
+
+def _endpoint_returning(df):
+    endpoint = Mock()
+    endpoint.get_data_frames.return_value = [df]
+    return endpoint
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeagueSnapshotStore(str(tmp_path / "snapshots"), keep=2)
+
+
+@pytest.fixture
+def player_endpoint(league_player_stats_df):
+    positions = pd.DataFrame({"PERSON_ID": [1, 3, 6], "POSITION": ["G", "C", "G"]})
+    module = "src.infrastructure.external.nba_api_client"
+    with patch(f"{module}.leaguedashplayerstats") as players, patch(f"{module}.playerindex") as index:
+        players.LeagueDashPlayerStats.return_value = _endpoint_returning(league_player_stats_df)
+        index.PlayerIndex.return_value = _endpoint_returning(positions)
+        yield players.LeagueDashPlayerStats
+
+
+class TestLeagueSnapshotStore:
+    """Testes para o snapshot colunar publicado em disco"""
+
+    def test_round_trip_maps_numeric_columns(self, store, league_player_stats_df):
+        info = store.publish("player_stats", "2024-25", league_player_stats_df)
+        df = store.load(store.current("player_stats", "2024-25"))
+
+        assert info.rows == 3
+        assert df.to_dict("records") == league_player_stats_df.to_dict("records")
+        numeric = league_player_stats_df.select_dtypes("number")
+        assert mapped_bytes(df) == sum(numeric[c].to_numpy().nbytes for c in numeric.columns)
+        assert not df["PTS"].to_numpy().flags.writeable
+
+    def test_text_nulls_preserved(self, store):
+        store.publish("rosters", "2024-25", pd.DataFrame({"PLAYER_ID": [1, 2], "SCHOOL": ["Duke", None]}))
+        df = store.load(store.current("rosters", "2024-25"))
+
+        assert df["SCHOOL"].iloc[0] == "Duke"
+        assert pd.isna(df["SCHOOL"].iloc[1])
+
+    def test_publish_swaps_pointer_and_prunes(self, store, league_player_stats_df):
+        """Versões antigas saem do disco, mas quem já as mapeou continua lendo"""
+        first = store.publish("player_stats", "2024-25", league_player_stats_df)
+        mapped = store.load(first)
+        for pts in (21.0, 22.0):
+            latest = store.publish("player_stats", "2024-25", league_player_stats_df.assign(PTS=pts))
+
+        assert store.current("player_stats", "2024-25").version == latest.version
+        assert not os.path.exists(first.path)
+        base = os.path.dirname(first.path)
+        assert len([name for name in os.listdir(base) if os.path.isdir(os.path.join(base, name))]) == 2
+        assert mapped["PTS"].tolist() == [20.0, 12.0, 12.0]
+
+    def test_nothing_published(self, store):
+        assert store.current("team_stats", "2024-25") is None
+
+    def test_table_rows_are_native_values(self, store, league_player_stats_df):
+        store.publish("player_stats", "2024-25", league_player_stats_df)
+        table = PlayerStatsTable("2024-25", store.load(store.current("player_stats", "2024-25")))
+
+        row = table.get(3)
+        assert type(row["PTS"]) is float and type(row["TEAM_ID"]) is int
+        assert table.get_stats(3).position == "C"
+        assert [s.player_id for s in table.all_stats()] == [1, 3, 6]
+
+    def test_roster_table_round_trip(self, store):
+        rosters = RosterTable("2024-25", {100: [{"PLAYER_ID": 1}, {"PLAYER_ID": 2}], 101: [{"PLAYER_ID": 3}]})
+        store.publish("rosters", "2024-25", rosters.to_frame())
+        restored = RosterTable.from_frame("2024-25", store.load(store.current("rosters", "2024-25")))
+
+        assert restored.player_ids() == {100: [1, 2], 101: [3]}
+
+
+class TestSharedSnapshots:
+    """Workers (clientes distintos) compartilhando o mesmo snapshot em disco"""
+
+    def test_second_worker_maps_instead_of_downloading(self, store, player_endpoint):
+        first = NBAApiClient(snapshot_store=store)
+        second = NBAApiClient(snapshot_store=store)
+
+        assert first.get_player_advanced_stats(1).pts == 20.0
+        assert second.get_player_advanced_stats(1).pts == 20.0
+        assert player_endpoint.call_count == 1
+        assert mapped_bytes(second.get_player_stats_table().df) > 0
+
+    def test_refresh_published_once_and_adopted(self, store, player_endpoint, league_player_stats_df):
+        first = NBAApiClient(snapshot_store=store)
+        second = NBAApiClient(snapshot_store=store)
+        first.get_player_advanced_stats(1)
+        second.get_player_advanced_stats(1)
+
+        player_endpoint.return_value = _endpoint_returning(league_player_stats_df.assign(PTS=[25.0, 12.0, 12.0]))
+        first.refresh_player_stats_table(min_rows=3)
+        calls = player_endpoint.call_count
+        second.refresh_player_stats_table(min_rows=3)
+
+        assert player_endpoint.call_count == calls
+        assert second.get_player_advanced_stats(1).pts == 25.0
+
+    def test_sync_picks_up_new_version(self, store, player_endpoint, league_player_stats_df):
+        first = NBAApiClient(snapshot_store=store)
+        second = NBAApiClient(snapshot_store=store)
+        first.get_player_advanced_stats(1)
+        second.get_player_advanced_stats(1)
+        version = second.data_version()
+
+        player_endpoint.return_value = _endpoint_returning(league_player_stats_df.assign(PTS=[25.0, 12.0, 12.0]))
+        first.refresh_player_stats_table(min_rows=3)
+
+        assert second.sync_snapshots() == ["player_stats"]
+        assert second.sync_snapshots() == []
+        assert second.get_player_advanced_stats(1).pts == 25.0
+        assert second.data_version() != version
+        assert [s["dataset"] for s in second.snapshot_status()] == ["player_stats"]
+
+    def test_without_store_nothing_is_written(self, player_endpoint):
+        client = NBAApiClient()
+
+        client.get_player_advanced_stats(1)
+
+        assert client.sync_snapshots() == []
+        assert client.snapshot_status() == []
+
+
+def test_worker_memory_reported():
+    response = TestClient(app).get("/api/v1/worker/memory")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pid"] == os.getpid()
+    assert data["rss_bytes"] > 0
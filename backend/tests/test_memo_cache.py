@@ -0,0 +1,38 @@
+from src.core.memo_cache import MemoCache
+
+
+class TestMemoCache:
+    """Testes para o cache LRU com TTL usado na memoização"""
+
+    def test_lru_eviction(self):
+        cache = MemoCache("test", max_entries=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.evictions == 1
+
+    def test_ttl_expiration(self):
+        now = [0.0]
+        cache = MemoCache("test", max_entries=10, ttl_seconds=5, clock=lambda: now[0])
+        cache.put("a", 1)
+        now[0] = 4.9
+        assert cache.get("a") == 1
+        now[0] = 5.0
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_get_or_compute_counts_hits_and_misses(self):
+        cache = MemoCache("test", max_entries=10, ttl_seconds=60)
+        calls = []
+
+        for _ in range(3):
+            cache.get_or_compute("k", lambda: calls.append(1) or "value")
+
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
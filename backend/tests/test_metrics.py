@@ -0,0 +1,133 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.main import app
+from src.api import dependencies
+from src.core.metrics import MetricsRegistry, timed
+from src.schemas.analysis import PlayerAdvancedStats, TeamStats
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} ausente")
+
+
+class TestMetricsRegistry:
+    """Testes para contadores, histogramas e coletores"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latência", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, stage="a")
+
+        text = registry.render()
+        assert '# TYPE latency_seconds histogram' in text
+        assert _sample(text, 'latency_seconds_bucket{stage="a",le="0.1"}') == 1
+        assert _sample(text, 'latency_seconds_bucket{stage="a",le="1.0"}') == 3
+        assert _sample(text, 'latency_seconds_bucket{stage="a",le="+Inf"}') == 4
+        assert _sample(text, 'latency_seconds_count{stage="a"}') == 4
+        assert _sample(text, 'latency_seconds_sum{stage="a"}') == pytest.approx(6.05)
+
+    def test_counters_gauges_and_collectors(self):
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Erros", ("endpoint",)).inc(endpoint='a"b')
+        registry.gauge("in_flight", "Em andamento").inc()
+        registry.register_collector(lambda: [
+            ("hits_total", "counter", "Hits", {"cache": "x"}, 3),
+            ("ratio", "gauge", "Taxa", {"cache": "x"}, 0.5),
+            ("hits_total", "counter", "Hits", {"cache": "y"}, 1),
+        ])
+
+        text = registry.render()
+        assert _sample(text, 'errors_total{endpoint="a\\"b"}') == 1
+        assert _sample(text, "in_flight") == 1
+        lines = text.splitlines()
+        # Amostras da mesma métrica ficam juntas
+        hits = [i for i, line in enumerate(lines) if line.startswith("hits_total{")]
+        assert hits[1] - hits[0] == 1
+
+    def test_timed_sync_and_async(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("stage_seconds", "Etapas", ("stage",))
+
+        @timed("sync", histogram)
+        def work(x):
+            return x * 2
+
+        @timed("async", histogram)
+        async def async_work(x):
+            return x + 1
+
+        assert work(2) == 4
+        assert asyncio.run(async_work(1)) == 2
+        text = registry.render()
+        assert _sample(text, 'stage_seconds_count{stage="sync"}') == 1
+        assert _sample(text, 'stage_seconds_count{stage="async"}') == 1
+        assert work.__name__ == "work"
+
+
+class TestMetricsEndpoint:
+    """/metrics expõe etapas do pipeline, HTTP e caches"""
+
+    def test_simulate_fit_stages_exposed(self):
+        # Serviços reais (também vistos pelo coletor), só com os dados da NBA API trocados
+        nba_client = dependencies.get_nba_client.get()
+        client = TestClient(app)
+        with patch.object(nba_client, "get_player_advanced_stats", return_value=PlayerAdvancedStats(
+            player_id=1, player_name="Sniper", fg3a=8.0, fg3_pct=0.42, min=30.0, position="SG"
+        )), patch.object(nba_client, "get_team_stats", return_value=TeamStats(
+            team_id=100, team_name="T", fg3_pct_rank=28
+        )):
+            assert client.get("/api/v1/simulate-fit?player_id=1&team_id=100").status_code == 200
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        for stage in ("analyze_player", "analyze_team_needs", "analyze_friction",
+                      "calculate_final_verdict", "response_serialization"):
+            assert _sample(text, f'simulation_stage_seconds_count{{stage="{stage}"}}') >= 1
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/simulate-fit",status="200"}' in text
+        assert "http_requests_in_flight" in text
+        assert 'cache_hit_ratio{cache="http_response"}' in text
+        assert 'cache_hits_total{cache="player_analysis"}' in text
+        assert "nba_upstream_circuit_open 0" in text
+
+    def test_upstream_attempts_and_errors_counted(self):
+        from src.infrastructure.external.nba_api_client import NBAApiClient, UPSTREAM_ERRORS, UPSTREAM_SECONDS
+
+        def failing(**params):
+            raise ValueError("resposta inválida")
+
+        client = NBAApiClient()
+        errors = UPSTREAM_ERRORS.labels(endpoint="Failing", error="ValueError")
+        before = errors.value
+        with pytest.raises(ValueError):
+            client._request("Failing", failing, season="2024-25")
+        client._request("Working", lambda **params: {"ok": True}, season="2024-25")
+
+        assert errors.value == before + 1
+        assert UPSTREAM_SECONDS.labels(endpoint="Working").count >= 1
+
+    def test_endpoint_absent_when_disabled(self):
+        # Configuração lida no import de src.main: roda num processo separado
+        code = (
+            "from fastapi.testclient import TestClient\n"
+            "from src.main import app\n"
+            "print(TestClient(app).get('/metrics').status_code)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env=dict(os.environ, METRICS_ENABLED="false"),
+            capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip().splitlines()[-1] == "404"
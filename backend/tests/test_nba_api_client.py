@@ -0,0 +1,260 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from src.infrastructure.external.nba_api_client import NBAApiClient
+from src.infrastructure.external.season_cache import SeasonCache
+
+
+def _endpoint_returning(df):
+    endpoint = Mock()
+    endpoint.get_data_frames.return_value = [df]
+    return endpoint
+
+
+@pytest.fixture(autouse=True)
+def mock_player_index():
+    positions = pd.DataFrame({"PERSON_ID": [1, 3, 6], "POSITION": ["G", "C", "G"]})
+    with patch("src.infrastructure.external.nba_api_client.playerindex") as mock_endpoint:
+        mock_endpoint.PlayerIndex.return_value = _endpoint_returning(positions)
+        yield mock_endpoint
+
+
+class TestPlayerStatsSnapshot:
+    """Testes para o snapshot por temporada da LeagueDashPlayerStats"""
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_league_table_downloaded_once_per_season(self, mock_endpoint, league_player_stats_df):
+        """Consultas seguintes são servidas do snapshot, sem novo download"""
+        mock_endpoint.LeagueDashPlayerStats.return_value = _endpoint_returning(league_player_stats_df)
+        client = NBAApiClient()
+
+        first = client.get_player_advanced_stats(1)
+        second = client.get_player_advanced_stats(3)
+
+        assert first.player_name == "Klay Thompson"
+        assert second.blk == 2.3
+        assert mock_endpoint.LeagueDashPlayerStats.call_count == 1
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_fallback_season_is_cached_too(self, mock_endpoint, league_player_stats_df):
+        """Jogador ausente na temporada atual busca a anterior uma única vez"""
+        current = league_player_stats_df[league_player_stats_df["PLAYER_ID"] != 6]
+        mock_endpoint.LeagueDashPlayerStats.side_effect = lambda season, **kw: _endpoint_returning(
+            current if season == "2024-25" else league_player_stats_df
+        )
+        client = NBAApiClient()
+
+        assert client.get_player_advanced_stats(6).player_name == "Chris Paul"
+        assert client.get_player_advanced_stats(6).player_name == "Chris Paul"
+        assert mock_endpoint.LeagueDashPlayerStats.call_count == 2
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_positions_merged_from_player_index(self, mock_endpoint, league_player_stats_df):
+        """Posição do jogador vem do PlayerIndex, baixado junto com a tabela"""
+        mock_endpoint.LeagueDashPlayerStats.return_value = _endpoint_returning(league_player_stats_df)
+        client = NBAApiClient()
+
+        assert client.get_player_advanced_stats(3).position == "C"
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_usage_merged_from_advanced_table(self, mock_endpoint, league_player_stats_df):
+        """USG% e AST% vêm da LeagueDashPlayerStats Advanced"""
+        base = league_player_stats_df.drop(columns=["USG_PCT", "AST_PCT"])
+        advanced = league_player_stats_df[["PLAYER_ID", "USG_PCT", "AST_PCT"]]
+        mock_endpoint.LeagueDashPlayerStats.side_effect = lambda **kw: _endpoint_returning(
+            advanced if kw.get("measure_type_detailed_defense") == "Advanced" else base
+        )
+        client = NBAApiClient()
+
+        stats = client.get_player_advanced_stats(6)
+
+        assert stats.usg_pct == pytest.approx(0.21)
+        assert stats.ast_pct == pytest.approx(0.45)
+        assert mock_endpoint.LeagueDashPlayerStats.call_count == 2
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_missing_positions_do_not_break_lookup(
+        self, mock_endpoint, mock_player_index, league_player_stats_df
+    ):
+        """Falha no PlayerIndex mantém os stats com posição vazia"""
+        mock_endpoint.LeagueDashPlayerStats.return_value = _endpoint_returning(league_player_stats_df)
+        mock_player_index.PlayerIndex.side_effect = ConnectionError("timeout")
+        client = NBAApiClient()
+
+        stats = client.get_player_advanced_stats(1)
+
+        assert stats.player_name == "Klay Thompson"
+        assert stats.position == ""
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_unknown_player_returns_none(self, mock_endpoint, league_player_stats_df):
+        """Jogador inexistente nas duas temporadas retorna None"""
+        mock_endpoint.LeagueDashPlayerStats.return_value = _endpoint_returning(league_player_stats_df)
+        client = NBAApiClient()
+
+        assert client.get_player_advanced_stats(999) is None
+
+    @patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats")
+    def test_upstream_error_returns_none(self, mock_endpoint):
+        """Falha na NBA API sem snapshot anterior retorna None"""
+        mock_endpoint.LeagueDashPlayerStats.side_effect = ConnectionError("timeout")
+        client = NBAApiClient()
+
+        assert client.get_player_advanced_stats(1) is None
+
+
+class TestUpstreamCoalescing:
+    """Testes para a coalescência das chamadas à NBA API"""
+
+    @patch("src.infrastructure.external.nba_api_client.commonteamroster")
+    def test_concurrent_roster_requests_share_download(self, mock_endpoint):
+        """Rosters pedidos ao mesmo tempo geram um único download"""
+        def slow_roster(**kwargs):
+            time.sleep(0.05)
+            return _endpoint_returning(pd.DataFrame({"PLAYER_ID": [1, 2]}))
+
+        mock_endpoint.CommonTeamRoster.side_effect = slow_roster
+        client = NBAApiClient()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get_team_roster(100)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert mock_endpoint.CommonTeamRoster.call_count == 1
+        assert all(len(roster) == 2 for roster in results)
+        stats = client.upstream_stats()
+        assert (stats["issued"], stats["coalesced"], stats["in_flight"]) == (1, 7, 0)
+
+    @patch("src.infrastructure.external.nba_api_client.commonteamroster")
+    def test_different_params_are_not_coalesced(self, mock_endpoint):
+        """Times diferentes são downloads distintos"""
+        mock_endpoint.CommonTeamRoster.return_value = _endpoint_returning(pd.DataFrame())
+        client = NBAApiClient()
+
+        client.get_team_roster(100)
+        client.get_team_roster(101)
+
+        assert mock_endpoint.CommonTeamRoster.call_count == 2
+
+
+class TestSeasonCache:
+    """Testes para TTL e single-flight do cache por temporada"""
+
+    def test_expired_entry_is_reloaded(self):
+        """Snapshot expirado dispara novo carregamento"""
+        loader = Mock(side_effect=["v1", "v2"])
+        cache = SeasonCache(loader, ttl_seconds=0)
+
+        assert cache.get("2024-25") == "v1"
+        assert cache.get("2024-25") == "v2"
+
+    def test_failed_refresh_serves_previous_snapshot(self):
+        """Falha no refresh mantém o último snapshot válido"""
+        loader = Mock(side_effect=["v1", ConnectionError("timeout")])
+        cache = SeasonCache(loader, ttl_seconds=0)
+
+        cache.get("2024-25")
+
+        assert cache.get("2024-25") == "v1"
+
+    def test_failed_refresh_retried_after_backoff(self):
+        """Com o upstream fora, o loader é tentado no máximo uma vez por intervalo de retry"""
+        loader = Mock(side_effect=["v1", ConnectionError("timeout"), "v2"])
+        cache = SeasonCache(loader, ttl_seconds=60, retry_seconds=0.05)
+        cache.get("2024-25")
+        version = cache.version
+
+        cache._entries["2024-25"] = ("v1", time.monotonic() - 60)
+        for _ in range(5):
+            assert cache.get("2024-25") == "v1"
+        assert loader.call_count == 2 and cache.version == version
+
+        time.sleep(0.06)
+        assert cache.get("2024-25") == "v2"
+        assert loader.call_count == 3
+
+    def test_concurrent_misses_load_once(self):
+        """Threads concorrentes compartilham um único carregamento"""
+        calls = []
+
+        def slow_loader(season):
+            calls.append(season)
+            time.sleep(0.05)
+            return "snapshot"
+
+        cache = SeasonCache(slow_loader, ttl_seconds=60)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("2024-25")))
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == ["2024-25"]
+        assert results == ["snapshot"] * 10
+
+
+class TestTeamRankTable:
+    """Testes para a tabela de rankings da liga"""
+
+    @pytest.fixture
+    def mock_team_endpoint(self, league_team_stats_df):
+        base = league_team_stats_df.drop(columns=["OFF_RATING", "DEF_RATING", "PACE"])
+        advanced = league_team_stats_df[["TEAM_ID", "OFF_RATING", "DEF_RATING", "PACE"]]
+        with patch("src.infrastructure.external.nba_api_client.leaguedashteamstats") as mock_endpoint:
+            mock_endpoint.LeagueDashTeamStats.side_effect = lambda **kw: _endpoint_returning(
+                advanced if kw.get("measure_type_detailed_defense") == "Advanced" else base
+            )
+            yield mock_endpoint
+
+    def test_ranks_computed_once_for_all_teams(self, mock_team_endpoint):
+        """Rankings da liga são calculados uma vez e servidos para qualquer time"""
+        client = NBAApiClient()
+
+        best = client.get_team_stats(100)
+        worst = client.get_team_stats(129)
+
+        assert best.fg3_pct_rank == 1 and worst.fg3_pct_rank == 30
+        assert worst.reb_rank == 30 and worst.ast_rank == 30
+        assert len(client.get_team_rank_table()) == 30
+        assert mock_team_endpoint.LeagueDashTeamStats.call_count == 2
+
+    def test_real_rating_ranks_replace_defaults(self, mock_team_endpoint):
+        """DEF/OFF rating usam rankings reais (menor DEF_RATING = rank 1)"""
+        client = NBAApiClient()
+
+        best = client.get_team_stats(100)
+        worst = client.get_team_stats(129)
+
+        assert best.def_rating_rank == 1 and worst.def_rating_rank == 30
+        assert best.off_rating_rank == 1 and worst.off_rating_rank == 30
+        assert best.pace == pytest.approx(104.0)
+
+    def test_unknown_team_returns_none(self, mock_team_endpoint):
+        """Time inexistente retorna None"""
+        client = NBAApiClient()
+
+        assert client.get_team_stats(999) is None
+
+
+class TestStaticTeams:
+    """Testes para a lista estática de times"""
+
+    def test_callers_cannot_mutate_cached_teams(self):
+        """Alterar a lista retornada não afeta as chamadas seguintes"""
+        client = NBAApiClient()
+
+        teams = client.get_all_teams()
+        teams.clear()
+
+        assert len(client.get_all_teams()) == 30
@@ -1,5 +1,10 @@
+import numpy as np
+import pandas as pd
 import pytest
-from src.domain.services.player_archetype_service import PlayerArchetypeService
+from src.domain.services.player_archetype_service import (
+    PlayerArchetypeService,
+    archetypes_from_scores
+)
 from src.schemas.analysis import PlayerAdvancedStats, PlayerArchetype
 
 
@@ -194,3 +199,106 @@ class TestPlayerArchetypeService:
         
         assert PlayerArchetype.SNIPER in analysis.archetypes
         assert analysis.archetype_scores[PlayerArchetype.SNIPER] == 85
+
+
+def _league_frame(stats_list):
+    return pd.DataFrame([
+        {
+            "PLAYER_ID": s.player_id, "FG3A": s.fg3a, "FG3_PCT": s.fg3_pct,
+            "USG_PCT": s.usg_pct if s.usg_pct is not None else np.nan,
+            "AST": s.ast, "AST_PCT": s.ast_pct if s.ast_pct is not None else np.nan,
+            "BLK": s.blk, "STL": s.stl, "REB": s.reb, "OREB": s.oreb, "POSITION": s.position
+        }
+        for s in stats_list
+    ])
+
+
+class TestAnalyzeLeague:
+    """Testes de paridade entre analyze_league (vetorizado) e analyze_player (escalar)"""
+
+    FIXTURES = [
+        "sniper_stats", "ball_dominant_stats", "rim_protector_stats", "three_and_d_stats",
+        "stretch_big_stats", "playmaker_stats", "hustle_player_stats"
+    ]
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.service = PlayerArchetypeService()
+
+    def _assert_parity(self, stats_list):
+        league = self.service.analyze_league(_league_frame(stats_list))
+
+        for stats, (_, row) in zip(stats_list, league.iterrows()):
+            scalar = self.service.analyze_player(stats)
+            for archetype in PlayerArchetype:
+                if archetype == PlayerArchetype.TWO_WAY:
+                    continue
+                assert row[archetype.value] == scalar.archetype_scores[archetype], (stats, archetype)
+            assert archetypes_from_scores(row) == scalar.archetypes
+            assert row["IS_BALL_DOMINANT"] == scalar.is_ball_dominant
+            assert row["IS_ELITE_SHOOTER"] == scalar.is_elite_shooter
+            assert row["IS_DEFENSIVE_ANCHOR"] == scalar.is_defensive_anchor
+
+    def test_matches_scalar_for_fixture_players(self, request):
+        """Todos os jogadores das fixtures têm o mesmo resultado nos dois caminhos"""
+        self._assert_parity([request.getfixturevalue(name) for name in self.FIXTURES])
+
+    def test_matches_scalar_on_threshold_boundaries(self):
+        """Valores exatamente nos thresholds são classificados igual ao escalar"""
+        boundaries = [
+            PlayerAdvancedStats(player_id=1, player_name="A", fg3a=5.0, fg3_pct=0.37, position="SG"),
+            PlayerAdvancedStats(player_id=2, player_name="B", fg3a=4.99, fg3_pct=0.45, position="SG"),
+            PlayerAdvancedStats(player_id=3, player_name="C", usg_pct=0.25, position="SG"),
+            PlayerAdvancedStats(player_id=4, player_name="D", usg_pct=0.0, position="SG"),
+            PlayerAdvancedStats(player_id=5, player_name="E", ast=4.0, ast_pct=0.30, position="PG"),
+            PlayerAdvancedStats(player_id=6, player_name="F", ast=5.0, ast_pct=0.35, position="PG"),
+            PlayerAdvancedStats(player_id=7, player_name="G", blk=1.5, position="C"),
+            PlayerAdvancedStats(player_id=8, player_name="H", reb=7.0, oreb=2.0, position="PF"),
+            PlayerAdvancedStats(player_id=9, player_name="I", fg3a=3.0, fg3_pct=0.36, stl=0.8, position="SF"),
+            PlayerAdvancedStats(player_id=10, player_name="J", fg3a=2.0, fg3_pct=0.35, position="F-C"),
+        ]
+
+        self._assert_parity(boundaries)
+
+    def test_matches_scalar_on_random_league(self):
+        """Paridade em uma liga sintética de 1000 jogadores, com percentuais ausentes"""
+        rng = np.random.default_rng(42)
+        positions = ["PG", "SG", "G", "SF", "F", "PF", "C", "F-C", ""]
+        stats_list = [
+            PlayerAdvancedStats(
+                player_id=i, player_name=f"Player {i}",
+                fg3a=round(float(rng.uniform(0, 10)), 1), fg3_pct=round(float(rng.uniform(0, 0.5)), 2),
+                usg_pct=None if i % 5 == 0 else round(float(rng.uniform(0.1, 0.4)), 2),
+                ast=round(float(rng.uniform(0, 11)), 1),
+                ast_pct=None if i % 3 == 0 else round(float(rng.uniform(0, 0.45)), 2),
+                blk=round(float(rng.uniform(0, 3)), 1), stl=round(float(rng.uniform(0, 2)), 1),
+                reb=round(float(rng.uniform(0, 14)), 1), oreb=round(float(rng.uniform(0, 5)), 1),
+                position=positions[i % len(positions)]
+            )
+            for i in range(1000)
+        ]
+
+        self._assert_parity(stats_list)
+
+    def test_accepts_numpy_arrays_without_optional_columns(self):
+        """Aceita dict de arrays; USG%, AST% e posição ausentes equivalem a None/vazio"""
+        league = self.service.analyze_league({
+            "PLAYER_ID": np.array([1, 2]),
+            "FG3A": np.array([8.0, 0.0]), "FG3_PCT": np.array([0.42, 0.0]),
+            "AST": np.array([2.0, 9.0]), "BLK": np.array([0.3, 2.1]),
+            "STL": np.array([0.8, 1.0]), "REB": np.array([3.0, 11.0]), "OREB": np.array([0.5, 3.0]),
+        })
+
+        assert list(league[PlayerArchetype.SNIPER.value]) == [100, 0]
+        assert list(league[PlayerArchetype.BALL_DOMINANT.value]) == [0, 0]
+        assert list(league["IS_DEFENSIVE_ANCHOR"]) == [False, True]
+
+    def test_null_position_is_not_big(self):
+        """POSITION nula (linha do SQLite ou sem CommonPlayerInfo) não quebra nem vira Stretch Big"""
+        league = self.service.analyze_league(pd.DataFrame({
+            "PLAYER_ID": [1, 2, 3],
+            "FG3A": [4.0, 4.0, 4.0], "FG3_PCT": [0.38, 0.38, 0.38],
+            "POSITION": [None, np.nan, "F-C"],
+        }))
+
+        assert list(league[PlayerArchetype.STRETCH_BIG.value]) == [0, 0, 90]
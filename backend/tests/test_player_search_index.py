@@ -0,0 +1,67 @@
+import pytest
+from src.infrastructure.external.player_search_index import PlayerSearchIndex, normalize_name
+
+
+PLAYERS = [
+    {"id": 1, "full_name": "LeBron James", "is_active": True},
+    {"id": 2, "full_name": "Bronny James", "is_active": True},
+    {"id": 3, "full_name": "Nikola Jokić", "is_active": True},
+    {"id": 4, "full_name": "Luka Dončić", "is_active": True},
+    {"id": 5, "full_name": "Jim Jones", "is_active": False},
+    {"id": 6, "full_name": "James Harden", "is_active": True},
+    {"id": 7, "full_name": "Mike James", "is_active": False},
+]
+
+
+class TestPlayerSearchIndex:
+    """Testes para o índice de busca de jogadores por nome"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.index = PlayerSearchIndex(PLAYERS)
+
+    def test_normalize_folds_accents_and_case(self):
+        """Normalização remove acentos, caixa e pontuação"""
+        assert normalize_name("Nikola Jokić") == "nikola jokic"
+        assert normalize_name("Karl-Anthony  Towns") == "karl anthony towns"
+
+    def test_accent_insensitive_search(self):
+        """Busca sem acento encontra nomes acentuados"""
+        results = self.index.search("jokic")
+
+        assert [p["id"] for p in results] == [3]
+
+    def test_substring_match_preserved(self):
+        """Termos no meio do nome continuam sendo encontrados"""
+        results = self.index.search("bron")
+
+        assert {p["id"] for p in results} == {1, 2}
+
+    def test_prefix_matches_ranked_first(self):
+        """Nome que começa com o termo vem antes de sobrenome e substring"""
+        results = self.index.search("james")
+
+        assert results[0]["id"] == 6
+        assert {p["id"] for p in results[1:]} == {1, 2, 7}
+
+    def test_active_players_ranked_before_inactive(self):
+        """Dentro da mesma faixa, jogadores ativos vêm primeiro"""
+        results = self.index.search("james")
+
+        assert results[-1]["id"] == 7
+
+    def test_active_only_filter(self):
+        """Filtro active_only exclui aposentados"""
+        results = self.index.search("j", limit=10, active_only=True)
+
+        assert all(p["is_active"] for p in results)
+        assert 5 not in {p["id"] for p in results}
+
+    def test_limit_applied(self):
+        """Retorna no máximo `limit` resultados"""
+        assert len(self.index.search("a", limit=2)) == 2
+
+    def test_no_match_returns_empty(self):
+        """Termo sem correspondência retorna lista vazia"""
+        assert self.index.search("zzz") == []
+        assert self.index.search("   ") == []
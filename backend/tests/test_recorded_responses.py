@@ -0,0 +1,145 @@
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from src.core.files import write_json_atomic
+from src.infrastructure.external.nba_api_client import NBAApiClient
+from src.infrastructure.external.recorded_responses import (
+    RecordedResponse,
+    RecordedResponses,
+    RecordingNotFound,
+    request_key
+)
+
+MODULE = "src.infrastructure.external.nba_api_client"
+
+
+def _payload(name: str, df: pd.DataFrame) -> dict:
+    return {"resultSets": [{"name": name, "headers": list(df.columns), "rowSet": df.values.tolist()}]}
+
+
+def _live_endpoint(name: str, df: pd.DataFrame) -> Mock:
+    endpoint = Mock()
+    endpoint.get_dict.return_value = _payload(name, df)
+    endpoint.get_data_frames.return_value = [df]
+    return endpoint
+
+
+@pytest.fixture
+def live_player_endpoints(league_player_stats_df):
+    positions = pd.DataFrame({"PERSON_ID": [1, 3, 6], "POSITION": ["G", "C", "G"]})
+    stats = league_player_stats_df.drop(columns=["POSITION"])
+    with patch(f"{MODULE}.leaguedashplayerstats") as players, patch(f"{MODULE}.playerindex") as index:
+        players.LeagueDashPlayerStats.return_value = _live_endpoint("LeagueDashPlayerStats", stats)
+        index.PlayerIndex.return_value = _live_endpoint("PlayerIndex", positions)
+        yield players.LeagueDashPlayerStats
+
+
+class TestRecordedResponse:
+    """Testes para a leitura de um JSON gravado no formato do nba_api"""
+
+    def test_frames_and_normalized_dict(self):
+        response = RecordedResponse({"resultSets": [
+            {"name": "CommonPlayerInfo", "headers": ["PERSON_ID", "POSITION"], "rowSet": [[1, "Guard"]]},
+            {"name": "Empty", "headers": [], "rowSet": []},
+        ]})
+
+        frames = response.get_data_frames()
+        assert frames[0].to_dict("records") == [{"PERSON_ID": 1, "POSITION": "Guard"}]
+        assert frames[1].empty
+        assert response.get_normalized_dict()["CommonPlayerInfo"] == [{"PERSON_ID": 1, "POSITION": "Guard"}]
+
+    def test_single_result_set(self):
+        response = RecordedResponse({"resultSet": {"name": "Roster", "headers": ["PLAYER_ID"], "rowSet": [[7]]}})
+
+        assert response.get_data_frames()[0]["PLAYER_ID"].tolist() == [7]
+
+    def test_request_key_is_order_independent(self):
+        assert request_key({"season": "2024-25", "per_mode_detailed": "PerGame"}) == \
+            "per_mode_detailed=PerGame&season=2024-25"
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            RecordedResponses(str(tmp_path), mode="live")
+
+
+class TestRecordAndReplay:
+    """Cliente gravando respostas da NBA API e outro servindo-as sem rede"""
+
+    def test_recorded_league_replays_offline(self, tmp_path, live_player_endpoints):
+        recorder = NBAApiClient(recordings=RecordedResponses(str(tmp_path), mode="record"))
+        assert recorder.get_player_advanced_stats(1).pts == 20.0
+        live_calls = live_player_endpoints.call_count
+        recorder.recordings.flush()
+        assert sorted(os.listdir(tmp_path)) == ["LeagueDashPlayerStats.json", "PlayerIndex.json"]
+
+        replay = NBAApiClient(recordings=RecordedResponses(str(tmp_path), mode="replay"))
+        stats = replay.get_player_advanced_stats(3)
+
+        assert stats.pts == 12.0 and stats.position == "C"
+        assert live_player_endpoints.call_count == live_calls
+        assert replay.upstream_stats()["issued"] == 0
+
+    def test_record_calls_upstream_once(self, tmp_path, live_player_endpoints):
+        recordings = RecordedResponses(str(tmp_path), mode="record")
+        NBAApiClient(recordings=recordings).get_player_advanced_stats(1)
+        recordings.flush()
+        calls = live_player_endpoints.call_count
+
+        # Outro processo gravando no mesmo diretório não baixa de novo
+        NBAApiClient(recordings=RecordedResponses(str(tmp_path), mode="record")).get_player_advanced_stats(1)
+
+        assert live_player_endpoints.call_count == calls
+        assert recordings.stats()["recorded"] == calls + 1  # + PlayerIndex
+
+    def test_recordings_buffered_until_flush(self, tmp_path):
+        """Cada resposta nova fica em memória; o flush grava cada arquivo uma única vez"""
+        recordings = RecordedResponses(str(tmp_path), mode="record")
+        live = _live_endpoint("CommonPlayerInfo", pd.DataFrame({"PERSON_ID": [1]}))
+        with patch(f"{MODULE}.commonplayerinfo") as endpoint, \
+                patch("src.infrastructure.external.recorded_responses.write_json_atomic",
+                      wraps=write_json_atomic) as write:
+            endpoint.CommonPlayerInfo.return_value = live
+            client = NBAApiClient(recordings=recordings)
+            for player_id in range(1, 6):
+                client.get_player_info(player_id)
+            assert os.listdir(tmp_path) == []
+            assert recordings.stats()["pending_files"] == 1
+
+            assert recordings.flush() == ["CommonPlayerInfo"]
+            assert recordings.flush() == []
+
+        assert write.call_count == 1
+        with open(tmp_path / "CommonPlayerInfo.json", encoding="utf-8") as f:
+            assert len(json.load(f)) == 5
+
+    def test_files_parsed_lazily_once(self, tmp_path):
+        info = {"resultSets": [{
+            "name": "CommonPlayerInfo",
+            "headers": ["DISPLAY_FIRST_LAST", "POSITION", "TEAM_ID", "TEAM_NAME"],
+            "rowSet": [["Stephen Curry", "Guard", 1610612744, "Warriors"]]
+        }]}
+        with open(tmp_path / "CommonPlayerInfo.json", "w", encoding="utf-8") as f:
+            json.dump({request_key({"player_id": 201939}): info, request_key({"player_id": 2544}): info}, f)
+        recordings = RecordedResponses(str(tmp_path), mode="replay")
+        client = NBAApiClient(recordings=recordings)
+        assert recordings.stats()["files_loaded"] == 0
+
+        for _ in range(3):
+            assert client.get_player_info(201939).full_name == "Stephen Curry"
+        assert client.get_player_info(2544).team_name == "Warriors"
+
+        assert recordings.stats()["files_loaded"] == 1
+
+    def test_replay_never_goes_to_network(self, tmp_path):
+        recordings = RecordedResponses(str(tmp_path), mode="replay")
+        client = NBAApiClient(recordings=recordings)
+
+        with pytest.raises(RecordingNotFound):
+            recordings.replay("CommonPlayerInfo", {"player_id": 1})
+        with patch(f"{MODULE}.commonplayerinfo") as endpoint:
+            assert client.get_player_info(1) is None
+        endpoint.CommonPlayerInfo.assert_not_called()
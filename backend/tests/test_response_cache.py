@@ -0,0 +1,212 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from src import main
+from src.main import app
+from src.api import dependencies
+from src.api.middleware.response_cache import CachedResponse, ResponseCache, ResponseCacheMiddleware
+from src.infrastructure.external.nba_api_client import NBAApiClient
+
+
+def _entry(size: int, stored_at: float = 0.0) -> CachedResponse:
+    return CachedResponse(body=b"x" * size, etag='"e"', content_type="application/json", stored_at=stored_at)
+
+
+class TestResponseCache:
+    """Testes para o LRU limitado por bytes"""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=100, ttl_seconds=60, clock=lambda: 0.0)
+        cache.put("a", _entry(40))
+        cache.put("b", _entry(40))
+        cache.get("a")
+        cache.put("c", _entry(40))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.size_bytes == 80
+        assert cache.evictions == 1
+
+    def test_rejects_oversized_entries(self):
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=10, ttl_seconds=60)
+        assert cache.put("big", _entry(11)) is False
+        assert len(cache) == 0
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=100, ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", _entry(10, stored_at=0.0))
+        now[0] = 10.0
+
+        assert cache.get("a") is None
+        assert cache.size_bytes == 0
+
+
+class TestResponseCacheMiddleware:
+    """Testes para ETag, 304 e invalidação pela versão dos dados"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.calls = 0
+        self.version = "v1"
+        inner = FastAPI()
+
+        @inner.get("/items")
+        async def items(a: int = 0, b: int = 0):
+            self.calls += 1
+            return {"a": a, "b": b, "version": self.version}
+
+        @inner.get("/missing")
+        async def missing():
+            self.calls += 1
+            raise HTTPException(status_code=404, detail="não encontrado")
+
+        @inner.get("/volatile")
+        async def volatile():
+            self.calls += 1
+            return JSONResponse({"score": 0}, headers={"Cache-Control": "no-store"})
+
+        @inner.get("/other")
+        async def other():
+            self.calls += 1
+            return {"ok": True}
+
+        self.cache = ResponseCache(max_bytes=10_000, max_entry_bytes=1_000, ttl_seconds=60)
+        inner.add_middleware(
+            ResponseCacheMiddleware, cache=self.cache, version=lambda: self.version,
+            paths=[r"^/items$", r"^/missing$", r"^/volatile$"], max_age_seconds=30
+        )
+        self.client = TestClient(inner)
+
+    def test_repeat_hit_skips_route(self):
+        first = self.client.get("/items?a=1&b=2")
+        second = self.client.get("/items?b=2&a=1")
+
+        assert self.calls == 1
+        assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["cache-control"] == "public, max-age=30"
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get("/items").headers["etag"]
+
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.client.get("/items", headers={"If-None-Match": header})
+            assert response.status_code == 304
+            assert response.content == b""
+            assert response.headers["etag"] == etag
+        assert self.client.get("/items", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    def test_new_data_version_invalidates(self):
+        old = self.client.get("/items")
+        self.version = "v2"
+        new = self.client.get("/items")
+
+        assert self.calls == 2
+        assert new.json()["version"] == "v2"
+        assert new.headers["etag"] != old.headers["etag"]
+        assert self.client.get("/items", headers={"If-None-Match": old.headers["etag"]}).status_code == 200
+
+    def test_errors_and_other_routes_not_cached(self):
+        for _ in range(2):
+            assert self.client.get("/missing").status_code == 404
+            assert "x-cache" not in self.client.get("/other").headers
+        assert self.calls == 4
+
+    def test_route_no_store_not_cached(self):
+        for _ in range(2):
+            response = self.client.get("/volatile")
+            assert response.headers["cache-control"] == "no-store"
+            assert "x-cache" not in response.headers
+        assert self.calls == 2 and len(self.cache) == 0
+
+    def test_unknown_version_bypasses_cache(self):
+        """Sem versão (serviços ainda subindo) nada é lido nem gravado no cache"""
+        self.version = None
+        for _ in range(2):
+            assert "x-cache" not in self.client.get("/items").headers
+        assert self.calls == 2 and len(self.cache) == 0
+
+    def test_no_store_bypasses_cache(self):
+        self.client.get("/items")
+        response = self.client.get("/items", headers={"Cache-Control": "no-store"})
+        assert self.calls == 2
+        assert "x-cache" not in response.headers
+
+
+class TestApplicationCache:
+    """O app serve /teams do cache e expõe estatísticas"""
+
+    def test_teams_cached(self):
+        client = TestClient(app)
+        first = client.get("/api/v1/teams")
+        second = client.get("/api/v1/teams", headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.status_code == 200 and first.headers["x-cache"] == "MISS"
+        assert second.status_code == 304
+
+        stats = client.get("/api/v1/cache/stats").json()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+
+    def test_simulate_fit_error_result_not_cached(self, override_dependency):
+        """Jogador sem dados (upstream fora) não fica preso no cache até o TTL"""
+        from src.domain.services.fit_simulator import FitSimulator
+
+        nba_client = Mock(data_version=Mock(return_value="v1"))
+        simulator = FitSimulator(nba_client=nba_client, async_client=Mock(
+            get_player_advanced_stats=AsyncMock(return_value=None),
+            get_team_stats=AsyncMock(return_value=None)
+        ))
+        override_dependency(dependencies.get_fit_simulator, simulator)
+        override_dependency(dependencies.get_history_recorder).record = AsyncMock()
+        client = TestClient(app)
+
+        with patch.object(dependencies.get_nba_client, "peek", return_value=nba_client):
+            responses = [client.get("/api/v1/simulate-fit?player_id=1&team_id=100") for _ in range(2)]
+
+        for response in responses:
+            assert response.status_code == 200 and response.json()["fit_score"] == 0
+            assert response.headers["cache-control"] == "no-store"
+            assert "x-cache" not in response.headers
+        assert client.get("/api/v1/cache/stats").json()["entries"] == 0
+
+    def test_simulate_fit_always_reaches_history(self, override_dependency):
+        """Simulações repetidas não vêm do cache: cada uma entra no histórico"""
+        from src.domain.entities.analysis import FitRecord
+        from src.schemas.analysis import FitLabel
+
+        result = FitRecord(
+            player_id=1, player_name="P", team_id=100, team_name="T", fit_score=80, fit_label=FitLabel.STARTER
+        )
+        override_dependency(dependencies.get_fit_simulator).simulate_fit = AsyncMock(return_value=result)
+        recorder = override_dependency(dependencies.get_history_recorder)
+        recorder.record = AsyncMock()
+        client = TestClient(app)
+
+        with patch.object(dependencies.get_nba_client, "peek", return_value=Mock(data_version=Mock(return_value="v1"))):
+            responses = [client.get("/api/v1/simulate-fit?player_id=1&team_id=100") for _ in range(2)]
+
+        assert all(r.status_code == 200 and "x-cache" not in r.headers for r in responses)
+        assert recorder.record.await_count == 2
+
+    def test_data_version_never_builds_the_client(self):
+        """O middleware roda no event loop: sem cliente pronto, não há versão em vez de construí-lo"""
+        with patch.object(dependencies.get_nba_client, "peek", return_value=None), \
+                patch.object(dependencies.get_nba_client, "get") as get:
+            assert main._data_version() is None
+        get.assert_not_called()
+
+    def test_data_version_changes_on_snapshot_swap(self, league_team_stats_df):
+        from src.infrastructure.external.league_tables import TeamRankTable
+
+        client = NBAApiClient()
+        before = client.data_version()
+        client._team_rank_cache.put(client.current_season, TeamRankTable(client.current_season, league_team_stats_df))
+
+        assert client.data_version() != before
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from src.domain.entities.analysis import PlayerAnalysisRecord
+from src.domain.services.roster_composition_service import RosterCompositionIndex
+from src.domain.services.roster_friction_service import RosterFrictionService
+from src.schemas.analysis import TeamStats
+
+
+@pytest.fixture
+def league_df():
+    # 10: ball dominant | 11: arremessador de elite | 12: protetor de aro | 13: role player
+    return pd.DataFrame({
+        "PLAYER_ID": [10, 11, 12, 13, 14],
+        "USG_PCT": [0.32, 0.18, 0.15, 0.12, 0.27],
+        "FG3A": [4.0, 9.0, 0.0, 2.0, 3.0],
+        "FG3_PCT": [0.33, 0.43, 0.0, 0.30, 0.34],
+        "BLK": [0.3, 0.2, 2.5, 0.4, 0.5],
+        "AST": [6.0, 2.0, 1.0, 1.0, 5.0],
+        "STL": [1.0, 0.8, 0.7, 0.5, 1.0],
+        "REB": [5.0, 3.0, 11.0, 4.0, 4.0],
+        "OREB": [0.5, 0.3, 3.5, 0.8, 0.6],
+        "POSITION": ["G", "G", "C", "F", "G"],
+    })
+
+
+class TestRosterCompositionIndex:
+    """Testes para o índice de composição dos elencos"""
+
+    def test_build_classifies_each_roster(self, league_df):
+        """Cada time guarda os ids por perfil e as contagens"""
+        index = RosterCompositionIndex.build("2024-25", league_df, {100: [10, 11, 14], 101: [12, 13]})
+
+        stars = index.get(100)
+        assert stars.ball_dominant_ids == (10, 14)
+        assert stars.elite_shooter_ids == (11,)
+        assert stars.ball_dominant_count == 2
+        assert index.get(101).rim_anchor_ids == (12,)
+        assert index.get(101).ball_dominant_count == 0
+
+    def test_update_team_recomputes_only_that_team(self, league_df):
+        """Uma troca de roster altera apenas o time afetado"""
+        index = RosterCompositionIndex.build("2024-25", league_df, {100: [10, 11], 101: [12, 13]})
+        untouched = index.get(101)
+
+        updated = index.update_team(100, [11, 13])
+
+        assert updated.ball_dominant_count == 0
+        assert index.get(101) is untouched
+
+    def test_unchanged_roster_is_not_recomputed(self, league_df):
+        index = RosterCompositionIndex.build("2024-25", league_df, {100: [10, 11]})
+        before = index.get(100)
+
+        assert index.update_team(100, [11, 10]) is before
+
+    def test_apply_sets_ball_dominant_count(self, league_df):
+        """TeamStats recebe a contagem do elenco; times desconhecidos ficam como estão"""
+        index = RosterCompositionIndex.build("2024-25", league_df, {100: [10, 14]})
+        stats = TeamStats(team_id=100, team_name="Stars")
+        unknown = TeamStats(team_id=999, team_name="Unknown")
+
+        assert index.apply(stats).ball_dominant_count == 2
+        assert stats.ball_dominant_count == 0
+        assert index.apply(unknown) is unknown
+
+    def test_player_not_counted_against_own_team(self, league_df):
+        """Ball dominant avaliado no próprio time não gera Usage Clash consigo mesmo"""
+        index = RosterCompositionIndex.build("2024-25", league_df, {100: [10, 11], 101: [14]})
+        star = PlayerAnalysisRecord(player_id=10, player_name="Star", position="G", stats=None, is_ball_dominant=True)
+        own = index.apply(TeamStats(team_id=100, team_name="Own"))
+        other = index.apply(TeamStats(team_id=101, team_name="Other"))
+        friction = RosterFrictionService()
+
+        assert own.ball_dominant_count == 1 and "ball_dominant_ids" not in own.model_dump()
+        assert friction.analyze_friction(star, own).conflicts == []
+        assert [c.conflict_type for c in friction.analyze_friction(star, other).conflicts] == ["Usage Clash"]
@@ -1,8 +1,15 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, Mock
 from src.main import app
-from src.schemas.analysis import PlayerAdvancedStats, TeamStats
+from src.api.dependencies import (
+    get_fit_matrix_store, get_fit_simulator, get_nba_client, get_trade_simulator
+)
+from src.api.routes import simulation
+from src.domain.entities.analysis import ScanProgress
+from src.schemas.analysis import FitLabel, PlayerAdvancedStats, TeamStats
+from src.schemas.simulation import SimulationResponse
 
 
 class TestSimulationAPI:
@@ -12,9 +19,9 @@ class TestSimulationAPI:
     def setup(self):
         self.client = TestClient(app)
 
-    @patch("src.api.routes.simulation.nba_client")
-    def test_search_players_returns_results(self, mock_nba_client):
+    def test_search_players_returns_results(self, override_dependency):
         """Busca de jogadores retorna resultados formatados"""
+        mock_nba_client = override_dependency(get_nba_client)
         mock_nba_client.search_player_by_name.return_value = [
             {"id": 1, "full_name": "LeBron James", "is_active": True},
             {"id": 2, "full_name": "LeBron James Jr.", "is_active": False},
@@ -27,18 +34,20 @@ class TestSimulationAPI:
         assert len(data) == 2
         assert data[0]["full_name"] == "LeBron James"
 
-    @patch("src.api.routes.simulation.nba_client")
-    def test_search_players_limits_results(self, mock_nba_client):
+    def test_search_players_limits_results(self, override_dependency):
         """Busca de jogadores limita a 10 resultados"""
-        mock_nba_client.search_player_by_name.return_value = [
+        mock_nba_client = override_dependency(get_nba_client)
+        # O limite é aplicado pelo cliente (índice de busca), não pela rota
+        mock_nba_client.search_player_by_name.side_effect = lambda name, limit, active_only: [
             {"id": i, "full_name": f"Player {i}", "is_active": True}
             for i in range(20)
-        ]
+        ][:limit]
         
         response = self.client.get("/api/v1/players/search?name=player")
         
         assert response.status_code == 200
         assert len(response.json()) == 10
+        mock_nba_client.search_player_by_name.assert_called_once_with("player", limit=10, active_only=False)
 
     def test_search_players_requires_min_length(self):
         """Busca requer mínimo de 2 caracteres"""
@@ -46,9 +55,9 @@ class TestSimulationAPI:
         
         assert response.status_code == 422
 
-    @patch("src.api.routes.simulation.nba_client")
-    def test_get_all_teams_returns_list(self, mock_nba_client):
+    def test_get_all_teams_returns_list(self, override_dependency):
         """Endpoint de times retorna lista de times"""
+        mock_nba_client = override_dependency(get_nba_client)
         mock_nba_client.get_all_teams.return_value = [
             {"id": 1, "full_name": "Lakers", "abbreviation": "LAL", "city": "LA"},
             {"id": 2, "full_name": "Celtics", "abbreviation": "BOS", "city": "Boston"},
@@ -60,9 +69,9 @@ class TestSimulationAPI:
         data = response.json()
         assert len(data) == 2
 
-    @patch("src.api.routes.simulation.fit_simulator")
-    def test_simulate_fit_returns_result(self, mock_simulator):
+    def test_simulate_fit_returns_result(self, override_dependency):
         """Endpoint de simulação retorna resultado estruturado"""
+        mock_simulator = override_dependency(get_fit_simulator)
         from src.schemas.simulation import SimulationResponse
         from src.schemas.analysis import FitLabel
         import asyncio
@@ -89,6 +98,173 @@ class TestSimulationAPI:
         assert data["fit_score"] == 85
         assert data["player_name"] == "Test Player"
 
+    def test_simulate_fit_batch_returns_list(self, override_dependency):
+        """Endpoint em lote repassa jogador e times ao simulador"""
+        mock_simulator = override_dependency(get_fit_simulator)
+        from src.schemas.simulation import SimulationResponse
+        from src.schemas.analysis import FitLabel
+
+        received = {}
+
+        async def async_return(player_id, team_ids):
+            received.update(player_id=player_id, team_ids=team_ids)
+            return [
+                SimulationResponse(
+                    player_id=player_id, player_name="Test Player", team_id=tid,
+                    team_name=f"Team {tid}", fit_score=90 - i, fit_label=FitLabel.PERFECT_FIT
+                )
+                for i, tid in enumerate(team_ids)
+            ]
+
+        mock_simulator.simulate_fit_many = async_return
+
+        response = self.client.post(
+            "/api/v1/simulate-fit/batch", json={"player_id": 1, "team_ids": [100, 101]}
+        )
+
+        assert response.status_code == 200
+        assert [r["team_id"] for r in response.json()] == [100, 101]
+        assert received == {"player_id": 1, "team_ids": [100, 101]}
+
+    def test_best_fits_unknown_team_returns_404(self, override_dependency):
+        """Ranking reverso para time inexistente retorna 404"""
+        mock_simulator = override_dependency(get_fit_simulator)
+        async def async_return(*args, **kwargs):
+            return None
+
+        mock_simulator.rank_players_for_team = async_return
+
+        response = self.client.get("/api/v1/teams/999/best-fits")
+
+        assert response.status_code == 404
+
+    def test_best_fits_rejects_unknown_archetype(self):
+        """Filtro de arquétipo aceita apenas valores conhecidos"""
+        response = self.client.get("/api/v1/teams/100/best-fits?archetype=Unknown")
+
+        assert response.status_code == 422
+
+    def test_simulate_fit_summary_unknown_player_returns_404(self, override_dependency):
+        """Fora da matriz e sem dados do jogador: 404, não um resumo com score 0"""
+        override_dependency(get_fit_matrix_store).lookup.return_value = None
+        from src.domain.services.fit_simulator import FitSimulator
+
+        simulator = FitSimulator(nba_client=Mock(data_version=Mock(return_value="v1")), async_client=Mock(
+            get_player_advanced_stats=AsyncMock(return_value=None),
+            get_team_stats=AsyncMock(return_value=None)
+        ))
+        override_dependency(get_fit_simulator, simulator)
+
+        response = self.client.get("/api/v1/simulate-fit/summary?player_id=999&team_id=100")
+
+        assert response.status_code == 404
+        assert "não encontrados" in response.json()["detail"]
+
+    def test_simulate_fit_summary_served_from_matrix(self, override_dependency):
+        """Resumo do encaixe vem da matriz pré-calculada quando disponível"""
+        mock_store = override_dependency(get_fit_matrix_store)
+        from src.domain.services.fit_matrix_service import FitMatrixEntry
+        from src.schemas.analysis import FitLabel
+
+        mock_store.lookup.return_value = FitMatrixEntry(
+            fit_score=90, fit_label=FitLabel.PERFECT_FIT, projected_role="Perfect Fit"
+        )
+
+        response = self.client.get("/api/v1/simulate-fit/summary?player_id=1&team_id=100")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "matrix"
+        assert data["fit_score"] == 90
+
+    def test_simulate_trade_invalid_returns_400(self, override_dependency):
+        """Troca inconsistente vira 400 com a mensagem do simulador"""
+        mock_simulator = override_dependency(get_trade_simulator)
+        async def async_raise(moves):
+            raise ValueError("Jogador 1 não joga no time 101.")
+
+        mock_simulator.simulate_trade = async_raise
+        response = self.client.post("/api/v1/simulate-trade", json={
+            "moves": [{"player_id": 1, "from_team_id": 101, "to_team_id": 102}]
+        })
+
+        assert response.status_code == 400
+        assert "não joga" in response.json()["detail"]
+
+    def test_simulate_trade_requires_moves(self):
+        response = self.client.post("/api/v1/simulate-trade", json={"moves": []})
+        assert response.status_code == 422
+
+    def test_upstream_stats_exposes_counters(self):
+        """Contadores de coalescência ficam disponíveis para monitoramento"""
+        response = self.client.get("/api/v1/upstream/stats")
+        assert response.status_code == 200
+        data = response.json()
+        assert {"issued", "coalesced", "retries", "circuit_state"} <= set(data)
+        assert data["circuit_state"] == "closed"
+
+    def test_fit_cache_stats(self):
+        response = self.client.get("/api/v1/fit-cache/stats")
+        assert response.status_code == 200
+        assert {s["name"] for s in response.json()} == {"simulation_response", "player_analysis", "team_needs"}
+
+    def test_history_rejects_invalid_cursor(self):
+        """Cursor mal formado retorna 400"""
+        response = self.client.get("/api/v1/history?cursor=abc")
+        assert response.status_code == 400
+
+    def test_best_fits_stream_ndjson_and_sse(self, override_dependency):
+        """Streaming emite resultados e progresso em NDJSON ou SSE, terminando com done"""
+        mock_simulator = override_dependency(get_fit_simulator)
+        async def events(*args, **kwargs):
+            yield ScanProgress(0, 2)
+            yield SimulationResponse(player_id=1, player_name="A", team_id=100, team_name="T",
+                                     fit_score=90, fit_label=FitLabel.PERFECT_FIT)
+            yield ScanProgress(2, 2)
+
+        mock_simulator.stream_players_for_team = events
+
+        ndjson = self.client.get("/api/v1/teams/100/best-fits/stream")
+        assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in ndjson.text.splitlines()]
+        assert [line["event"] for line in lines] == ["progress", "result", "progress", "done"]
+        assert lines[1]["data"]["fit_score"] == 90
+        assert lines[-1]["data"]["scanned"] == 2
+
+        sse = self.client.get("/api/v1/teams/100/best-fits/stream?format=sse")
+        assert sse.headers["content-type"].startswith("text/event-stream")
+        assert [line for line in sse.text.splitlines() if line.startswith("event:")] == [
+            "event: progress", "event: result", "event: progress", "event: done"
+        ]
+
+    def test_player_fits_stream_unknown_player_returns_404(self, override_dependency):
+        mock_simulator = override_dependency(get_fit_simulator)
+        async def events(*args, **kwargs):
+            raise ValueError("Dados do jogador não encontrados.")
+            yield
+
+        mock_simulator.stream_teams_for_player = events
+
+        response = self.client.get("/api/v1/players/999/fits/stream")
+        assert response.status_code == 404
+
+    async def test_stream_stops_when_client_disconnects(self):
+        """Cliente desconectado: o corpo para no próximo progresso e fecha a varredura"""
+        scanned = []
+
+        async def events():
+            for i in range(100):
+                scanned.append(i)
+                yield ScanProgress(i, 100)
+
+        request = Mock()
+        request.is_disconnected = AsyncMock(side_effect=[False, True])
+        response = await simulation._scan_response(request, events(), "ndjson")
+        chunks = [chunk async for chunk in response.body_iterator]
+
+        assert len(chunks) == 2
+        assert len(scanned) == 3
+
     def test_simulate_fit_requires_player_id(self):
         """Simulação requer player_id"""
         response = self.client.get("/api/v1/simulate-fit?team_id=100")
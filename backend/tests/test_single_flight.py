@@ -0,0 +1,82 @@
+import threading
+import time
+import pytest
+from src.infrastructure.external.single_flight import SingleFlight
+
+
+def _run_concurrently(fn, count):
+    results, errors = [], []
+
+    def target():
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+class TestSingleFlight:
+    """Testes para a coalescência de chamadas concorrentes"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Chamadas simultâneas com a mesma chave executam a função uma vez"""
+        flight = SingleFlight()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return "table"
+
+        results, errors = _run_concurrently(lambda: flight.do(("stats", "2024-25"), slow_fetch), 10)
+
+        assert results == ["table"] * 10
+        assert not errors
+        assert len(calls) == 1
+        assert flight.stats() == {"issued": 1, "coalesced": 9, "in_flight": 0}
+
+    def test_error_propagates_to_all_waiters(self):
+        """Uma falha no download chega a todos que aguardavam"""
+        flight = SingleFlight()
+
+        def failing_fetch():
+            time.sleep(0.05)
+            raise ConnectionError("throttled")
+
+        results, errors = _run_concurrently(lambda: flight.do("key", failing_fetch), 5)
+
+        assert not results
+        assert len(errors) == 5
+        assert all(isinstance(e, ConnectionError) for e in errors)
+
+    def test_distinct_keys_are_not_coalesced(self):
+        """Chaves diferentes disparam chamadas independentes"""
+        flight = SingleFlight()
+
+        assert flight.do(("stats", "2024-25"), lambda: 1) == 1
+        assert flight.do(("stats", "2023-24"), lambda: 2) == 2
+        assert flight.stats()["issued"] == 2
+
+    def test_completed_call_is_not_cached(self):
+        """Terminada a chamada, a mesma chave volta a executar"""
+        flight = SingleFlight()
+        values = iter([1, 2])
+
+        assert flight.do("key", lambda: next(values)) == 1
+        assert flight.do("key", lambda: next(values)) == 2
+        assert flight.coalesced == 0
+
+    def test_failure_releases_key(self):
+        """Após uma falha a próxima chamada tenta de novo"""
+        flight = SingleFlight()
+
+        with pytest.raises(ValueError):
+            flight.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+        assert flight.do("key", lambda: "ok") == "ok"
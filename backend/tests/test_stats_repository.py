@@ -0,0 +1,224 @@
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from sqlalchemy import create_engine, func, inspect, select, text, update
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.database.connection import Base, migrate_schema
+from src.infrastructure.database.models import PlayerModel
+from src.infrastructure.database.stats_repository import StatsRepository
+from src.infrastructure.external.league_tables import RANKED_COLUMNS, RECORD_COLUMNS, SUPPORT_COLUMNS
+from src.infrastructure.external.nba_api_client import NBAApiClient
+
+# Colunas lidas pelo domínio: registros, elencos da troca e rankings dos times
+DOMAIN_PLAYER_COLUMNS = RECORD_COLUMNS | {"TEAM_ID", "FG3M"}
+DOMAIN_TEAM_COLUMNS = {"TEAM_ID", "TEAM_NAME", *RANKED_COLUMNS, *SUPPORT_COLUMNS}
+
+
+def _endpoint_returning(df):
+    endpoint = Mock()
+    endpoint.get_data_frames.return_value = [df]
+    return endpoint
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(engine, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def repository(session_maker):
+    return StatsRepository(session_maker)
+
+
+def _age_rows(session_maker, seconds):
+    with session_maker() as session, session.begin():
+        session.execute(update(PlayerModel).values(
+            updated_at=datetime.utcnow() - timedelta(seconds=seconds)
+        ))
+
+
+class TestStatsRepository:
+    """Testes para o cache persistente das tabelas da liga"""
+
+    def test_player_stats_round_trip(self, repository, league_player_stats_df):
+        """Tabela de jogadores salva é recarregada com as mesmas colunas"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+
+        df, updated_at = repository.load_player_stats("2024-25")
+
+        assert sorted(df["PLAYER_ID"]) == [1, 3, 6]
+        row = df[df["PLAYER_ID"] == 3].iloc[0]
+        assert row["BLK"] == 2.3 and row["POSITION"] == "C"
+        assert StatsRepository.is_fresh(updated_at, 60)
+        assert repository.load_player_stats("2023-24") is None
+
+    def test_team_stats_round_trip(self, repository, league_team_stats_df):
+        """Tabela de times preserva as colunas usadas nos rankings"""
+        repository.save_team_stats("2024-25", league_team_stats_df)
+
+        df, _ = repository.load_team_stats("2024-25")
+
+        assert len(df) == 30
+        assert set(df.columns) >= {"TEAM_ID", "FG3_PCT", "PACE", "DEF_RATING", "OFF_RATING"}
+
+    def test_domain_columns_survive_round_trip(self, repository, league_player_stats_df, league_team_stats_df):
+        """Tudo o que o domínio lê volta do SQLite com os mesmos valores"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+        repository.save_team_stats("2024-25", league_team_stats_df)
+
+        players, _ = repository.load_player_stats("2024-25")
+        teams, _ = repository.load_team_stats("2024-25")
+
+        for saved, loaded, columns in (
+            (league_player_stats_df, players, DOMAIN_PLAYER_COLUMNS),
+            (league_team_stats_df, teams, DOMAIN_TEAM_COLUMNS),
+        ):
+            assert columns <= set(loaded.columns)
+            key = "PLAYER_ID" if "PLAYER_ID" in columns else "TEAM_ID"
+            expected = saved.sort_values(key)[sorted(columns)].to_dict("records")
+            assert loaded.sort_values(key)[sorted(columns)].to_dict("records") == expected
+
+    def test_save_replaces_existing_rows(self, repository, session_maker, league_player_stats_df):
+        """Gravar a mesma temporada de novo substitui em vez de duplicar"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+        repository.save_player_stats("2024-25", league_player_stats_df.assign(PTS=30.0))
+
+        with session_maker() as session:
+            count = session.execute(select(func.count()).select_from(PlayerModel)).scalar()
+        df, _ = repository.load_player_stats("2024-25")
+
+        assert count == 3
+        assert set(df["PTS"]) == {30.0}
+
+
+    def test_dropped_rows_do_not_keep_season_stale(self, repository, session_maker, league_player_stats_df):
+        """Jogador que saiu da tabela nova sai do banco; a temporada volta a ficar fresca"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+        repository.save_player_stats("2023-24", league_player_stats_df)
+        _age_rows(session_maker, 7200)
+
+        repository.save_player_stats("2024-25", league_player_stats_df[league_player_stats_df["PLAYER_ID"] != 6])
+
+        df, updated_at = repository.load_player_stats("2024-25")
+        assert sorted(df["PLAYER_ID"]) == [1, 3]
+        assert StatsRepository.is_fresh(updated_at, 60)
+        assert len(repository.load_player_stats("2023-24")[0]) == 3
+
+
+class TestReadThroughWriteThrough:
+    """Testes da integração do NBAApiClient com o cache persistente"""
+
+    @pytest.fixture(autouse=True)
+    def mock_upstream(self, league_player_stats_df):
+        with patch("src.infrastructure.external.nba_api_client.leaguedashplayerstats") as stats, \
+                patch("src.infrastructure.external.nba_api_client.playerindex") as index:
+            stats.LeagueDashPlayerStats.return_value = _endpoint_returning(
+                league_player_stats_df.drop(columns=["POSITION"])
+            )
+            index.PlayerIndex.side_effect = ConnectionError("offline")
+            self.mock_stats = stats
+            yield
+
+    def test_upstream_fetch_written_through(self, repository):
+        """Download da NBA API é gravado no SQLite"""
+        client = NBAApiClient(stats_repository=repository)
+
+        client.get_player_advanced_stats(1)
+
+        assert repository.load_player_stats("2024-25") is not None
+
+    def test_restarted_process_served_from_sqlite(self, repository, league_player_stats_df):
+        """Processo novo com dados frescos no SQLite não acessa a NBA API"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+        client = NBAApiClient(stats_repository=repository)
+
+        stats = client.get_player_advanced_stats(3)
+
+        assert stats.player_name == "Rudy Gobert"
+        assert stats.position == "C"
+        self.mock_stats.LeagueDashPlayerStats.assert_not_called()
+
+    def test_stale_rows_trigger_refresh(self, repository, session_maker, league_player_stats_df):
+        """Linhas com updated_at expirado disparam novo download"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+        _age_rows(session_maker, 7200)
+        client = NBAApiClient(cache_ttl_seconds=3600, stats_repository=repository)
+
+        client.get_player_advanced_stats(1)
+
+        self.mock_stats.LeagueDashPlayerStats.assert_called_once()
+        _, updated_at = repository.load_player_stats("2024-25")
+        assert StatsRepository.is_fresh(updated_at, 60)
+
+    def test_stale_rows_served_when_upstream_down(self, repository, session_maker, league_player_stats_df):
+        """Sem NBA API, dados persistidos expirados ainda são servidos"""
+        repository.save_player_stats("2024-25", league_player_stats_df)
+        _age_rows(session_maker, 7200)
+        self.mock_stats.LeagueDashPlayerStats.side_effect = ConnectionError("offline")
+        client = NBAApiClient(cache_ttl_seconds=3600, stats_repository=repository)
+
+        assert client.get_player_advanced_stats(6).player_name == "Chris Paul"
+
+
+class TestMigrateSchema:
+    """Testes para a migração de bancos criados por versões anteriores"""
+
+    def test_adds_missing_columns_to_history(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE simulation_history DROP COLUMN fit_score"))
+            conn.execute(text(
+                "INSERT INTO simulation_history (player_id, team_id, veredito) VALUES (1, 2, 'ok')"
+            ))
+
+        with engine.begin() as conn:
+            migration = migrate_schema(conn)
+        with engine.begin() as conn:
+            again = migrate_schema(conn)
+
+        assert migration.added == {"simulation_history": ["fit_score"]} and migration.rebuilt == []
+        assert again.added == {} and again.rebuilt == []
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM simulation_history")).scalar() == 1
+        engine.dispose()
+
+    def test_baseline_cache_tables_rebuilt_for_season_upsert(self, tmp_path):
+        """Banco do schema original (nba_id UNIQUE sozinho) passa a aceitar duas temporadas"""
+        path = tmp_path / "baseline.db"
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.begin() as conn:
+            for table in ("teams", "players"):
+                references = ", team_id INTEGER REFERENCES teams (id)" if table == "players" else ""
+                conn.execute(text(
+                    f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, nba_id INTEGER NOT NULL, "
+                    f"name VARCHAR(100) NOT NULL, updated_at DATETIME{references})"
+                ))
+                conn.execute(text(f"CREATE UNIQUE INDEX ix_{table}_nba_id ON {table} (nba_id)"))
+                conn.execute(text(
+                    f"INSERT INTO {table} (nba_id, name, updated_at) VALUES (1, 'Old', :now)"
+                ), {"now": datetime.utcnow()})
+            Base.metadata.create_all(conn)
+            migration = migrate_schema(conn)
+        with engine.begin() as conn:
+            again = migrate_schema(conn)
+
+        assert sorted(migration.rebuilt) == ["players", "teams"]
+        assert again.rebuilt == [] and again.added == {}
+        repository = StatsRepository(sessionmaker(engine, expire_on_commit=False))
+        assert repository.load_player_stats("2024-25") is None
+        players = _players_frame()
+        repository.save_player_stats("2024-25", players)
+        repository.save_player_stats("2023-24", players)
+        assert len(repository.load_player_stats("2023-24")[0]) == 2
+        assert len(repository.load_player_stats("2024-25")[0]) == 2
+        engine.dispose()
+
+
+def _players_frame():
+    return pd.DataFrame({"PLAYER_ID": [1, 2], "PLAYER_NAME": ["A", "B"], "PTS": [10.0, 12.0]})
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import random
+from dataclasses import replace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.api.dependencies import get_trade_search_service
+from src.api.routes import simulation
+from src.domain.services.fit_simulator import FitSimulator
+from src.domain.services.trade_search_service import (
+    TradeSearchService, _search_partner, search_trades
+)
+from src.domain.services.trade_simulator import LeagueDataError
+from src.infrastructure.external.league_tables import PlayerStatsTable, TeamRankTable
+
+
+def synthetic_league(teams: int = 6, per_team: int = 5, seed: int = 7):
+    """Liga aleatória com perfis variados (arremessadores, pivôs, armadores)."""
+    rng = random.Random(seed)
+    players = []
+    for t in range(teams):
+        for p in range(per_team):
+            fg3a = rng.uniform(0.1, 9.0)
+            players.append({
+                "PLAYER_ID": t * 100 + p + 1, "PLAYER_NAME": f"P{t}-{p}", "TEAM_ID": 100 + t,
+                "MIN": rng.uniform(12.0, 36.0), "POSITION": rng.choice(["G", "F", "C", "G-F", "F-C"]),
+                "PTS": rng.uniform(5.0, 28.0), "FGA": rng.uniform(4.0, 20.0), "FG_PCT": rng.uniform(0.40, 0.65),
+                "FG3A": fg3a, "FG3_PCT": rng.uniform(0.28, 0.44), "AST": rng.uniform(0.5, 10.0),
+                "TOV": rng.uniform(0.5, 3.5), "REB": rng.uniform(2.0, 13.0), "OREB": rng.uniform(0.2, 4.0),
+                "BLK": rng.uniform(0.0, 2.5), "STL": rng.uniform(0.3, 1.8),
+                "USG_PCT": rng.uniform(0.12, 0.33), "AST_PCT": rng.uniform(0.05, 0.45)
+            })
+    players_df = pd.DataFrame(players).assign(FG3M=lambda df: df["FG3A"] * df["FG3_PCT"])
+    teams_df = pd.DataFrame([
+        {"TEAM_ID": 100 + i, "TEAM_NAME": f"Team {i + 1}",
+         "FGA": rng.uniform(85.0, 92.0), "FG3_PCT": rng.uniform(0.33, 0.39), "REB": rng.uniform(41.0, 47.0),
+         "AST": rng.uniform(23.0, 30.0), "PACE": rng.uniform(96.0, 103.0),
+         "OFF_RATING": rng.uniform(108.0, 120.0), "DEF_RATING": rng.uniform(108.0, 120.0)}
+        for i in range(teams)
+    ]).assign(FG3A=35.0, FG3M=lambda df: df["FG3_PCT"] * 35.0)
+    return players_df, teams_df
+
+
+@pytest.fixture
+def league():
+    players_df, teams_df = synthetic_league()
+    return PlayerStatsTable("2024-25", players_df), TeamRankTable("2024-25", teams_df)
+
+
+@pytest.fixture
+def service(league):
+    player_table, rank_table = league
+    async_client = Mock()
+    async_client.get_player_stats_table = AsyncMock(return_value=player_table)
+    async_client.get_team_rank_table = AsyncMock(return_value=rank_table)
+    nba_client = Mock()
+    nba_client.get_roster_composition.return_value = None
+    service = TradeSearchService(FitSimulator(nba_client=nba_client, async_client=async_client))
+    yield service
+    service.shutdown()
+
+
+def _exhaustive(context):
+    # Referência: todos os candidatos de todos os parceiros, sem poda
+    everything = replace(context, limit=10 ** 6)
+    partners = sorted({int(r['TEAM_ID']) for r in context.rows.values()} - {context.target_team_id})
+    candidates = []
+    for partner in partners:
+        candidates.extend(_search_partner(everything, partner, float("-inf")).candidates)
+    return sorted(candidates, key=lambda c: -c.combined_fit)
+
+
+class TestTradeSearchService:
+    """Testes para a busca de trocas por branch and bound"""
+
+    def test_matches_exhaustive_search(self, service, league):
+        """A poda não muda as pontuações do top-k"""
+        for target in (100, 103):
+            context = service.build_context(target, *league, limit=5, min_minutes=0, max_minutes_gap=48)
+            final = list(search_trades(context, workers=1))[-1]
+            expected = _exhaustive(context)[:5]
+            assert [c.combined_fit for c in final.candidates] == [c.combined_fit for c in expected]
+            assert final.pruned > 0
+
+    def test_respects_minutes_and_position(self, service, league):
+        player_table, _ = league
+        context = service.build_context(
+            100, *league, limit=50, position="c", min_minutes=20, max_minutes_gap=6
+        )
+        final = list(search_trades(context, workers=1))[-1]
+        assert final.candidates
+        for candidate in final.candidates:
+            incoming = player_table.get(candidate.incoming_player_id)
+            assert incoming["MIN"] >= 20
+            assert "C" in incoming["POSITION"]
+            outgoing_minutes = sum(player_table.get(pid)["MIN"] for pid in candidate.outgoing_player_ids)
+            assert abs(incoming["MIN"] - outgoing_minutes) <= 6
+            assert all(player_table.get(pid)["TEAM_ID"] == 100 for pid in candidate.outgoing_player_ids)
+            assert 1 <= len(candidate.outgoing_player_ids) <= 2
+
+    def test_one_for_one_only(self, service, league):
+        context = service.build_context(100, *league, limit=20, min_minutes=0, max_minutes_gap=48, max_outgoing=1)
+        final = list(search_trades(context, workers=1))[-1]
+        assert final.candidates
+        assert all(len(c.outgoing_player_ids) == 1 for c in final.candidates)
+
+    def test_process_pool_matches_inline(self, service, league):
+        context = service.build_context(102, *league, limit=5, min_minutes=0, max_minutes_gap=48)
+        inline = list(search_trades(context, workers=1))[-1]
+        pooled = list(search_trades(context, workers=2))[-1]
+        assert pooled.done
+        assert [c.combined_fit for c in pooled.candidates] == [c.combined_fit for c in inline.candidates]
+
+    async def test_stream_reports_progress(self, service):
+        updates = [u async for u in service.search_stream(100, limit=3, min_minutes=0, workers=1)]
+        assert len(updates) == 5
+        assert [u.completed_chunks for u in updates] == [1, 2, 3, 4, 5]
+        assert [u.done for u in updates] == [False] * 4 + [True]
+        assert updates[-1].evaluated > 0
+        assert len(updates[-1].candidates) <= 3
+
+    async def test_unknown_team(self, service):
+        with pytest.raises(ValueError):
+            await service.search(999, workers=1)
+
+    def test_missing_team_column_is_a_data_error(self, service, league):
+        """Tabela sem TEAM_ID (ex.: cache antigo) falha em vez de virar nenhuma troca encontrada"""
+        player_table, rank_table = league
+        without_teams = PlayerStatsTable("2024-25", player_table.df.drop(columns=["TEAM_ID"]))
+        with pytest.raises(LeagueDataError):
+            service.build_context(100, without_teams, rank_table, limit=5)
+
+    def test_partner_slice_carries_only_two_rosters(self, service, league):
+        context = service.build_context(100, *league, limit=5, min_minutes=0, max_minutes_gap=48)
+        sliced = context.for_partner(103)
+        assert {int(row["TEAM_ID"]) for row in sliced.rows.values()} == {100, 103}
+        assert set(sliced.stats) == set(sliced.rows)
+        assert _search_partner(sliced, 103, float("-inf")).candidates == \
+            _search_partner(context, 103, float("-inf")).candidates
+
+    async def test_cancelled_stream_keeps_pool_usable(self, service):
+        """Cliente que desiste enquanto lotes rodam: só CancelledError, e o pool serve a próxima busca"""
+        first_update = asyncio.Event()
+
+        async def consume():
+            async for _ in service.search_stream(100, limit=3, min_minutes=0, workers=2):
+                first_update.set()
+
+        task = asyncio.create_task(consume())
+        await first_update.wait()
+        pool = service._pool
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        final = await service.search(100, limit=3, min_minutes=0, workers=2)
+        assert final.done and final.completed_chunks == 5
+        assert service._pool is pool
+
+
+class TestTradeSearchRoutes:
+    """Testes para /trades/search e /trades/search/stream"""
+
+    def test_search_and_stream(self, service, override_dependency):
+        client = TestClient(app)
+        override_dependency(get_trade_search_service, service)
+        with patch.object(simulation.settings, "trade_search_workers", 1):
+            response = client.post("/api/v1/trades/search", json={"team_id": 100, "limit": 3, "min_minutes": 0})
+            assert response.status_code == 200
+            body = response.json()
+            assert body["done"] is True
+            assert len(body["candidates"]) <= 3
+
+            streamed = client.post("/api/v1/trades/search/stream", json={"team_id": 100, "limit": 3, "min_minutes": 0})
+            assert streamed.status_code == 200
+            assert streamed.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in streamed.text.splitlines()]
+            assert len(lines) == 5
+            assert lines[-1]["done"] is True
+            assert lines[-1]["candidates"] == body["candidates"]
+
+            missing = client.post("/api/v1/trades/search", json={"team_id": 999})
+            assert missing.status_code == 404
+
+    def test_data_error_is_server_error(self, override_dependency):
+        """Dados sem TEAM_ID viram 500 nas duas rotas, não 200 sem trocas"""
+        async def broken_stream(*args, **kwargs):
+            raise LeagueDataError("Tabela de jogadores sem TEAM_ID")
+            yield
+
+        broken = Mock(search=AsyncMock(side_effect=LeagueDataError("sem TEAM_ID")), search_stream=broken_stream)
+        override_dependency(get_trade_search_service, broken)
+        client = TestClient(app)
+
+        assert client.post("/api/v1/trades/search", json={"team_id": 100}).status_code == 500
+        assert client.post("/api/v1/trades/search/stream", json={"team_id": 100}).status_code == 500
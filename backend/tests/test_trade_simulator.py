@@ -0,0 +1,157 @@
+import time
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.domain.services.fit_simulator import FitSimulator
+from src.domain.services.trade_simulator import LeagueDataError, TradeSimulator
+from src.infrastructure.external.league_tables import PlayerStatsTable, TeamRankTable
+from src.schemas.simulation import TradeMove
+
+
+@pytest.fixture
+def trade_players_df(league_player_stats_df):
+    # Seis jogadores em três times (100, 101, 102): dois por time
+    second = league_player_stats_df.assign(
+        PLAYER_ID=[11, 13, 16],
+        PLAYER_NAME=["Klay Clone", "Gobert Clone", "CP3 Clone"]
+    )
+    return pd.concat([league_player_stats_df, second], ignore_index=True).assign(
+        TEAM_ID=[100, 101, 102, 100, 101, 102],
+        FG3M=lambda df: df["FG3A"] * df["FG3_PCT"]
+    )
+
+
+@pytest.fixture
+def trade_teams_df(league_team_stats_df):
+    return league_team_stats_df.assign(FG3A=35.0, FG3M=lambda df: df["FG3_PCT"] * 35.0)
+
+
+@pytest.fixture
+def simulator(trade_players_df, trade_teams_df):
+    async_client = Mock()
+    async_client.get_player_stats_table = AsyncMock(return_value=PlayerStatsTable("2024-25", trade_players_df))
+    async_client.get_team_rank_table = AsyncMock(return_value=TeamRankTable("2024-25", trade_teams_df))
+    nba_client = Mock()
+    nba_client.get_roster_composition.return_value = None
+    return TradeSimulator(FitSimulator(nba_client=nba_client, async_client=async_client))
+
+
+def _full_rerank(teams_df, players_df, moves):
+    # Referência: aplica a troca na tabela e recalcula a liga inteira
+    teams = teams_df.set_index("TEAM_ID")
+    players = players_df.set_index("PLAYER_ID")
+    for move in moves:
+        row = players.loc[move.player_id]
+        for team_id, sign in ((move.from_team_id, -1), (move.to_team_id, 1)):
+            teams.loc[team_id, "REB"] += sign * row["REB"]
+            teams.loc[team_id, "AST"] += sign * row["AST"]
+            teams.loc[team_id, "FG3A"] += sign * row["FG3A"]
+            teams.loc[team_id, "FG3M"] += sign * row["FG3M"]
+    teams["FG3_PCT"] = teams["FG3M"] / teams["FG3A"]
+    return TeamRankTable("2024-25", teams.reset_index())
+
+
+class TestTradeSimulator:
+    """Testes para a simulação de trocas com vários jogadores"""
+
+    async def test_ranks_match_full_recomputation(self, simulator, trade_players_df, trade_teams_df):
+        """Deltas incrementais dão os mesmos rankings que reordenar a liga"""
+        moves = [
+            TradeMove(player_id=3, from_team_id=101, to_team_id=129),
+            TradeMove(player_id=6, from_team_id=102, to_team_id=101),
+        ]
+
+        result = await simulator.simulate_trade(moves)
+        expected = _full_rerank(trade_teams_df, trade_players_df, moves)
+
+        for team in result.teams:
+            reference = expected.get(team.team_id)
+            after = team.stats_after
+            assert (after.reb_rank, after.ast_rank, after.fg3_pct_rank) == (
+                reference.reb_rank, reference.ast_rank, reference.fg3_pct_rank
+            )
+        receiver = next(t for t in result.teams if t.team_id == 129)
+        assert receiver.stats_after.reb_rank < receiver.stats_before.reb_rank
+        assert receiver.incoming_player_ids == [3]
+
+    async def test_reports_fit_for_every_incoming_player(self, simulator):
+        """Cada jogador recebido tem encaixe e fricção calculados"""
+        moves = [
+            TradeMove(player_id=1, from_team_id=100, to_team_id=101),
+            TradeMove(player_id=3, from_team_id=101, to_team_id=100),
+        ]
+
+        result = await simulator.simulate_trade(moves)
+
+        assert [r.player_id for r in result.incoming] == [1, 3]
+        assert [r.team_id for r in result.incoming] == [101, 100]
+        assert all(r.friction_result is not None for r in result.incoming)
+
+    async def test_three_team_six_player_trade_is_interactive(self, simulator):
+        """Troca de três times e seis jogadores fica abaixo de 50 ms"""
+        moves = [
+            TradeMove(player_id=1, from_team_id=100, to_team_id=101),
+            TradeMove(player_id=11, from_team_id=100, to_team_id=102),
+            TradeMove(player_id=3, from_team_id=101, to_team_id=102),
+            TradeMove(player_id=13, from_team_id=101, to_team_id=100),
+            TradeMove(player_id=6, from_team_id=102, to_team_id=100),
+            TradeMove(player_id=16, from_team_id=102, to_team_id=101),
+        ]
+        await simulator.simulate_trade(moves)
+
+        started = time.perf_counter()
+        result = await simulator.simulate_trade(moves)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert len(result.teams) == 3
+        assert len(result.incoming) == 6
+        assert elapsed_ms < 50
+
+    async def test_ball_dominant_count_follows_players(self, simulator):
+        """Quem chega dominando a bola conta no time novo, não no antigo"""
+        simulator.nba_client.get_roster_composition.side_effect = lambda tid: Mock(
+            ball_dominant_count=1 if tid == 100 else 0,
+            ball_dominant_ids=(1,) if tid == 100 else ()
+        )
+        moves = [TradeMove(player_id=1, from_team_id=100, to_team_id=101)]
+
+        result = await simulator.simulate_trade(moves)
+        teams = {t.team_id: t for t in result.teams}
+
+        assert teams[100].stats_before.ball_dominant_count == 1
+        assert teams[100].stats_after.ball_dominant_count == 0
+
+    @pytest.mark.parametrize("moves, message", [
+        ([TradeMove(player_id=1, from_team_id=101, to_team_id=102)], "não joga no time"),
+        ([TradeMove(player_id=1, from_team_id=100, to_team_id=100)], "não muda de time"),
+        ([TradeMove(player_id=1, from_team_id=100, to_team_id=999)], "Time 999"),
+        ([TradeMove(player_id=42, from_team_id=100, to_team_id=101)], "Jogador 42"),
+        ([TradeMove(player_id=1, from_team_id=100, to_team_id=101),
+          TradeMove(player_id=1, from_team_id=100, to_team_id=102)], "mais de uma vez"),
+    ])
+    async def test_invalid_trades_raise(self, simulator, moves, message):
+        with pytest.raises(ValueError, match=message):
+            await simulator.simulate_trade(moves)
+
+    @pytest.mark.parametrize("drop_players, drop_teams, message", [
+        (["TEAM_ID"], [], "sem TEAM_ID"),
+        ([], ["FG3A", "FG3M"], "FG3A, FG3M"),
+    ])
+    async def test_missing_league_columns_raise(
+        self, trade_players_df, trade_teams_df, drop_players, drop_teams, message
+    ):
+        """Colunas ausentes (ex.: cache antigo) não viram uma troca avaliada pela metade"""
+        async_client = Mock()
+        async_client.get_player_stats_table = AsyncMock(
+            return_value=PlayerStatsTable("2024-25", trade_players_df.drop(columns=drop_players))
+        )
+        async_client.get_team_rank_table = AsyncMock(
+            return_value=TeamRankTable("2024-25", trade_teams_df.drop(columns=drop_teams))
+        )
+        nba_client = Mock()
+        nba_client.get_roster_composition.return_value = None
+        simulator = TradeSimulator(FitSimulator(nba_client=nba_client, async_client=async_client))
+
+        with pytest.raises(LeagueDataError, match=message):
+            await simulator.simulate_trade([TradeMove(player_id=1, from_team_id=100, to_team_id=101)])
@@ -0,0 +1,249 @@
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from src.core.config import Settings, get_settings
+from src.infrastructure.external.nba_api_client import NBAApiClient
+from src.infrastructure.external.upstream_scheduler import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Priority,
+    UpstreamScheduler
+)
+
+ROSTER_HEADERS = ["TeamID", "SEASON", "PLAYER", "PLAYER_ID"]
+
+
+class FakeUpstream:
+    """stats.nba.com local: responde rosters e falha sob demanda com 503 em HTML"""
+
+    def __init__(self):
+        self.failures_remaining = 0
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests.append(handler.path)
+            fail = self.failures_remaining != 0
+            if self.failures_remaining > 0:
+                self.failures_remaining -= 1
+
+        if fail:
+            body, status, content_type = b"<html>Service Unavailable</html>", 503, "text/html"
+        else:
+            body = json.dumps({"resultSets": [{
+                "name": "CommonTeamRoster",
+                "headers": ROSTER_HEADERS,
+                "rowSet": [[100, "2024", "Fake Player", 1]]
+            }]}).encode()
+            status, content_type = 200, "application/json"
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+@pytest.fixture
+def fake_upstream(monkeypatch):
+    upstream = FakeUpstream()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            upstream.handle(self)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        NBAStatsHTTP, "base_url", f"http://127.0.0.1:{server.server_port}/stats/{{endpoint}}"
+    )
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    yield upstream
+    server.shutdown()
+    server.server_close()
+
+
+def _scheduler(rate=1000.0, burst=10, max_retries=3, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+    return UpstreamScheduler(
+        rate_per_second=rate,
+        burst=burst,
+        max_retries=max_retries,
+        backoff_base_seconds=0.0,
+        backoff_max_seconds=0.0,
+        breaker=CircuitBreaker(failure_threshold, reset_timeout, clock=clock)
+    )
+
+
+class TestUpstreamAgainstFakeServer:
+    """Cliente real do nba_api contra um upstream HTTP local"""
+
+    def test_transient_failures_are_retried(self, fake_upstream):
+        """503 seguidos de sucesso: o roster chega e as retentativas são contadas"""
+        fake_upstream.failures_remaining = 2
+        client = NBAApiClient(scheduler=_scheduler())
+
+        roster = client.get_team_roster(100)
+
+        assert [row["PLAYER"] for row in roster] == ["Fake Player"]
+        assert len(fake_upstream.requests) == 3
+        assert client.upstream_stats()["retries"] == 2
+
+    def test_open_circuit_serves_last_good_response(self, fake_upstream):
+        """Com o upstream fora, o circuito abre e a última resposta válida é servida"""
+        client = NBAApiClient(scheduler=_scheduler(max_retries=1, failure_threshold=1))
+        assert client.get_team_roster(100)
+
+        fake_upstream.failures_remaining = -1
+        during_outage = client.get_team_roster(100)
+        requests_before = len(fake_upstream.requests)
+        short_circuited = client.get_team_roster(100)
+
+        assert during_outage == short_circuited == [{"TeamID": 100, "SEASON": "2024", "PLAYER": "Fake Player", "PLAYER_ID": 1}]
+        assert len(fake_upstream.requests) == requests_before
+        stats = client.upstream_stats()
+        assert stats["circuit_state"] == "open"
+        assert stats["short_circuited"] == 1
+
+    def test_last_good_responses_are_bounded(self, fake_upstream, monkeypatch):
+        """Respostas guardadas para quedas ficam limitadas: as mais antigas saem pelo LRU"""
+        monkeypatch.setattr(get_settings(), "nba_api_stale_max_entries", 2)
+        client = NBAApiClient(scheduler=_scheduler(max_retries=1))
+        for team_id in range(100, 105):
+            client.get_team_roster(team_id)
+
+        assert len(client._last_good) == 2
+        fake_upstream.failures_remaining = -1
+        assert client.get_team_roster(100) == []
+        assert client.get_team_roster(104)
+
+    def test_outage_without_snapshot_returns_empty(self, fake_upstream):
+        """Sem resposta anterior, a falha continua tratada pelo cliente"""
+        fake_upstream.failures_remaining = -1
+        client = NBAApiClient(scheduler=_scheduler(max_retries=1))
+
+        assert client.get_team_roster(100) == []
+
+    def test_requests_are_paced_by_token_bucket(self, fake_upstream):
+        """Sem tokens sobrando, as chamadas seguem o ritmo configurado"""
+        client = NBAApiClient(scheduler=_scheduler(rate=20.0, burst=1))
+
+        started = time.perf_counter()
+        for team_id in range(100, 105):
+            client.get_team_roster(team_id)
+        elapsed = time.perf_counter() - started
+
+        assert len(fake_upstream.requests) == 5
+        assert elapsed >= 4 / 20.0 * 0.9
+
+
+class TestUpstreamScheduler:
+    """Testes unitários do scheduler"""
+
+    def test_interactive_requests_jump_the_queue(self):
+        """Com o bucket vazio, interativas são atendidas antes das de fundo"""
+        scheduler = _scheduler(rate=10.0, burst=1)
+        scheduler.call(lambda: None)  # esvazia o bucket
+        order = []
+
+        def request(priority, label):
+            scheduler.call(lambda: order.append(label), priority=priority)
+
+        background = threading.Thread(target=request, args=(Priority.BACKGROUND, "background"))
+        background.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=request, args=(Priority.INTERACTIVE, "interactive"))
+        interactive.start()
+        background.join()
+        interactive.join()
+
+        assert order == ["interactive", "background"]
+
+    def test_priority_context_applies_to_thread(self):
+        """O bloco background() marca as chamadas da thread como de fundo"""
+        scheduler = _scheduler()
+        seen = []
+        scheduler._acquire = lambda priority: seen.append(priority)
+
+        with scheduler.priority(Priority.BACKGROUND):
+            scheduler.call(lambda: None)
+        scheduler.call(lambda: None)
+
+        assert seen == [Priority.BACKGROUND, Priority.INTERACTIVE]
+
+    def test_non_transient_errors_are_not_retried(self):
+        """Erros de parsing não são repetidos nem abrem o circuito"""
+        scheduler = _scheduler(failure_threshold=1)
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise KeyError("CommonTeamRoster")
+
+        with pytest.raises(KeyError):
+            scheduler.call(broken)
+        assert len(calls) == 1
+        assert scheduler.breaker.state == CircuitBreaker.CLOSED
+
+    def test_backoff_is_exponential_with_jitter(self):
+        """Espera dobra a cada tentativa, limitada ao máximo, com jitter"""
+        scheduler = UpstreamScheduler(1000.0, 10, 3, 0.5, 1.5, CircuitBreaker(5, 60.0))
+
+        assert 0.25 <= scheduler._backoff(0) <= 0.5
+        assert 0.5 <= scheduler._backoff(1) <= 1.0
+        assert 0.75 <= scheduler._backoff(5) <= 1.5
+
+
+    @pytest.mark.parametrize("field", ["nba_api_rate_per_second", "nba_api_burst"])
+    def test_settings_reject_non_positive_rate(self, field):
+        """Taxa 0 dividiria por zero no token bucket; a configuração falha na carga"""
+        with pytest.raises(ValueError, match=field):
+            Settings(**{field: 0})
+
+
+class TestCircuitBreaker:
+    """Testes para a máquina de estados do circuit breaker"""
+
+    def test_half_open_allows_single_probe(self):
+        """Após o reset_timeout, só uma chamada de teste passa"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert not breaker.allow()
+        now[0] = 10.0
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_probe_result_closes_or_reopens(self):
+        """Sucesso no teste fecha o circuito; falha o reabre"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 10.0
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        now[0] = 20.0
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_open_circuit_rejects_immediately(self):
+        """Circuito aberto recusa a chamada sem executá-la"""
+        scheduler = _scheduler(max_retries=0, failure_threshold=1)
+        with pytest.raises(ConnectionError):
+            scheduler.call(lambda: (_ for _ in ()).throw(ConnectionError("timeout")))
+
+        with pytest.raises(CircuitOpenError):
+            scheduler.call(lambda: pytest.fail("não deveria chamar o upstream"))